@@ -0,0 +1,78 @@
+"""역별 이상 이용 탐지: 전체 기간을 처음부터 계산 vs 새 날짜만 이어서 계산.
+
+    python benchmarks/bench_anomaly.py [--years 1 3 10] [--pairs 620] [--new-days 1]
+
+(날짜 × 노선·역) 승·하차를 요일 패턴 + 잡음으로 만들어서 (실제 subway.csv 는 한 달치)
+  - full: 전체 날짜를 AnomalyState 에 처음부터 넣는 시간
+  - incremental: 마지막 new-days 일만 빼고 넣어 둔 상태에 그 날짜만 더하는 시간 (저장·읽기 포함)
+을 잰다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import subway_anomaly  # noqa: E402
+
+
+def make_days(years, n_pairs, seed=0):
+    """(날짜 목록, 날짜별 역 코드, 날짜별 (역, 2) 승·하차)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2015-01-01", periods=365 * years, freq="D")
+    base = rng.lognormal(8, 1, size=(n_pairs, 2))
+    weekend = np.where(dates.weekday >= 5, 0.6, 1.0)
+    values = base[None] * weekend[:, None, None] * rng.normal(1, 0.05, size=(len(dates), n_pairs, 2))
+    codes = np.arange(n_pairs, dtype=np.int32)
+    return (
+        [int(d.strftime("%Y%m%d")) for d in dates],
+        [codes] * len(dates),
+        list(np.maximum(values, 0).astype(np.float32)),
+    )
+
+
+def run(dates, codes, values, n_pairs, state_dir):
+    state = subway_anomaly.AnomalyState()
+    state._pair_codes([("line", str(i)) for i in range(n_pairs)])
+    for i in range(0, len(dates), subway_anomaly.BLOCK_DAYS):
+        block = slice(i, i + subway_anomaly.BLOCK_DAYS)
+        state.append(dates[block], codes[block], values[block])
+    state.save(state_dir)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--pairs", type=int, default=620)
+    parser.add_argument("--new-days", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'기간':>6}{'날짜 수':>9}{'full(ms)':>11}{'incremental(ms)':>17}{'결과 행':>9}")
+    for years in args.years:
+        dates, codes, values = make_days(years, args.pairs)
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            full = run(dates, codes, values, args.pairs, os.path.join(tmp, "full"))
+            full_ms = (time.perf_counter() - t0) * 1000
+
+            head = len(dates) - args.new_days
+            run(dates[:head], codes[:head], values[:head], args.pairs, os.path.join(tmp, "inc"))
+            t0 = time.perf_counter()
+            state = subway_anomaly.AnomalyState.load(os.path.join(tmp, "inc"))
+            state.append(dates[head:], codes[head:], values[head:])
+            state.save(os.path.join(tmp, "inc"))
+            inc_ms = (time.perf_counter() - t0) * 1000
+        assert len(state.results["z"]) == len(full.results["z"])
+        print(f"{str(years) + '년':>6}{len(dates):9d}{full_ms:11.0f}{inc_ms:17.1f}{len(full.results['z']):9d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
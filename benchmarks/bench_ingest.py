@@ -0,0 +1,124 @@
+"""CSV 읽기 비교: 예전 pd.read_csv 호출 vs ingest 모듈 (읽는 시간, 메모리).
+
+    python benchmarks/bench_ingest.py [--scales 1 10 100] [--runs 5]
+
+subway.csv(cp949)와 MBTI CSV 를 배율만큼 늘린 사본(.cache/bench/ingest/)을 만들고,
+(방식, 파일, 배율)마다 새 프로세스에서
+  - 읽는 시간 p50/p99 (runs 회)
+  - 첫 읽기 동안 늘어난 최대 RSS (VmHWM 증가분)
+  - 결과 DataFrame 의 메모리 (memory_usage(deep=True))
+를 잰다. ingest: 큰 파일은 pyarrow 엔진(있으면), ingest-c: 항상 C 엔진 + memory_map.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ingest  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, ".cache", "bench", "ingest")
+MBTI_CSV = os.path.join(ROOT, "countriesMBTI_16types.csv")
+SUBWAY_CSV = os.path.join(ROOT, "subway.csv")
+
+# (이름, 파일 종류, 읽는 함수)
+LOADERS = {
+    "before": {
+        "subway": lambda path: pd.read_csv(path, encoding="cp949"),
+        "mbti": lambda path: pd.read_csv(path),
+    },
+    "ingest": {
+        "subway": lambda path: ingest.read_csv(path, ingest.SUBWAY),
+        "mbti": lambda path: ingest.read_csv(path, ingest.MBTI),
+    },
+    "ingest-c": {
+        "subway": lambda path: ingest.read_csv(path, ingest.SUBWAY, engine="c"),
+        "mbti": lambda path: ingest.read_csv(path, ingest.MBTI, engine="c"),
+    },
+}
+
+
+def make_copies(scale):
+    """배율만큼 행을 늘린 subway / MBTI 사본 경로 (이미 있으면 그대로)."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    paths = {
+        "subway": os.path.join(DATA_DIR, f"subway_x{scale}.csv"),
+        "mbti": os.path.join(DATA_DIR, f"mbti_x{scale}.csv"),
+    }
+    if not os.path.exists(paths["subway"]):
+        raw = open(SUBWAY_CSV, "rb").read()
+        header, _, body = raw.partition(b"\n")
+        with open(paths["subway"], "wb") as f:
+            f.write(header + b"\n" + body * scale)
+    if not os.path.exists(paths["mbti"]):
+        mbti = pd.read_csv(MBTI_CSV)
+        copies = [mbti.assign(Country=mbti["Country"] + (f" #{j}" if j else "")) for j in range(scale)]
+        pd.concat(copies).to_csv(paths["mbti"], index=False)
+    return paths
+
+
+def vm_hwm_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_worker(method, kind, path, runs):
+    load = LOADERS[method][kind]
+    before = vm_hwm_mb()
+    t0 = time.perf_counter()
+    df = load(path)
+    times = [(time.perf_counter() - t0) * 1000]
+    peak = vm_hwm_mb() - before
+    frame_mb = df.memory_usage(deep=True).sum() / 2**20
+    for _ in range(runs - 1):
+        t0 = time.perf_counter()
+        load(path)
+        times.append((time.perf_counter() - t0) * 1000)
+    return {
+        "rows": len(df),
+        "p50": float(np.percentile(times, 50)),
+        "p99": float(np.percentile(times, 99)),
+        "peak_mb": peak,
+        "frame_mb": frame_mb,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--worker", nargs=3, metavar=("METHOD", "KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker, args.runs)))
+        return 0
+
+    print(f"pyarrow: {ingest.ENGINE == 'pyarrow'} (ingest 는 {ingest.PYARROW_MIN_BYTES >> 20} MB 이상에서 사용), 읽기 {args.runs}회")
+    print(f"{'파일':8}{'배율':>6}{'방식':>10}{'행 수':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'RSS+(MB)':>10}{'DF(MB)':>9}")
+    for scale in args.scales:
+        paths = make_copies(scale)
+        for kind in ("subway", "mbti"):
+            for method in LOADERS:
+                out = subprocess.run(
+                    [sys.executable, __file__, "--runs", str(args.runs), "--worker", method, kind, paths[kind]],
+                    capture_output=True, text=True, check=True,
+                ).stdout
+                r = json.loads(out.strip().splitlines()[-1])
+                print(f"{kind:8}{'x' + str(scale):>6}{method:>10}{r['rows']:10d}{r['p50']:10.1f}{r['p99']:10.1f}"
+                      f"{r['peak_mb']:10.1f}{r['frame_mb']:9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
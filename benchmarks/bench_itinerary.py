@@ -0,0 +1,50 @@
+"""여행 일정 계산 시간 (관광지 수 × 여행 일수).
+
+    python benchmarks/bench_itinerary.py [반복 횟수]
+
+서울 범위 안에 임의로 뿌린 관광지로 plan_itinerary 를 여러 번 돌려 중앙값을 출력한다.
+거리 행렬은 페이지처럼 미리 계산해 두고 (datasets 의 seoul_distances) 따로 잰다.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import itinerary  # noqa: E402
+
+SIZES = [(100, 3), (300, 14), (600, 14), (1000, 14)]
+BUDGET_MS = 200
+
+
+def make_places(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return 37.45 + rng.random(n) * 0.25, 126.8 + rng.random(n) * 0.35
+
+
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(times))
+
+
+def main(repeat=7):
+    print(f"{'관광지':>8}{'일수':>6}{'거리 행렬(ms)':>16}{'일정(ms)':>12}{'이동(km)':>12}")
+    for n, days in SIZES:
+        lat, lon = make_places(n)
+        matrix_ms = median_ms(lambda: itinerary.haversine_matrix(lat, lon), repeat)
+        dist = itinerary.haversine_matrix(lat, lon)
+        plan_ms = median_ms(lambda: itinerary.plan_itinerary(lat, lon, days, dist), repeat)
+        km = sum(itinerary.route_length(r, dist) for r in itinerary.plan_itinerary(lat, lon, days, dist))
+        note = "" if plan_ms <= BUDGET_MS else f"  (예산 {BUDGET_MS} ms 초과)"
+        print(f"{n:8}{days:6}{matrix_ms:16.1f}{plan_ms:12.1f}{km:12.1f}{note}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 7)
@@ -0,0 +1,338 @@
+"""페이지 벤치마크: AppTest 로 각 페이지를 헤드리스로 실행해 cold / warm rerun 지연시간과 최대 RSS 를 잰다.
+
+    python benchmarks/bench_pages.py [--scales 1 10 100] [--pages 04 03] [--reruns 10]
+    python benchmarks/bench_pages.py --compare .cache/bench/results/<이전 commit>.json
+
+- 배율마다 .cache/bench/data/x<배율>/ 에 합성 데이터를 만든다 (seed 고정, 한 번만).
+  지하철: subway.csv 를 31일씩 앞당긴 월별 파일 <배율>개, MBTI: 158개국 × 배율,
+  관광지(02): PLACES × 배율, 관광지(08): TOUR_LIST × 배율 (tour_places.csv),
+  혈액형(07): BLOOD_BASE_ROWS × 배율 행 CSV 를 로컬 HTTP 로 받는다 (샘플 21행은 너무 작아서).
+- (페이지, 배율)마다 새 프로세스에서 .cache 를 비우고 실행한다.
+  cold = 첫 실행 (import + 데이터 캐시 생성 포함), warm = 위젯을 바꿔 가며 rerun 한 시간.
+- 결과는 .cache/bench/results/<commit>.json 에 저장한다. --compare 로 이전 결과와 비교해
+  REGRESSION 배율 이상 느려지거나 메모리가 늘면 종료 코드 1.
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, ".cache", "bench")
+DATA_VERSION = 1
+BLOOD_BASE_ROWS = 10_000
+REGRESSION = 0.25  # 25% 이상 나빠지면 실패
+MIN_DELTA = {"cold_ms": 20, "warm_p50_ms": 5, "warm_p95_ms": 10, "peak_rss_mb": 20}
+
+PAGES = {
+    "04": "04_지하철분석.py",
+    "03": "03_MBTI 분석.py",
+    "07": "07_수행평가.py",
+    "02": "02_관광지.py",
+    "08": "08_수행평가2.py",
+}
+
+
+# ----------------------------
+# 합성 데이터
+# ----------------------------
+
+def workspace(scale):
+    return os.path.join(BENCH_DIR, "data", f"x{scale}")
+
+
+def make_workspace(scale, seed=0):
+    """배율별 데이터 폴더. 이미 같은 버전으로 만들어져 있으면 그대로 쓴다."""
+    import numpy as np
+    import pandas as pd
+
+    ws = workspace(scale)
+    marker = os.path.join(ws, "DATA_VERSION")
+    if os.path.exists(marker) and open(marker).read() == f"{DATA_VERSION}:{scale}":
+        return ws
+    shutil.rmtree(ws, ignore_errors=True)
+    os.makedirs(os.path.join(ws, "images"))
+    rng = np.random.default_rng(seed)
+
+    # 지하철: 원본(한 달)을 31일씩 앞당겨 배율만큼의 월별 파일로
+    subway = pd.read_csv(os.path.join(ROOT, "subway.csv"), encoding="cp949")
+    dates = pd.to_datetime(subway["사용일자"].astype(str), format="%Y%m%d")
+    for j in range(scale):
+        part = subway.copy()
+        part["사용일자"] = (dates - pd.Timedelta(days=31 * j)).dt.strftime("%Y%m%d").astype(int)
+        noise = rng.uniform(0.8, 1.2, size=len(part))
+        for col in ("승차총승객수", "하차총승객수"):
+            part[col] = (part[col] * noise).round().astype(int)
+        part.to_csv(os.path.join(ws, f"subway_{j:03d}.csv"), index=False, encoding="cp949")
+
+    # MBTI: 원본 국가 + 비율을 흔든 가상 국가
+    mbti = pd.read_csv(os.path.join(ROOT, "countriesMBTI_16types.csv"))
+    parts = [mbti]
+    for j in range(1, scale):
+        fake = mbti.copy()
+        values = fake.iloc[:, 1:].to_numpy(float) * rng.uniform(0.7, 1.3, size=(len(fake), 16))
+        fake.iloc[:, 1:] = values / values.sum(axis=1, keepdims=True)
+        fake["Country"] = fake["Country"] + f" #{j}"
+        parts.append(fake)
+    pd.concat(parts).to_csv(os.path.join(ws, "countriesMBTI_16types.csv"), index=False)
+
+    shutil.copy(os.path.join(ROOT, "station_coords.csv"), ws)
+
+    # 관광지 검색(08): 기본 목록 × 배율 (+ 이미지 몇 장)
+    sys.path.insert(0, ROOT)
+    import tour_search
+    base = pd.DataFrame(tour_search.TOUR_LIST)
+    rows = [base.assign(name=base["name"] + f" {j}") for j in range(1, scale)]
+    if rows:
+        pd.concat(rows).to_csv(os.path.join(ws, "tour_places.csv"), index=False)
+    from PIL import Image
+    for name in base["name"]:
+        pixels = rng.integers(0, 255, size=(600, 800, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(os.path.join(ws, "images", f"{name}.png"))
+
+    # 혈액형(07)
+    countries = [f"Country {i}" for i in range(200)]
+    n = BLOOD_BASE_ROWS * scale
+    pd.DataFrame({
+        "country": rng.choice(countries, n),
+        "blood_type": rng.choice(["A", "B", "O", "AB"], n, p=[0.34, 0.27, 0.28, 0.11]),
+    }).to_csv(os.path.join(ws, "blood.csv"), index=False)
+
+    with open(marker, "w") as f:
+        f.write(f"{DATA_VERSION}:{scale}")
+    return ws
+
+
+def extend_places(scale, seed=0):
+    """seoul_places.PLACES 를 제자리에서 늘린다 (페이지가 같은 리스트 객체를 본다)."""
+    import numpy as np
+    import seoul_places
+    rng = np.random.default_rng(seed)
+    base = list(seoul_places.PLACES)
+    for j in range(1, scale):
+        for p in base:
+            seoul_places.PLACES.append({
+                **p,
+                "name": f"{p['name']} #{j}",
+                "lat": p["lat"] + rng.normal(0, 0.02),
+                "lon": p["lon"] + rng.normal(0, 0.03),
+            })
+
+
+# ----------------------------
+# 페이지별 작업 (setup: 첫 화면까지, interact: warm rerun 마다 바꿀 위젯)
+# ----------------------------
+
+def _cycle(widget, i):
+    widget.set_value(widget.options[i % len(widget.options)])
+
+
+def _setup_07(at, base_url):
+    at.sidebar.radio[0].set_value("GitHub RAW URL").run()
+    at.sidebar.text_input[0].set_value(base_url + "blood.csv").run()
+
+
+def _setup_08(at, base_url):
+    at.sidebar.text_input[0].set_value(base_url + "images/").run()
+
+
+QUERIES_08 = ["", "경", "ㅅ", "해수", "서울"]
+
+WORKLOADS = {
+    "04": {"interact": lambda at, i: _cycle(at.selectbox[0], i)},
+    "03": {"interact": lambda at, i: _cycle(at.selectbox[0], i)},
+    "07": {"setup": _setup_07, "interact": lambda at, i: at.sidebar.slider[0].set_value(5 + i % 20)},
+    "02": {"before": extend_places, "interact": lambda at, i: at.slider[0].set_value(min(1 + i % 5, at.slider[0].max))},
+    "08": {"setup": _setup_08, "interact": lambda at, i: at.main.text_input[0].set_value(QUERIES_08[i % 5])},
+}
+
+
+def _serve(directory):
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def peak_rss_mb():
+    # 리눅스의 ru_maxrss 는 fork 한 부모(데이터를 만든 프로세스) 값을 물려받으므로 VmHWM 을 먼저 본다
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if platform.system() == "Darwin" else rss / 1024
+
+
+def run_worker(page, scale, reruns):
+    """(새 프로세스 안에서) 페이지 하나를 재고 결과 dict 를 돌려준다."""
+    import warnings
+    warnings.simplefilter("ignore")
+    ws = workspace(scale)
+    shutil.rmtree(os.path.join(ws, ".cache"), ignore_errors=True)
+    os.chdir(ws)
+    sys.path.insert(0, ROOT)
+    server = _serve(ws)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    from streamlit.testing.v1 import AppTest
+
+    workload = WORKLOADS[page]
+    if "before" in workload:
+        workload["before"](scale)
+
+    t0 = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, "pages", PAGES[page]), default_timeout=600)
+    at.run()
+    if "setup" in workload:
+        workload["setup"](at, base_url)
+    cold_ms = (time.perf_counter() - t0) * 1000
+    errors = [e.value for e in at.exception]
+
+    warm = []
+    for i in range(1, reruns + 1):
+        workload["interact"](at, i)
+        t = time.perf_counter()
+        at.run()
+        warm.append((time.perf_counter() - t) * 1000)
+        errors += [e.value for e in at.exception]
+    server.shutdown()
+
+    return {
+        "page": page,
+        "scale": scale,
+        "cold_ms": round(cold_ms, 1),
+        "warm_p50_ms": round(statistics.median(warm), 1),
+        "warm_p95_ms": round(sorted(warm)[max(0, int(len(warm) * 0.95 + 0.5) - 1)], 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "errors": errors[:3],
+    }
+
+
+# ----------------------------
+# 실행 / 비교
+# ----------------------------
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    return commit, dirty
+
+
+def run_suite(scales, pages, reruns):
+    results = []
+    for scale in scales:
+        print(f"데이터 준비: x{scale}", file=sys.stderr)
+        make_workspace(scale)
+        for page in pages:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--worker", page, str(scale), str(reruns)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+                result = {"page": page, "scale": scale, "errors": tail}
+            else:
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print_row(result)
+    return results
+
+
+COLUMNS = [("cold_ms", "cold(ms)"), ("warm_p50_ms", "warm p50"), ("warm_p95_ms", "warm p95"), ("peak_rss_mb", "RSS(MB)")]
+
+
+def print_header():
+    print(f"{'page':6}{'scale':>6}" + "".join(f"{label:>11}" for _, label in COLUMNS))
+
+
+def print_row(r):
+    cells = "".join(f"{r.get(k, float('nan')):11.1f}" for k, _ in COLUMNS)
+    note = f"  ERROR {r['errors']}" if r.get("errors") else ""
+    print(f"{r['page']:6}{'x' + str(r['scale']):>6}{cells}{note}", flush=True)
+
+
+def compare(base, results):
+    """base 대비 나빠진 항목 목록."""
+    old = {(r["page"], r["scale"]): r for r in base["results"]}
+    regressions = []
+    print(f"\n비교 기준: {base['commit']}{' (dirty)' if base.get('dirty') else ''}")
+    print(f"{'page':6}{'scale':>6}" + "".join(f"{label:>16}" for _, label in COLUMNS))
+    for r in results:
+        o = old.get((r["page"], r["scale"]))
+        if o is None or r.get("errors"):
+            continue
+        cells = ""
+        for key, _ in COLUMNS:
+            delta = r[key] - o[key]
+            ratio = delta / o[key] if o[key] else 0.0
+            bad = ratio > REGRESSION and delta > MIN_DELTA[key]
+            cells += f"{ratio:+15.0%}{'!' if bad else ' '}"
+            if bad:
+                regressions.append((r["page"], r["scale"], key, o[key], r[key]))
+        print(f"{r['page']:6}{'x' + str(r['scale']):>6}{cells}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: .cache/bench/results/<commit>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--worker", nargs=3, metavar=("PAGE", "SCALE", "RERUNS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        page, scale, reruns = args.worker
+        print(json.dumps(run_worker(page, int(scale), int(reruns)), ensure_ascii=False))
+        return 0
+
+    import streamlit
+    commit, dirty = git_commit()
+    print_header()
+    results = run_suite(args.scales, args.pages, args.reruns)
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "machine": platform.machine(),
+        "reruns": args.reruns,
+        "results": results,
+    }
+    out = args.out or os.path.join(BENCH_DIR, "results", f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"\n결과: {out}")
+
+    failed = any(r.get("errors") for r in results)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), results)
+        for page, scale, key, old, new in regressions:
+            print(f"REGRESSION {page} x{scale} {key}: {old} → {new}")
+        failed |= bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
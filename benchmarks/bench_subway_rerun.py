@@ -0,0 +1,86 @@
+"""지하철 페이지 rerun 지연시간 비교 (기존 방식 vs 순위표 조회).
+
+    python benchmarks/bench_subway_rerun.py [반복 횟수]
+
+날짜·호선을 무작위로 바꿔가며 한 번의 rerun 에서 하던 계산
+(필터 → 총이용객 → 정렬 → 색상 → px.bar)을 재고, p50/p99 를 출력한다.
+"""
+import os
+import random
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import subway_data  # noqa: E402
+
+
+def prepare_before(df, date, line):
+    # pages/04_지하철분석.py 의 예전 rerun 코드 그대로
+    df["사용일자"] = df["사용일자"].astype(str)
+    df_oct = df[df["사용일자"].str.startswith("202510")]
+    filtered = df_oct[(df_oct["사용일자"] == date) & (df_oct["노선명"] == line)]
+    filtered["총이용객"] = filtered["승차총승객수"] + filtered["하차총승객수"]
+    filtered = filtered.sort_values("총이용객", ascending=False)
+    colors = ["red"] + [
+        f"rgba(0,0,255,{0.3 + 0.7 * (i / (len(filtered)-1))})"
+        for i in range(len(filtered)-1)
+    ]
+    return filtered, colors
+
+
+def prepare_after(rankings, date, line):
+    return rankings.lookup(date, line)
+
+
+def build_figure(filtered, colors):
+    fig = px.bar(filtered, x="역명", y="총이용객")
+    fig.update_traces(marker_color=colors)
+    return fig
+
+
+def measure(fn, keys):
+    times = []
+    for key in keys:
+        t0 = time.perf_counter()
+        fn(*key)
+        times.append((time.perf_counter() - t0) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main(n=200):
+    warnings.simplefilter("ignore")
+    store = subway_data.load_store(subway_data.CSV_PATH)
+    keys = [(d, l) for d in store.dates() for l in store.lines_on(d)]
+    random.seed(0)
+    sample = random.choices(keys, k=n)
+
+    df = pd.read_csv(subway_data.CSV_PATH, encoding="cp949")
+    t0 = time.perf_counter()
+    rankings = subway_data.StationRankings(store)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    # st.cache_data 는 rerun 마다 복사본을 돌려주므로 copy() 까지 포함
+    before = lambda d, l: prepare_before(df.copy(), str(d), l)  # noqa: E731
+    after = lambda d, l: prepare_after(rankings, d, l)  # noqa: E731
+    rows = [
+        ("before (데이터)", measure(before, sample)),
+        ("after  (데이터)", measure(after, sample)),
+        ("before (+차트)", measure(lambda d, l: build_figure(*before(d, l)), sample)),
+        ("after  (+차트)", measure(lambda d, l: build_figure(*after(d, l)), sample)),
+    ]
+
+    print(f"순위표 생성 (1회): {build_ms:.1f} ms, rerun {n}회")
+    print(f"{'':16}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for name, (p50, p99) in rows:
+        print(f"{name:16}{p50:10.2f}{p99:10.2f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,76 @@
+"""관광지 검색 지연시간 비교 (DataFrame 전체 훑기 vs 검색 인덱스).
+
+    python benchmarks/bench_tour_search.py [관광지 수]
+
+임의로 만든 관광지 목록에서 검색어 하나당 걸리는 시간을 재고 p50/p99 를 출력한다.
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tour_search import TourIndex  # noqa: E402
+
+REGIONS = ["서울", "부산", "경주", "제주", "전주", "강원", "인천", "대구", "광주", "여수"]
+TYPES = ["역사", "도시", "해변", "자연", "전통", "산", "축제", "체험"]
+WORDS = ["경복", "남산", "해운대", "불국", "성산", "한옥", "설악", "오름", "계곡", "폭포",
+         "시장", "공원", "박물관", "사찰", "해변", "마을", "전망대", "숲길", "호수", "온천"]
+SUFFIXES = ["", "궁", "타워", "사", "봉", "길", "섬", "대교", "거리"]
+
+
+def make_catalogue(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        name = f"{rng.choice(REGIONS)} {rng.choice(WORDS)}{rng.choice(SUFFIXES)} {i}"
+        rows.append({"name": name, "region": rng.choice(REGIONS), "type": rng.choice(TYPES)})
+    return pd.DataFrame(rows)
+
+
+def search_before(df, query):
+    # 인덱스 없이 매번 전체 행에서 부분 문자열을 찾는 방식
+    text = df["name"] + " " + df["region"] + " " + df["type"]
+    mask = np.ones(len(df), dtype=bool)
+    for term in query.split():
+        mask &= text.str.contains(term, regex=False).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def measure(fn, queries):
+    times = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        times.append((time.perf_counter() - t0) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main(n=5000, n_queries=200):
+    df = make_catalogue(n)
+    t0 = time.perf_counter()
+    index = TourIndex(df)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    rng = random.Random(1)
+    queries = [rng.choice(WORDS)[: rng.randint(1, 3)] + (" " + rng.choice(REGIONS) if rng.random() < 0.3 else "")
+               for _ in range(n_queries)]
+    rows = [
+        ("before (str.contains)", measure(lambda q: search_before(df, q), queries)),
+        ("after  (index)", measure(index.search, queries)),
+        ("after  (index+facet)", measure(lambda q: index.facet_counts("region", index.search(q)), queries)),
+    ]
+
+    print(f"관광지 {n}곳, 인덱스 생성 (1회): {build_ms:.1f} ms, 검색 {n_queries}회")
+    print(f"{'':24}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for name, (p50, p99) in rows:
+        print(f"{name:24}{p50:10.2f}{p99:10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
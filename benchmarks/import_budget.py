@@ -0,0 +1,154 @@
+"""페이지 import 시간 측정 + 예산 검사 (python -X importtime 기반).
+
+    python benchmarks/import_budget.py [--runs 3] [--scale 1.0]
+
+main.py 와 pages/*.py 를 하나씩 새 파이썬 프로세스에서 AppTest 로 끝까지 실행하면서
+-X importtime 으로 import 를 기록한다. 빈 스크립트를 AppTest 로 돌렸을 때보다 늘어난 모듈을
+  - 첫 화면: 처음으로 화면 요소(delta)를 브라우저로 보내기 전까지 import 된 것
+  - 전체: 페이지를 끝까지 그리는 동안 import 된 것
+으로 나눠 self 시간 합(중앙값)을 출력한다. 파일 맨 위뿐 아니라 datasets.get 이나
+중간의 import 문으로 끌려 들어오는 모듈도 모두 잡힌다. streamlit 자체 모듈과
+AppTest 가 이미 가져오는 모듈(plotly.graph_objects 등)은 세지 않는다.
+
+- 첫 화면 시간이 BUDGET_MS 를 넘거나
+- 첫 화면 전에 HEAVY 모듈(pandas, plotly.express, folium …)이 START_ALLOWED 밖에서 import 되거나
+- 페이지 전체에서 HEAVY 모듈이 ALLOWED 밖에서 import 되면
+종료 코드 1 로 실패한다. 느린 머신에서는 --scale 로 예산을 늘린다.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 화면 전에 (streamlit·AppTest 외에) import 에 쓸 수 있는 시간 (ms)
+DEFAULT_BUDGET_MS = 60
+BUDGET_MS = {
+    "main.py": 10,
+    # 제목에 데이터 기간이 들어가서 첫 화면 전에 데이터셋(numpy·pandas)을 연다
+    "pages/04_지하철분석.py": 700,
+}
+# 그래프·데이터를 그릴 때 가져와야 하는 모듈
+HEAVY = ("numpy", "pandas", "plotly.express", "plotly.graph_objects", "folium", "scipy", "sklearn")
+# 첫 화면 전에 import 해도 되는 HEAVY 모듈
+START_ALLOWED = {
+    "pages/04_지하철분석.py": {"numpy", "pandas"},
+}
+# 페이지 전체에서 import 해도 되는 HEAVY 모듈 (여기 없는 것이 새로 끌려 들어오면 실패)
+ALLOWED = {
+    "main.py": set(),
+    "pages/02_관광지.py": {"numpy", "pandas", "folium"},
+    "pages/03_MBTI 분석.py": {"numpy", "pandas", "plotly.express"},
+    "pages/04_지하철분석.py": {"numpy", "pandas", "plotly.express"},
+    "pages/07_수행평가.py": {"numpy", "pandas", "plotly.express"},
+    "pages/08_수행평가2.py": {"numpy", "pandas", "plotly.express"},
+}
+
+FIRST_RENDER = "import budget: first render"
+
+# 자식 프로세스에서 실행하는 코드. 첫 delta 를 보낼 때 stderr 에 표시를 남긴다
+# (-X importtime 출력도 stderr 로 나오므로 순서가 그대로 유지된다)
+RUNNER = """
+import json, sys
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from streamlit.testing.v1 import AppTest
+
+enqueue = script_run_context.ScriptRunContext.enqueue
+seen = []
+
+def first_render(self, msg):
+    if not seen and msg.WhichOneof("type") == "delta":
+        seen.append(True)
+        sys.stderr.write(%(marker)r + "\\n")
+        sys.stderr.flush()
+    return enqueue(self, msg)
+
+script_run_context.ScriptRunContext.enqueue = first_render
+path = %(path)r
+at = (AppTest.from_file(path) if path else AppTest.from_string("import streamlit as st"))
+at.run(timeout=600)
+print(json.dumps([e.value for e in at.exception]))
+"""
+
+
+def run_page(path):
+    """path 를 AppTest 로 실행해서 (첫 화면 전 모듈 → self 시간(us), 전체 모듈 → self 시간(us), 예외 목록)."""
+    env = {**os.environ, "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    code = RUNNER % {"marker": FIRST_RENDER, "path": path and os.path.join(ROOT, path)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    start, modules = None, {}
+    for line in result.stderr.splitlines():
+        if line == FIRST_RENDER:
+            start = dict(modules)
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        try:
+            modules[name.strip()] = int(self_us)
+        except ValueError:  # 헤더 줄
+            pass
+    return (modules if start is None else start), modules, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _ours(modules, baseline):
+    return {m: us for m, us in modules.items() if m not in baseline and m.split(".")[0] != "streamlit"}
+
+
+def measure(path, baseline, runs):
+    """baseline 과 streamlit 에 없는 모듈들의 (첫 화면 ms, 전체 ms) 중앙값, 첫 화면 전 모듈, 전체 모듈, 예외."""
+    start_ms, total_ms, start_mods, all_mods, errors = [], [], set(), set(), []
+    for _ in range(runs):
+        start, modules, errors = run_page(path)
+        start = _ours(start, baseline)
+        modules = _ours(modules, baseline)
+        start_ms.append(sum(start.values()) / 1000)
+        total_ms.append(sum(modules.values()) / 1000)
+        start_mods |= set(start)
+        all_mods |= set(modules)
+    return statistics.median(start_ms), statistics.median(total_ms), start_mods, all_mods, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="예산 배율 (느린 CI 용)")
+    args = parser.parse_args(argv)
+
+    base_runs = [run_page(None)[1] for _ in range(args.runs)]
+    baseline = set().union(*base_runs)
+    base_ms = statistics.median(sum(m.values()) / 1000 for m in base_runs)
+    print(f"streamlit + AppTest: {base_ms:.0f} ms (기준)\n")
+
+    scripts = ["main.py"] + sorted(glob.glob("pages/*.py", root_dir=ROOT))
+    failed = False
+    print(f"{'script':32}{'첫 화면(ms)':>12}{'예산(ms)':>10}{'전체(ms)':>10}  결과")
+    for script in scripts:
+        start_ms, total_ms, start_mods, all_mods, errors = measure(script, baseline, args.runs)
+        budget = BUDGET_MS.get(script, DEFAULT_BUDGET_MS) * args.scale
+        early = sorted(m for m in start_mods if m in HEAVY and m not in START_ALLOWED.get(script, set()))
+        extra = sorted(m for m in all_mods if m in HEAVY and m not in ALLOWED.get(script, set()))
+        ok = start_ms <= budget and not early and not extra and not errors
+        failed |= not ok
+        note = "ok" if ok else "FAIL"
+        if early:
+            note += f" (첫 화면 전에 {', '.join(early)})"
+        if extra:
+            note += f" (허용되지 않은 {', '.join(extra)})"
+        if errors:
+            note += f" (예외: {errors[0]})"
+        print(f"{script:32}{start_ms:12.1f}{budget:10.0f}{total_ms:10.1f}  {note}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+import ingest
+from ingest import MissingColumnsError
+
+# ----------------------------
+# 나라별 혈액형 집계
+# ----------------------------
+# (국가 × 혈액형) 개수 행렬을 np.bincount 로 만든다.
+# 파일마다 한 번만 집계해 두고, 파일이 추가되면 행렬끼리 더하기만 한다.
+
+REQUIRED_COLS = {"country", "blood_type"}
+CHUNK_ROWS = 500_000
+
+# 대시보드 샘플 데이터
+SAMPLE_CSV = """country,blood_type
+South Korea,A
+South Korea,B
+South Korea,O
+Japan,A
+Japan,B
+Japan,O
+USA,B
+USA,O
+USA,A
+India,B
+India,O
+India,A
+Brazil,O
+Brazil,B
+Brazil,A
+Germany,A
+Germany,O
+Germany,B
+France,O
+France,B
+France,A
+"""
+
+
+def content_digest(data):
+    """업로드 내용(bytes)의 sha256. 캐시 키로 쓴다."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalise(df):
+    """컬럼명 소문자·공백 제거, 국가명 strip, 혈액형 대문자. 필수 컬럼이 없으면 MissingColumnsError."""
+    df = df.rename(columns={c: c.strip().lower() for c in df.columns})
+    if not REQUIRED_COLS.issubset(set(df.columns)):
+        raise MissingColumnsError("CSV에 최소한 'country'와 'blood_type' 컬럼이 있어야 합니다.")
+    df["country"] = df["country"].astype(str).str.strip()
+    df["blood_type"] = df["blood_type"].astype(str).str.strip().str.upper()
+    return df
+
+
+class BloodCounts:
+    """(국가 × 혈액형) 개수 행렬. 국가·혈액형은 이름순으로 정렬해 둔다."""
+
+    def __init__(self, countries=(), types=(), counts=None):
+        self.countries = list(countries)
+        self.types = list(types)
+        if counts is None:
+            counts = np.zeros((len(self.countries), len(self.types)), dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_codes(cls, country_codes, type_codes, countries, types):
+        n_c, n_t = len(countries), len(types)
+        flat = np.bincount(
+            np.asarray(country_codes, dtype=np.int64) * n_t + type_codes,
+            minlength=n_c * n_t,
+        )
+        return cls(countries, types, flat.reshape(n_c, n_t)).sorted()
+
+    @classmethod
+    def from_frame(cls, df):
+        """정규화된 DataFrame(country, blood_type) → 개수 행렬."""
+        country_codes, countries = pd.factorize(df["country"])
+        type_codes, types = pd.factorize(df["blood_type"])
+        return cls.from_codes(country_codes, type_codes, list(countries), list(types))
+
+    def sorted(self):
+        c_order = np.argsort(self.countries, kind="stable")
+        t_order = np.argsort(self.types, kind="stable")
+        return BloodCounts(
+            [self.countries[i] for i in c_order],
+            [self.types[i] for i in t_order],
+            self.counts[np.ix_(c_order, t_order)],
+        )
+
+    def merge(self, other):
+        """두 집계를 더한 새 BloodCounts (국가·혈액형 목록은 합집합)."""
+        countries = sorted(set(self.countries) | set(other.countries))
+        types = sorted(set(self.types) | set(other.types))
+        c_pos = {c: i for i, c in enumerate(countries)}
+        t_pos = {t: i for i, t in enumerate(types)}
+        counts = np.zeros((len(countries), len(types)), dtype=np.int64)
+        for part in (self, other):
+            rows = [c_pos[c] for c in part.countries]
+            cols = [t_pos[t] for t in part.types]
+            counts[np.ix_(rows, cols)] += part.counts
+        return BloodCounts(countries, types, counts)
+
+    @property
+    def total(self):
+        return self.counts.sum(axis=1)
+
+    def to_snapshot(self):
+        return {"counts": self.counts}, {"countries": self.countries, "types": self.types}
+
+    @classmethod
+    def from_snapshot(cls, artefact):
+        return cls(artefact.meta["countries"], artefact.meta["types"], artefact["counts"])
+
+
+class BloodSummary:
+    """대시보드에서 쓰는 파생 결과를 데이터셋마다 한 번만 계산해 둔 것.
+
+    - 국가 × 혈액형 비율(%) 행렬
+    - 국가별 우세 혈액형과, 개수/비율 기준 내림차순 순서
+    Top N·스택·국가 상세는 이 배열을 잘라 쓰기만 한다.
+    """
+
+    def __init__(self, blood_counts):
+        has_data = blood_counts.total > 0
+        self.countries = np.asarray(blood_counts.countries, dtype=object)[has_data]
+        self.types = list(blood_counts.types)
+        self.counts = blood_counts.counts[has_data]
+        self.total = self.counts.sum(axis=1)
+        self.pct = self.counts / self.total[:, None] * 100
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+
+        best = self.counts.argmax(axis=1) if self.counts.size else np.zeros(len(self.counts), dtype=np.int64)
+        rows = np.arange(len(self.counts))
+        self.dominant_type = np.asarray(self.types, dtype=object)[best]
+        self.dominant_count = self.counts[rows, best]
+        self.dominant_pct = self.pct[rows, best]
+        self.order = {
+            "dominant_count": np.argsort(-self.dominant_count, kind="stable"),
+            "dominant_pct": np.argsort(-self.dominant_pct, kind="stable"),
+        }
+
+    def dominant(self, idx=None):
+        if idx is None:
+            idx = self.order["dominant_count"]
+        return pd.DataFrame({
+            "country": self.countries[idx],
+            "dominant_blood_type": self.dominant_type[idx],
+            "dominant_count": self.dominant_count[idx],
+            "total_count": self.total[idx],
+            "dominant_pct": self.dominant_pct[idx],
+        })
+
+    def top(self, metric, n):
+        """metric 기준 상위 n개국 (막대그래프용, 오름차순)."""
+        return self.dominant(self.order[metric][:n][::-1])
+
+    def stack(self, n):
+        """dominant_count 상위 n개국의 혈액형 비율(%) (국가 이름순)."""
+        idx = np.sort(self.order["dominant_count"][:n])
+        out = pd.DataFrame(self.pct[idx], columns=self.types)
+        out.insert(0, "country", self.countries[idx])
+        return out
+
+    def detail(self, country):
+        """국가 하나의 혈액형별 개수·비율 (개수 내림차순, 0 은 제외)."""
+        i = self.country_index[country]
+        order = np.argsort(-self.counts[i], kind="stable")
+        order = order[self.counts[i][order] > 0]
+        return pd.DataFrame({
+            "blood_type": np.asarray(self.types, dtype=object)[order],
+            "count": self.counts[i][order],
+            "pct": self.pct[i][order],
+        })
+
+
+def count_csv(f, size=None, chunk_rows=CHUNK_ROWS, progress=None):
+    """CSV 를 chunk 단위로 읽으며 바로 개수 행렬에 더한다.
+
+    country / blood_type 두 컬럼만 읽고 (인코딩은 ingest 가 판단) chunk 마다 정규화하므로
+    파일이 커져도 메모리 사용량은 chunk 크기 정도로 유지된다.
+    progress 를 주면 읽은 비율(0~1)로 호출한다 (f 가 tell() 을 지원하고 size 를 알 때).
+    """
+    counts = BloodCounts()
+    for chunk in ingest.iter_csv(f, ingest.BLOOD, chunk_rows):
+        counts = counts.merge(BloodCounts.from_frame(normalise(chunk)))
+        if progress is not None and size:
+            progress(min(f.tell() / size, 1.0))
+    return counts
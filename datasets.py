@@ -0,0 +1,345 @@
+import os
+import sys
+import time
+
+import streamlit as st
+
+import profiling
+
+# ----------------------------
+# 데이터셋 레지스트리
+# ----------------------------
+# 모든 페이지가 데이터를 여기서 꺼내 쓴다. 데이터셋마다
+#   - version(): 원본 파일이 바뀌면 달라지는 값 (mtime·크기·내용 해시 등)
+#   - load(*의존 데이터셋): 실제로 읽는 함수 (처음 쓰일 때 한 번만)
+# 을 등록해 두면, 프로세스 전체에서 버전마다 한 개만 st.cache_resource 에 올린다.
+# 버전이 바뀌면 (max_entries=1 이라) 예전 객체는 버리고 새로 읽는다.
+# 돌려주는 객체는 모든 세션이 공유하므로 읽기 전용으로 다뤄야 한다.
+# numpy / pandas 와 데이터 모듈은 데이터셋을 실제로 읽을 때 가져온다 (페이지 첫 화면을 가볍게).
+#
+# save / restore 가 있는 데이터셋은 `python snapshot.py` 가 미리 계산해 둔 스냅샷에
+# 같은 버전이 있으면 계산하지 않고 거기서 (mmap 으로) 연다.
+
+
+class Dataset:
+    def __init__(self, name, load, version, depends=(), description="", save=None, restore=None):
+        self.name = name
+        self.load = load
+        self.version = version
+        self.depends = tuple(depends)
+        self.description = description or name
+        self.save = save
+        self.restore = restore
+        self.cached = self._make_cached()
+
+    def _restore(self, version, deps):
+        """스냅샷에서 연 값 (없거나 버전이 다르거나 읽다 실패하면 None)."""
+        import snapshot
+        artefact = snapshot.find(self.name, version)
+        if artefact is None:
+            return None
+        try:
+            return self.restore(artefact, *deps)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _make_cached(self):
+        def load(version):
+            t0 = time.perf_counter()
+            deps = [get(d) for d in self.depends]
+            value = self._restore(version, deps) if self.restore is not None else None
+            source = "snapshot" if value is not None else "계산"
+            if value is None:
+                value = self.load(*deps)
+            # 의존 데이터셋 메모리는 그쪽에서 센다
+            heap, mapped = memory_footprint(value, exclude=deps)
+            _stats[self.name] = {
+                "version": version,
+                "load_ms": (time.perf_counter() - t0) * 1000,
+                "loaded_at": time.time(),
+                "heap_bytes": heap,
+                "mapped_bytes": mapped,
+                "source": source,
+            }
+            return value
+
+        # st.cache_resource 는 함수 이름(__qualname__)으로 캐시를 구분하므로 데이터셋마다 다르게
+        load.__name__ = load.__qualname__ = f"dataset_{self.name}"
+        return st.cache_resource(max_entries=1, show_spinner=f"{self.description} 불러오는 중...")(load)
+
+
+_registry = {}
+_stats = {}
+
+
+def register(name, version, depends=(), description="", save=None, restore=None):
+    """데이터셋 등록 데코레이터. version 은 인자 없는 함수.
+
+    save(value, path) / restore(artefact, *의존 데이터셋) 을 주면 스냅샷에 넣고 꺼낼 수 있다.
+    """
+    def decorator(load):
+        _registry[name] = Dataset(name, load, version, depends, description, save, restore)
+        return load
+    return decorator
+
+
+def dataset(name):
+    return _registry[name]
+
+
+def version(name):
+    ds = _registry[name]
+    own = ds.version() if ds.version is not None else None
+    return (own, *(version(d) for d in ds.depends))
+
+
+def get(name):
+    """name 데이터셋 (없으면 처음 한 번 읽는다). 걸린 시간은 rerun 의 "data" 단계로 기록."""
+    ds = _registry[name]
+    with profiling.stage("data"):
+        return ds.cached(version(name))
+
+
+def names():
+    return list(_registry)
+
+
+def clear(name=None):
+    for ds in ([_registry[name]] if name else _registry.values()):
+        ds.cached.clear()
+        _stats.pop(ds.name, None)
+
+
+def memory_footprint(obj, exclude=()):
+    """(힙 메모리 bytes, mmap 으로 매핑된 bytes) 추정치. 같은 객체는 한 번만 센다."""
+    import numpy as np
+    import pandas as pd
+
+    heap = mapped = 0
+    seen = {id(o) for o in exclude}
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or o is None:
+            continue
+        seen.add(id(o))
+        if isinstance(o, np.memmap):
+            mapped += o.nbytes
+        elif isinstance(o, np.ndarray):
+            heap += o.nbytes if o.base is None else 0
+            if o.base is not None:
+                stack.append(o.base)
+            elif o.dtype == object:
+                stack.extend(o.ravel())
+        elif isinstance(o, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = o.memory_usage(deep=True)
+            heap += int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+        elif isinstance(o, dict):
+            heap += sys.getsizeof(o)
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            heap += sys.getsizeof(o)
+            stack.extend(o)
+        elif isinstance(o, (str, bytes, int, float, bool)):
+            heap += sys.getsizeof(o)
+        elif hasattr(o, "__dict__") and not isinstance(o, type):
+            heap += sys.getsizeof(o)
+            stack.append(vars(o))
+        else:
+            heap += sys.getsizeof(o)
+    return heap, mapped
+
+
+def report():
+    """데이터셋별 상태·메모리 사용량 표."""
+    import pandas as pd
+
+    rows = []
+    for name, ds in _registry.items():
+        s = _stats.get(name)
+        rows.append({
+            "dataset": name,
+            "설명": ds.description,
+            "로드됨": s is not None,
+            "로드 시간(ms)": None if s is None else round(s["load_ms"], 1),
+            "출처": None if s is None else s["source"],
+            "메모리(MB)": None if s is None else round(s["heap_bytes"] / 2**20, 2),
+            "mmap(MB)": None if s is None else round(s["mapped_bytes"] / 2**20, 2),
+            "의존": ", ".join(ds.depends),
+        })
+    return pd.DataFrame(rows)
+
+
+def _mtime(path):
+    return (os.stat(path).st_mtime_ns, os.stat(path).st_size) if os.path.exists(path) else None
+
+
+def _arrays(module, cls, with_deps=False):
+    """to_snapshot() / from_snapshot(artefact) 이 있는 클래스용 save·restore.
+
+    with_deps 면 from_snapshot 에 의존 데이터셋도 넘긴다.
+    """
+    def save(value, path):
+        import snapshot
+        snapshot.write(path, *value.to_snapshot())
+
+    def restore(artefact, *deps):
+        import importlib
+        deps = deps if with_deps else ()
+        return getattr(importlib.import_module(module), cls).from_snapshot(artefact, *deps)
+
+    return {"save": save, "restore": restore}
+
+
+def _save_subway(store, path):
+    import snapshot
+    import subway_data
+    snapshot.write(path, {}, {"partitions": subway_data.copy_store(store, path)})
+
+
+def _restore_subway(artefact):
+    import subway_data
+    return subway_data.open_store(artefact.path, artefact.meta["partitions"])
+
+
+# ----------------------------
+# 등록된 데이터셋
+# ----------------------------
+
+def _subway_version():
+    import subway_data
+    return subway_data.sources_fingerprint(subway_data.DATA_DIR)
+
+
+@register("subway", _subway_version, description="지하철 승하차 (subway*.csv)",
+          save=_save_subway, restore=_restore_subway)
+def _load_subway():
+    import subway_data
+    return subway_data.load_store(subway_data.DATA_DIR)
+
+
+@register("subway_rankings", None, depends=["subway"], description="날짜·호선별 역 순위",
+          **_arrays("subway_data", "StationRankings"))
+def _load_subway_rankings(store):
+    import subway_data
+    return subway_data.StationRankings(store)
+
+
+@register("subway_cube", None, depends=["subway"], description="기간 분석용 이용객 행렬",
+          **_arrays("subway_data", "RidershipCube"))
+def _load_subway_cube(store):
+    import subway_data
+    return subway_data.RidershipCube(store)
+
+
+@register("subway_anomalies", None, depends=["subway"], description="역별 이상 이용(급증·급감)")
+def _load_subway_anomalies(store):
+    """저장된 탐지 상태에 새 날짜만 더한다 (subway_anomaly.STATE_DIR)."""
+    import subway_anomaly
+    return subway_anomaly.update(store)
+
+
+def _mbti_version():
+    import mbti_data
+    path = mbti_data.find_csv()
+    return path and mbti_data.file_fingerprint(path)
+
+
+@register("mbti", _mbti_version, description="국가별 MBTI 비율", **_arrays("mbti_data", "MbtiData"))
+def _load_mbti():
+    """CSV 가 없으면 None. 필수 컬럼이 없으면 ValueError."""
+    import mbti_data
+    path = mbti_data.find_csv()
+    return mbti_data.load_mbti(path) if path else None
+
+
+@register("mbti_models", None, depends=["mbti"], description="MBTI 유사도 인덱스·군집",
+          **_arrays("mbti_data", "MbtiModels", with_deps=True))
+def _load_mbti_models(data):
+    import mbti_data
+    return mbti_data.MbtiModels(data) if data is not None else None
+
+
+def _places_version():
+    import seoul_places
+    return seoul_places.places_version()
+
+
+@register("seoul_places", _places_version, description="서울 관광지 목록")
+def _load_seoul_places():
+    import seoul_places
+    return seoul_places.places_frame()
+
+
+@register("seoul_distances", None, depends=["seoul_places"], description="관광지 사이 거리(km) 행렬")
+def _load_seoul_distances(places):
+    """n×n float64 라 관광지가 많으면 커지므로 result_cache 예산 밖(레지스트리)에 둔다."""
+    import itinerary
+    return itinerary.haversine_matrix(places["lat"], places["lon"])
+
+
+def _stations_version():
+    import station_index
+    return _mtime(station_index.STATIONS_CSV)
+
+
+@register("station_index", _stations_version, description="지하철역 좌표 격자 인덱스")
+def _load_station_index():
+    import station_index
+    if not os.path.exists(station_index.STATIONS_CSV):
+        return None
+    stations = station_index.load_stations()
+    return station_index.StationIndex(stations["역명"], stations["lat"], stations["lon"])
+
+
+def _save_nearby(nearby, path):
+    import snapshot
+    snapshot.write(path, {}, {"nearby": nearby})
+
+
+@register("seoul_nearby", None, depends=["seoul_places", "station_index", "subway"],
+          description="관광지별 가까운 역 설명",
+          save=_save_nearby, restore=lambda artefact, *deps: artefact.meta["nearby"])
+def _load_seoul_nearby(places, index, store):
+    """관광지 순서대로 가까운 역 설명 목록. 역 좌표 파일이 없으면 None."""
+    import station_index
+    if index is None:
+        return None
+    near = station_index.join_nearest(
+        places, index, station_index.station_ridership(store), store.station_lines()
+    )
+    return [[station_index.describe(s) for s in stations_near] for stations_near in near]
+
+
+def _tour_version():
+    import tour_search
+    return tour_search.catalogue_version()
+
+
+@register("tour_index", _tour_version, description="관광지 검색 인덱스",
+          **_arrays("tour_search", "TourIndex"))
+def _load_tour_index():
+    import tour_search
+    return tour_search.TourIndex(tour_search.load_catalogue(tour_search.TOUR_LIST))
+
+
+def _blood_sample_version():
+    import blood_data
+    return blood_data.content_digest(blood_data.SAMPLE_CSV.encode())
+
+
+@register("blood_sample", _blood_sample_version, description="혈액형 샘플 데이터")
+def _load_blood_sample():
+    import io
+
+    import blood_data
+    import ingest
+    return ingest.read_csv(io.BytesIO(blood_data.SAMPLE_CSV.encode()), ingest.BLOOD)
+
+
+@register("blood_sample_counts", None, depends=["blood_sample"], description="혈액형 샘플 집계",
+          **_arrays("blood_data", "BloodCounts"))
+def _load_blood_sample_counts(sample):
+    import blood_data
+    return blood_data.BloodCounts.from_frame(blood_data.normalise(sample))
@@ -0,0 +1,87 @@
+import os
+
+import streamlit as st
+
+import datasets
+import profiling
+import result_cache
+
+# ----------------------------
+# 진단 화면 (사이드바에는 없음)
+# ----------------------------
+# main.py 에 ?diagnostics 를 붙여서 연다. DIAGNOSTICS_TOKEN 환경 변수가 있으면
+# ?diagnostics=<토큰> 이 맞아야 보여 준다.
+
+QUERY_PARAM = "diagnostics"
+
+
+def requested():
+    """이번 요청이 진단 화면을 연 것인지."""
+    if QUERY_PARAM not in st.query_params:
+        return False
+    token = os.environ.get("DIAGNOSTICS_TOKEN")
+    return not token or st.query_params[QUERY_PARAM] == token
+
+
+def render():
+    st.title("🩺 rerun 진단")
+    runs = profiling.runs()
+    st.caption(
+        f"최근 rerun {len(runs)}개 (최대 {profiling.RING_SIZE}개 보관, 이 프로세스 기준). "
+        "단계: data=데이터셋, filter=조회·계산, figure=그래프 생성, render=화면 전송(직렬화 포함)"
+    )
+    if not profiling.ENABLED:
+        st.warning("PROFILE=0 으로 꺼져 있습니다.")
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        "JSON 내보내기",
+        profiling.export_json(),
+        file_name="rerun_profile.json",
+        mime="application/json",
+    )
+    if col2.button("기록 지우기"):
+        profiling.reset()
+        st.rerun()
+
+    st.subheader("페이지·단계별 시간 (ms)")
+    timings = profiling.summary()
+    if timings.empty:
+        st.info("아직 기록된 rerun 이 없습니다. 다른 페이지를 열어 보세요.")
+    else:
+        st.dataframe(
+            timings.sort_values(["page", "p50"], ascending=[True, False]),
+            hide_index=True,
+            column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("p50", "p95", "p99", "max")},
+        )
+
+    st.subheader("payload 크기 (KB)")
+    payloads = profiling.payload_summary()
+    if not payloads.empty:
+        for c in ("p50", "p95", "p99", "max"):
+            payloads[c] = payloads[c] / 1024
+        st.dataframe(
+            payloads,
+            hide_index=True,
+            column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("p50", "p95", "p99", "max")},
+        )
+
+    st.subheader("데이터셋 메모리")
+    st.dataframe(datasets.report(), hide_index=True)
+
+    st.subheader("결과 캐시")
+    caches = result_cache.stats()
+    if caches.empty:
+        st.info("아직 사용된 캐시가 없습니다.")
+    else:
+        st.caption(
+            f"사용 {caches['사용(MB)'].sum():.1f} MB / 예산 {caches['예산(MB)'].sum():.0f} MB. "
+            "예산(CACHE_<이름공간>_MB)을 넘으면 오래 안 쓴 항목부터 축출, TTL 이 지나면 만료"
+        )
+        st.dataframe(caches, hide_index=True)
+        if st.button("결과 캐시 비우기"):
+            result_cache.clear()
+            st.rerun()
+
+    with st.expander("최근 rerun 20개"):
+        st.json(runs[-20:][::-1], expanded=False)
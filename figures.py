@@ -0,0 +1,94 @@
+import base64
+import copy
+
+import result_cache
+
+# ----------------------------
+# 그래프 캐시 + payload 줄이기
+# ----------------------------
+# 페이지는 그래프를
+#   fig = figures.cached("station_bar", (날짜, 호선, 데이터 버전), build)
+# 처럼 입력 key 와 만드는 함수(build)로 요청한다. 같은 (이름, key) 는 프로세스 전체에서
+# 한 번만 만들고, 만든 뒤 slim() 으로 브라우저에 보낼 JSON 을 줄여 둔다.
+# 캐시는 result_cache 의 "figures" 이름공간 (메모리 예산을 넘으면 오래 안 쓴 그래프부터 버림).
+# 돌려주는 Figure 는 모든 세션이 같이 쓰므로 고치면 안 된다 (update_layout 등은 build 안에서).
+# key 에는 그래프에 영향을 주는 값과 데이터셋 버전을 모두 넣어야 한다.
+
+SIG_DIGITS = 6  # JSON 숫자 리스트의 유효 숫자
+# plotly.js 가 받는 정수 typed array (작은 것부터)
+INT_DTYPES = ("i1", "u1", "i2", "u2", "i4", "u4")
+
+
+def cached(name, key, build):
+    """(name, key) 의 그래프. 처음이면 build() 로 만들고 slim 해서 캐시한다."""
+    return result_cache.namespace("figures", size=_figure_size).get((name, key), lambda: _make(build))
+
+
+def _make(build):
+    import plotly.graph_objects as go
+    return go.Figure(slim(build()))
+
+
+def _figure_size(fig):
+    return result_cache.sizeof(fig.to_plotly_json())
+
+
+def slim(fig):
+    """Figure(또는 dict) → 브라우저로 보낼 크기를 줄인 dict.
+
+    - 템플릿의 trace 기본값(data)은 그래프에 있는 trace 종류만 남긴다
+    - 숫자 배열(typed array 나 numpy 배열)은 정수로 딱 떨어지면 작은 정수형, 아니면 float32 로
+    - 숫자 리스트는 유효 숫자 SIG_DIGITS 자리로 반올림
+    - 모든 막대가 같은 색이면 색 배열 대신 색 하나로
+    """
+    spec = fig.to_dict() if hasattr(fig, "to_dict") else copy.deepcopy(fig)
+    used = {trace.get("type", "scatter") for trace in spec["data"]}
+    template = spec.get("layout", {}).get("template")
+    if template and "data" in template:
+        template["data"] = {k: v for k, v in template["data"].items() if k in used}
+    spec["data"] = [_slim(trace) for trace in spec["data"]]
+    return spec
+
+
+def _slim(value, key=None):
+    if hasattr(value, "dtype") and hasattr(value, "astype"):  # plotly 5 의 to_dict() 는 numpy 배열 그대로
+        return _smaller(value)
+    if isinstance(value, dict):
+        if "bdata" in value and "dtype" in value:
+            return _slim_typed(value)
+        return {k: _slim(v, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and value:
+        if key == "color" and len(value) > 1 and all(isinstance(v, str) and v == value[0] for v in value):
+            return value[0]
+        if all(isinstance(v, float) for v in value):
+            return [float(f"{v:.{SIG_DIGITS}g}") for v in value]
+        return [_slim(v) for v in value]
+    return value
+
+
+def _slim_typed(typed):
+    """plotly 의 base64 typed array ({"dtype", "bdata", "shape"}) 를 더 작은 형으로."""
+    import numpy as np
+
+    arr = np.frombuffer(base64.b64decode(typed["bdata"]), dtype=typed["dtype"])
+    out = _smaller(arr)
+    if out is arr:
+        return typed
+    return {**typed, "dtype": out.dtype.str[1:], "bdata": base64.b64encode(out.tobytes()).decode("ascii")}
+
+
+def _smaller(arr):
+    """숫자 배열을 값이 그대로 들어가는 가장 작은 정수형, 아니면 float32 로. 줄지 않으면 arr 그대로."""
+    import numpy as np
+
+    if arr.dtype.kind not in "iuf":
+        return arr
+    out = arr.astype("f4") if arr.dtype.kind == "f" else arr
+    if arr.size and np.isfinite(arr).all() and (arr == np.rint(arr)).all():
+        lo, hi = arr.min(), arr.max()
+        for dtype in INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                out = arr.astype(dtype)
+                break
+    return out if out.nbytes < arr.nbytes else arr
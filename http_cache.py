@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+# ----------------------------
+# URL 다운로드 디스크 캐시
+# ----------------------------
+# 받은 파일을 .cache/http 에 저장해 두고, 다음 요청 때는
+# ETag / Last-Modified 로 조건부 GET 을 보내서 바뀌지 않았으면(304) 다시 받지 않는다.
+
+CACHE_DIR = ".cache/http"
+BLOCK_SIZE = 1 << 20
+TIMEOUT = 30
+ALLOWED_SCHEMES = ("http", "https")
+
+
+def check_url(url):
+    """http/https 이고 호스트가 있는 URL 만 통과. 아니면 ValueError.
+
+    사용자가 입력한 URL 을 서버가 대신 받으므로 file://, ftp:// 같은 scheme 은 막는다.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme.lower() not in ALLOWED_SCHEMES or not parts.hostname:
+        raise ValueError(f"http/https URL 만 사용할 수 있습니다: {url!r}")
+    return url
+
+
+class _SafeRedirectHandler(urllib.request.HTTPRedirectHandler):
+    # 기본 핸들러는 ftp:// 로의 리다이렉트도 따라가므로 한 번 더 검사
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        check_url(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+_opener = urllib.request.build_opener(_SafeRedirectHandler)
+
+
+def urlopen(request, timeout=TIMEOUT):
+    """check_url 을 거친 뒤 여는 urllib.request.urlopen. 리다이렉트 대상도 검사한다."""
+    url = request.full_url if isinstance(request, urllib.request.Request) else request
+    check_url(url)
+    return _opener.open(request, timeout=timeout)
+
+
+def _paths(url, cache_dir):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = Path(cache_dir) / key
+    return base.with_suffix(".body"), base.with_suffix(".json")
+
+
+def _read_meta(meta_path):
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def fetch(url, cache_dir=CACHE_DIR, timeout=TIMEOUT):
+    """url 을 디스크 캐시로 받아서 (로컬 경로, 메타정보) 를 돌려준다.
+
+    메타정보에는 etag, last_modified, size, sha256, status("hit" 이면 304 로 재사용) 가 있다.
+    http/https 가 아닌 URL 은 ValueError (check_url).
+    """
+    check_url(url)
+    body_path, meta_path = _paths(url, cache_dir)
+    meta = _read_meta(meta_path) if body_path.exists() else None
+
+    request = urllib.request.Request(url)
+    if meta:
+        if meta.get("etag"):
+            request.add_header("If-None-Match", meta["etag"])
+        if meta.get("last_modified"):
+            request.add_header("If-Modified-Since", meta["last_modified"])
+
+    try:
+        response = urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and meta:
+            return str(body_path), {**meta, "status": "hit"}
+        raise
+
+    # 본문은 블록 단위로 임시 파일에 쓰면서 해시를 계산 (메모리에 통째로 올리지 않음)
+    body_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = body_path.with_suffix(".part")
+    h = hashlib.sha256()
+    size = 0
+    with response, open(tmp_path, "wb") as out:
+        for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+            out.write(block)
+            h.update(block)
+            size += len(block)
+    os.replace(tmp_path, body_path)
+
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "size": size,
+        "sha256": h.hexdigest(),
+    }
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return str(body_path), {**meta, "status": "miss"}
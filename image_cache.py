@@ -0,0 +1,232 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageDraw, features
+
+import http_cache
+
+# ----------------------------
+# 관광지 이미지 디스크 캐시 + 썸네일
+# ----------------------------
+# 원본 이미지는 처음 한 번만 받아서 .cache/images 에 저장하고,
+# 화면에는 미리 줄여 둔 썸네일(WebP, 안 되면 JPEG) bytes 를 넘긴다.
+# 캐시 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 파일부터 지운다(LRU).
+
+CACHE_DIR = ".cache/images"
+MAX_BYTES = 200 * 1024 * 1024
+WIDTHS = (320, 640, 1280)
+TIMEOUT = 10
+RETRY_AFTER = 60  # 실패한 URL 은 이 시간(초) 동안 다시 받지 않는다
+BLOCK_SIZE = 1 << 16
+
+THUMB_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+THUMB_EXT = ".webp" if THUMB_FORMAT == "WEBP" else ".jpg"
+THUMB_QUALITY = 80
+PLACEHOLDER_COLOR = "#e9ecef"
+
+log = logging.getLogger(__name__)
+
+
+def quote_url(url):
+    """한글 파일명 등 ASCII 가 아닌 부분만 퍼센트 인코딩."""
+    return urllib.parse.quote(url, safe=":/?#[]@!$&'()*+,;=%~")
+
+
+class ImageCache:
+    """URL → 원본 파일 → 폭별 썸네일 bytes. 여러 스레드에서 같이 써도 된다."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES, widths=WIDTHS,
+                 timeout=TIMEOUT, workers=4):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.widths = tuple(sorted(widths))
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._failed = {}
+        self._pending = set()
+        self._placeholders = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-prefetch")
+
+        # 파일 경로 → 크기. 앞쪽일수록 오래 안 쓴 것 (시작할 때는 mtime 순)
+        files = sorted((p for p in self.dir.iterdir() if p.is_file() and p.suffix != ".part"),
+                       key=lambda p: p.stat().st_mtime)
+        self._lru = OrderedDict((p, p.stat().st_size) for p in files)
+        self.size = sum(self._lru.values())
+
+    # ---- 내부 ----
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _touch(self, path):
+        with self._lock:
+            if path in self._lru:
+                self._lru.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _add(self, path):
+        with self._lock:
+            self.size -= self._lru.pop(path, 0)
+            self._lru[path] = path.stat().st_size
+            self.size += self._lru[path]
+            # 방금 쓴 파일은 지우지 않는다
+            while self.size > self.max_bytes and len(self._lru) > 1:
+                old, nbytes = self._lru.popitem(last=False)
+                self.size -= nbytes
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+
+    def _download(self, url, path):
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+        with http_cache.urlopen(quote_url(url), timeout=self.timeout) as response, open(tmp, "wb") as out:
+            for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+                out.write(block)
+        os.replace(tmp, path)
+
+    def _read(self, path):
+        # 다른 스레드가 방금 지웠을 수도 있다
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return data
+
+    # ---- 공개 API ----
+
+    def original(self, url):
+        """원본 파일 경로. 캐시에 없으면 받아 온다. 받을 수 없으면 None."""
+        key = self._key(url)
+        path = self.dir / f"{key}.orig"
+        if path.exists():
+            self._touch(path)
+            return path
+        failed_at = self._failed.get(url)
+        if failed_at is not None and time.monotonic() - failed_at < RETRY_AFTER:
+            return None
+        with self._key_lock(key):
+            if not path.exists():
+                try:
+                    self._download(url, path)
+                except (urllib.error.URLError, OSError, ValueError) as e:
+                    log.info("image fetch failed: %s (%s)", url, e)
+                    self._failed[url] = time.monotonic()
+                    return None
+                self._failed.pop(url, None)
+                self._add(path)
+        return path
+
+    def _width(self, width):
+        return next((w for w in self.widths if w >= width), self.widths[-1])
+
+    def placeholder(self, width):
+        """이미지를 받을 수 없을 때 대신 보여 줄 회색 썸네일 bytes (폭마다 한 번만 만든다)."""
+        width = self._width(width)
+        with self._lock:
+            data = self._placeholders.get(width)
+        if data is None:
+            data = _placeholder(width)
+            with self._lock:
+                data = self._placeholders.setdefault(width, data)
+        return data
+
+    def thumbnail(self, url, width, fallback=True):
+        """width 이하로 줄인 썸네일 bytes. width 는 WIDTHS 중 그 이상인 가장 작은 값으로 맞춘다.
+
+        받을 수 없거나 이미지가 아니면 fallback=True 일 때 placeholder(width), 아니면 None.
+        """
+        width = self._width(width)
+        key = self._key(url)
+        path = self.dir / f"{key}_{width}{THUMB_EXT}"
+        data = self._read(path)
+        if data is not None:
+            return data
+
+        missing = self.placeholder(width) if fallback else None
+        src = self.original(url)
+        if src is None:
+            return missing
+        with self._key_lock(key):
+            if not path.exists():
+                try:
+                    data = _resize(src, width)
+                except OSError as e:  # 이미지가 아닌 파일 (HTML 오류 페이지 등)
+                    log.info("not an image: %s (%s)", url, e)
+                    return missing
+                tmp = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+                self._add(path)
+                return data
+        data = self._read(path)
+        return missing if data is None else data
+
+    def prefetch(self, urls, width):
+        """urls 의 썸네일을 백그라운드 스레드에서 미리 만들어 둔다."""
+        futures = []
+        for url in urls:
+            with self._lock:
+                if (url, width) in self._pending:
+                    continue
+                self._pending.add((url, width))
+            futures.append(self._pool.submit(self._prefetch_one, url, width))
+        return futures
+
+    def _prefetch_one(self, url, width):
+        try:
+            return self.thumbnail(url, width, fallback=False) is not None
+        except Exception:  # 백그라운드 작업이 죽어도 화면에는 영향이 없게
+            log.exception("prefetch failed: %s", url)
+            return False
+        finally:
+            with self._lock:
+                self._pending.discard((url, width))
+
+
+def _resize(src, width):
+    with Image.open(src) as img:
+        img.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+        transparent = "A" in img.mode or "transparency" in img.info
+        if THUMB_FORMAT == "JPEG" and transparent:
+            # 투명 배경은 흰색으로
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, "white")
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+        elif img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if transparent else "RGB")
+        buf = io.BytesIO()
+        img.save(buf, THUMB_FORMAT, quality=THUMB_QUALITY)
+        return buf.getvalue()
+
+
+def _placeholder(width):
+    height = width * 3 // 4
+    img = Image.new("RGB", (width, height), PLACEHOLDER_COLOR)
+    # 가운데에 X 표시
+    draw = ImageDraw.Draw(img)
+    draw.line((0, 0, width, height), fill="white", width=max(1, width // 160))
+    draw.line((0, height, width, 0), fill="white", width=max(1, width // 160))
+    buf = io.BytesIO()
+    img.save(buf, THUMB_FORMAT, quality=THUMB_QUALITY)
+    return buf.getvalue()
@@ -0,0 +1,218 @@
+import codecs
+import csv
+import importlib.util
+import os
+
+import pandas as pd
+
+# ----------------------------
+# CSV 읽기 공통 모듈
+# ----------------------------
+# 모든 로더(지하철, MBTI, 역 좌표, 관광지, 혈액형 업로드/URL)가 여기서 CSV 를 읽는다.
+#   - 인코딩은 파일 앞부분을 보고 고른다 (utf-8-sig / utf-8 / cp949, 앞부분이 전부 ASCII 면 처음 나오는 한글부터 본다)
+#   - 데이터셋마다 Schema 로 컬럼 dtype 을 정해 둔다 (반복되는 문자열은 category, 숫자는 작은 형)
+#   - PYARROW_MIN_BYTES 이상인 파일은 pyarrow 엔진(멀티스레드)으로, 나머지는 C 엔진 + memory_map 으로 읽는다
+#     (작은 파일은 pyarrow 시작 비용이 더 크다. chunk 단위로 읽을 때와 nrows 를 줄 때는
+#     pyarrow 엔진이 지원하지 않아 항상 C 엔진)
+
+SAMPLE_BYTES = 64 << 10
+ENCODINGS = ("utf-8", "cp949")
+ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+PYARROW_MIN_BYTES = 4 << 20
+NUMERIC = ("int8", "int16", "int32", "int64", "float32", "float64")
+
+
+class MissingColumnsError(ValueError):
+    pass
+
+
+def _sample(source, sample_bytes=SAMPLE_BYTES):
+    """파일 앞부분. 파일 객체는 읽은 뒤 원래 위치로 돌려놓는다."""
+    if hasattr(source, "read"):
+        pos = source.tell()
+        sample = source.read(sample_bytes)
+        source.seek(pos)
+        return sample
+    with open(source, "rb") as f:
+        return f.read(sample_bytes)
+
+
+def _non_ascii_sample(source, sample, sample_bytes=SAMPLE_BYTES, block_size=1 << 20):
+    """인코딩 판단용 표본. 앞부분이 전부 ASCII 면 처음 나오는 ASCII 아닌 바이트부터 잘라 온다.
+
+    ASCII 만으로는 utf-8 과 cp949 를 구분할 수 없어서, 헤더와 앞쪽 행이 영문·숫자뿐인
+    cp949 파일을 utf-8 로 잘못 고르지 않도록 한다. 파일 전체가 ASCII 면 원래 표본 그대로.
+    """
+    if not isinstance(sample, bytes) or not sample.isascii() or len(sample) < sample_bytes:
+        return sample
+    f = source if hasattr(source, "read") else open(source, "rb")
+    pos = f.tell()
+    try:
+        offset = pos + len(sample)
+        f.seek(offset)
+        for block in iter(lambda: f.read(block_size), b""):
+            if not block.isascii():
+                # 바로 앞까지 ASCII 라서 여기가 멀티바이트 문자의 첫 바이트다
+                start = next(i for i, b in enumerate(block) if b >= 0x80)
+                f.seek(offset + start)
+                return f.read(sample_bytes)
+            offset += len(block)
+        return sample
+    finally:
+        if f is source:
+            f.seek(pos)
+        else:
+            f.close()
+
+
+def sniff_encoding(source, sample_bytes=SAMPLE_BYTES):
+    """파일 경로나 바이너리 파일 객체의 인코딩."""
+    return _encoding(_non_ascii_sample(source, _sample(source, sample_bytes), sample_bytes))
+
+
+def _encoding(sample):
+    if isinstance(sample, str):
+        return None
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for encoding in ENCODINGS:
+        try:
+            # 표본 끝에서 잘린 멀티바이트 문자는 오류로 치지 않는다 (final=False)
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "cp949"
+
+
+class Schema:
+    """CSV 컬럼별 dtype 선언.
+
+    columns: {컬럼명: "category" | "str" | "int32" | "float32" ...}
+    default: 선언하지 않은 컬럼의 dtype (None 이면 선언한 컬럼만 읽는다)
+    required: 없으면 MissingColumnsError 를 내는 컬럼
+    ignore_case: 컬럼명을 앞뒤 공백·대소문자 무시하고 맞춘다
+    숫자 컬럼은 읽은 뒤 변환하며, 숫자가 아닌 값은 NaN 이 된다 (정수형이면 float64 로 남음).
+    """
+
+    def __init__(self, columns, default=None, required=(), ignore_case=False):
+        self.columns = dict(columns)
+        self.default = default
+        self.required = tuple(required)
+        self.ignore_case = ignore_case
+
+    def _key(self, name):
+        return name.strip().lower() if self.ignore_case else name
+
+    def resolve(self, header):
+        """실제 헤더 → {헤더 컬럼명: dtype} (읽을 컬럼만)."""
+        declared = {self._key(c): dtype for c, dtype in self.columns.items()}
+        found = {self._key(c) for c in header}
+        missing = [c for c in self.required if self._key(c) not in found]
+        if missing:
+            raise MissingColumnsError(f"CSV에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+        dtypes = {}
+        for c in header:
+            dtype = declared.get(self._key(c), self.default)
+            if dtype is not None:
+                dtypes[c] = dtype
+        return dtypes
+
+    def coerce(self, df, dtypes):
+        for c, dtype in dtypes.items():
+            if dtype not in NUMERIC or c not in df.columns or df[c].dtype == dtype:
+                continue
+            col = pd.to_numeric(df[c], errors="coerce")
+            if dtype.startswith("float") or not col.isna().any():
+                col = col.astype(dtype)
+            df[c] = col
+        return df
+
+
+def _parse_dtypes(dtypes, numeric=True):
+    return {
+        c: (str if dtype == "str" else dtype)
+        for c, dtype in dtypes.items()
+        if numeric or dtype not in NUMERIC
+    }
+
+
+def _header(source, sample, encoding):
+    # 보통은 앞부분의 첫 줄로 충분하다. 헤더가 표본보다 길면 pandas 로 한 번 더 읽는다
+    text = sample.decode(encoding or "utf-8", errors="replace") if isinstance(sample, bytes) else sample
+    if "\n" in text:
+        return next(csv.reader([text.split("\n", 1)[0].rstrip("\r")]))
+    pos = source.tell() if hasattr(source, "read") else None
+    header = pd.read_csv(source, encoding=encoding, nrows=0).columns
+    if pos is not None:
+        source.seek(pos)
+    return list(header)
+
+
+def _size(source):
+    if hasattr(source, "read"):
+        return getattr(source, "size", None) or 0
+    return os.path.getsize(source)
+
+
+def _options(source, schema, encoding, engine):
+    sample = _sample(source)
+    encoding = encoding or _encoding(_non_ascii_sample(source, sample))
+    options = {"encoding": encoding}
+    if schema is not None:
+        dtypes = schema.resolve(_header(source, sample, encoding))
+        options["usecols"] = list(dtypes)
+    else:
+        dtypes = {}
+    if engine is None:
+        engine = "pyarrow" if ENGINE == "pyarrow" and _size(source) >= PYARROW_MIN_BYTES else "c"
+    if engine == "pyarrow":
+        options["engine"] = "pyarrow"
+    elif not hasattr(source, "read"):
+        options["memory_map"] = True
+    return options, dtypes
+
+
+def read_csv(source, schema=None, encoding=None, engine=None, **kwargs):
+    """source(경로·파일 객체) 전체를 schema 대로 읽는다. 그 밖의 인자는 pd.read_csv 로."""
+    if "nrows" in kwargs:
+        engine = "c"
+    pos = source.tell() if hasattr(source, "read") else None
+    options, dtypes = _options(source, schema, encoding, engine)
+    if schema is None:
+        return pd.read_csv(source, **options, **kwargs)
+    try:
+        return pd.read_csv(source, dtype=_parse_dtypes(dtypes), **options, **kwargs)
+    except ValueError:
+        # 숫자 컬럼에 숫자가 아닌 값·빈 값이 있으면 그 컬럼은 읽은 뒤 변환한다
+        if pos is not None:
+            source.seek(pos)
+        df = pd.read_csv(source, dtype=_parse_dtypes(dtypes, numeric=False), **options, **kwargs)
+        return schema.coerce(df, dtypes)
+
+
+def iter_csv(source, schema=None, chunk_rows=200_000, encoding=None, **kwargs):
+    """chunk_rows 행씩 나눠 읽는 DataFrame 들 (메모리 사용량이 chunk 크기로 유지됨)."""
+    # chunk 중간에 실패하면 다시 읽을 수 없으므로 숫자 컬럼은 항상 읽은 뒤 변환
+    options, dtypes = _options(source, schema, encoding, "c")
+    if schema is not None:
+        options["dtype"] = _parse_dtypes(dtypes, numeric=False)
+    with pd.read_csv(source, chunksize=chunk_rows, **options, **kwargs) as reader:
+        for chunk in reader:
+            yield schema.coerce(chunk, dtypes) if schema is not None else chunk
+
+
+# ----------------------------
+# 데이터셋별 스키마
+# ----------------------------
+
+SUBWAY = Schema(
+    {"사용일자": "int32", "노선명": "category", "역명": "category", "승차총승객수": "int32", "하차총승객수": "int32"},
+    required=["사용일자", "노선명", "역명", "승차총승객수", "하차총승객수"],
+)
+# 국가명 + 16유형 비율 (퍼센트 또는 0~1)
+MBTI = Schema({"Country": "str"}, default="float32")
+STATIONS = Schema({"역명": "str", "lat": "float64", "lon": "float64"}, required=["역명", "lat", "lon"])
+TOUR = Schema({"region": "category", "name": "str", "type": "category"}, required=["region", "name", "type"])
+# 컬럼명 검사·정규화는 blood_data.normalise 에서 (한국어 안내 메시지)
+BLOOD = Schema({"country": "str", "blood_type": "str"}, ignore_case=True)
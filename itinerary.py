@@ -0,0 +1,164 @@
+import numpy as np
+
+# ----------------------------
+# 여행 일정 최적화
+# ----------------------------
+# 1) 관광지를 위치(위도·경도) 기준으로 여행 일수만큼 묶고 (하루 방문 수는 최대한 균등)
+# 2) 하루 안의 방문 순서를 nearest-neighbour + 2-opt 로 짧게 만든다.
+# 거리는 haversine(km) 으로 미리 계산한 (n × n) 행렬을 쓴다.
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_matrix(lat, lon):
+    """(n × n) 두 지점 사이 거리(km)."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def route_length(route, dist):
+    route = np.asarray(route)
+    if len(route) < 2:
+        return 0.0
+    return float(dist[route[:-1], route[1:]].sum())
+
+
+def _project(lat, lon):
+    # 도시 규모에서는 등장방형 투영(km)으로 충분하다
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    scale = np.cos(np.radians(lat.mean())) if len(lat) else 1.0
+    return np.column_stack([lat * 111.32, lon * 111.32 * scale])
+
+
+def _assign(dist, regret, capacity):
+    """regret 이 큰 관광지부터, 정원(capacity)이 남은 그룹 중 가장 가까운 곳에 배정."""
+    n, k = dist.shape
+    nearest = dist.argmin(axis=1)
+    if np.bincount(nearest, minlength=k).max() <= capacity:
+        return nearest  # 넘치는 그룹이 없으면 가장 가까운 그룹 그대로
+    # 관광지마다 가까운 그룹 순서를 한 번에 정렬해 두고, 배정은 정원만 세며 따라간다
+    prefs = np.argsort(dist, axis=1).tolist()
+    labels = [0] * n
+    size = [0] * k
+    for i in np.argsort(-regret, kind="stable").tolist():
+        for c in prefs[i]:
+            if size[c] < capacity:
+                labels[i] = c
+                size[c] += 1
+                break
+    return np.array(labels)
+
+
+def split_days(lat, lon, days, n_iter=20, seed=0):
+    """위치가 가까운 관광지끼리 days 개 그룹으로 나눈다 (그룹 크기는 최대 ceil(n/days))."""
+    xy = _project(lat, lon)
+    n = len(xy)
+    days = max(1, min(days, n))
+    capacity = -(-n // days)
+    rng = np.random.default_rng(seed)
+
+    # k-means++ 로 시작점 선택
+    centers = [xy[rng.integers(n)]]
+    d2 = ((xy - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, days):
+        p = d2 / d2.sum() if d2.sum() > 0 else None
+        centers.append(xy[rng.choice(n, p=p)])
+        d2 = np.minimum(d2, ((xy - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+
+    labels = np.full(n, -1)
+    for _ in range(n_iter):
+        # 가장 가까운 그룹과 그 다음 그룹의 차이가 큰 관광지부터,
+        # 정원이 남은 그룹 중 가장 가까운 곳에 배정
+        dist = np.sqrt(((xy[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2))
+        if days > 1:
+            two_best = np.partition(dist, 1, axis=1)[:, :2]
+            regret = two_best[:, 1] - two_best[:, 0]
+        else:
+            regret = np.zeros(n)
+        new_labels = _assign(dist, regret, capacity)
+        size = np.bincount(new_labels, minlength=days)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(days):
+            if size[c]:
+                centers[c] = xy[labels == c].mean(axis=0)
+    return [np.flatnonzero(labels == c) for c in range(days)]
+
+
+def _nearest_neighbour(nodes, dist, start):
+    nodes = np.asarray(nodes)
+    sub = dist[np.ix_(nodes, nodes)]
+    visited = np.zeros(len(nodes), dtype=bool)
+    pos = int(np.flatnonzero(nodes == start)[0])
+    route = [pos]
+    visited[pos] = True
+    for _ in range(len(nodes) - 1):
+        d = np.where(visited, np.inf, sub[route[-1]])
+        pos = int(np.argmin(d))
+        route.append(pos)
+        visited[pos] = True
+    return nodes[route]
+
+
+def two_opt(route, dist, max_passes=50):
+    """열린 경로(출발지로 돌아오지 않음)에 2-opt 개선을 적용한다.
+
+    구간 [i, j] 뒤집기를 i 마다 모든 j 에 대해 한 번에 계산한다. i = 0 (앞부분 뒤집기)도
+    보므로 출발지도 바뀔 수 있다. dist 는 경로의 관광지끼리만 잘라 낸 작은 행렬로 계산한다.
+    """
+    route = np.asarray(route)
+    m = len(route)
+    if m < 3:
+        return route
+    sub = dist[np.ix_(route, route)]
+    order = np.arange(m)  # route 안에서의 위치 → sub 의 행 번호
+    for _ in range(max_passes):
+        improved = False
+        for i in range(m - 1):
+            j = np.arange(i + 1, m)
+            b, c = order[i], order[j]
+            nxt = order[np.minimum(j + 1, m - 1)]
+            # 뒤집은 구간 뒤쪽 연결 (j 가 마지막이면 없음)
+            delta = np.where(j + 1 < m, sub[b, nxt] - sub[c, nxt], 0.0)
+            if i > 0:
+                a = order[i - 1]
+                delta += sub[a, c] - sub[a, b]
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-9:
+                order[i:j[k] + 1] = order[i:j[k] + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return route[order]
+
+
+def order_day(nodes, dist, n_starts=4):
+    """하루 방문 순서: 바깥쪽 관광지 몇 곳에서 nearest-neighbour 를 해 보고 가장 짧은 것을 2-opt."""
+    nodes = np.asarray(nodes, dtype=int)
+    if len(nodes) < 3:
+        return nodes.tolist()
+    # 다른 곳과 평균 거리가 먼(가장자리) 관광지에서 출발해야 경로가 덜 꼬인다
+    spread = dist[np.ix_(nodes, nodes)].mean(axis=1)
+    starts = nodes[np.argsort(-spread, kind="stable")[:n_starts]]
+    best = min(
+        (_nearest_neighbour(nodes, dist, s) for s in starts),
+        key=lambda r: route_length(r, dist),
+    )
+    return two_opt(best, dist).tolist()
+
+
+def plan_itinerary(lat, lon, days, dist=None, seed=0):
+    """일차별 방문 순서(행 번호 목록)를 돌려준다. 각 날은 서쪽→동쪽 순으로 정렬."""
+    if dist is None:
+        dist = haversine_matrix(lat, lon)
+    groups = split_days(lat, lon, days, seed=seed)
+    lon = np.asarray(lon, dtype=float)
+    groups = sorted((g for g in groups if len(g)), key=lambda g: lon[g].mean())
+    return [order_day(g, dist) for g in groups]
@@ -1,4 +1,12 @@
 import streamlit as st
+
+# ?diagnostics 로 열면 진단 화면 (사이드바 메뉴에는 나오지 않음)
+if 'diagnostics' in st.query_params:
+  import diagnostics
+  if diagnostics.requested():
+    diagnostics.render()
+    st.stop()
+
 st.title('나의 첫 웹서비스 만들기!')
 a=st.text_input('안녕하세요! 만나서 반가워요!')
 b=st.selectbox('좋아하는 음식을 선택하세요!',['오페라케이크','된장찌개','까르보나라'])
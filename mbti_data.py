@@ -0,0 +1,281 @@
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+# ----------------------------
+# 국가별 MBTI 데이터 로드·정규화
+# ----------------------------
+# CSV 를 한 번 읽어서 (국가 × 16유형) float32 행렬(퍼센트)과 국가 인덱스로 만든다.
+# 결과는 읽기 전용이라 여러 세션이 같은 객체를 공유해도 안전하다.
+
+CANDIDATES = [
+    "countriesMBTI_16types.csv",
+    "countriesMBTI_16types (2).csv",
+]
+COUNTRY_COL = "Country"
+
+
+def find_csv(candidates=CANDIDATES):
+    for c in candidates:
+        p = Path(c)
+        if p.exists():
+            return str(p)
+    return None
+
+
+def file_fingerprint(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+class MbtiData:
+    """국가 × MBTI 16유형 비율(%) 행렬."""
+
+    def __init__(self, countries, types, matrix):
+        self.countries = tuple(countries)
+        self.types = tuple(types)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.matrix.setflags(write=False)
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.sorted_countries = tuple(sorted(self.countries))
+
+        # 유형별 비율 내림차순 국가 순서 (한 번만 정렬해 두고 앞에서부터 자름)
+        self.rank_order = np.argsort(-self.matrix, axis=0, kind="stable")
+        self.is_korea = np.array(["korea" in c.lower() for c in self.countries], dtype=bool)
+        self._korea_first = []
+        for j in range(len(self.types)):
+            korea_ranked = self.rank_order[self.is_korea[self.rank_order[:, j]], j]
+            self._korea_first.append(int(korea_ranked[0]) if len(korea_ranked) else None)
+
+    def row(self, country):
+        return self.matrix[self.country_index[country]]
+
+    def column(self, mbti_type):
+        return self.matrix[:, self.types.index(mbti_type)]
+
+    def top_countries(self, mbti_type, n, include_korea=False):
+        """유형별 상위 n개국의 행 번호. include_korea 면 한국이 빠졌을 때 뒤에 붙인다."""
+        j = self.types.index(mbti_type)
+        idx = self.rank_order[:n, j]
+        korea = self._korea_first[j]
+        if include_korea and korea is not None and korea not in idx:
+            idx = np.append(idx, korea)
+        return idx
+
+    def to_snapshot(self):
+        return {"matrix": self.matrix}, {"countries": list(self.countries), "types": list(self.types)}
+
+    @classmethod
+    def from_snapshot(cls, artefact):
+        return cls(artefact.meta["countries"], artefact.meta["types"], artefact["matrix"])
+
+
+def ramp_colors(vals, palette, highlight=None, highlight_color="#e74c3c",
+                vrange=None, invert=False, flat_index=-3):
+    """값을 palette 색으로 변환 (벡터 연산).
+
+    highlight 위치는 highlight_color 로 칠하고, vrange 를 주지 않으면
+    vals 전체의 최소·최대를 기준으로 한다. invert 면 값이 높을수록 앞쪽 색.
+    """
+    vals = np.asarray(vals, dtype=float)
+    palette = np.asarray(palette, dtype=object)
+    n_shades = len(palette)
+    vmin, vmax = vrange if vrange is not None else (np.nanmin(vals), np.nanmax(vals))
+
+    if vmax - vmin == 0:
+        colors = np.full(len(vals), palette[flat_index], dtype=object)
+    else:
+        norm = (vals - vmin) / (vmax - vmin)
+        if invert:
+            norm = 1 - norm
+        shade_idx = np.clip((norm * (n_shades - 1)).astype(int), 0, n_shades - 1)
+        colors = palette[shade_idx]
+
+    if highlight is not None:
+        colors[highlight] = highlight_color
+    return colors.tolist()
+
+
+METRICS = {"cosine": "코사인 거리", "euclidean": "유클리드 거리"}
+
+
+def normalize(matrix, metric):
+    """cosine 이면 행을 단위 벡터로, euclidean 이면 그대로 (float32)."""
+    x = np.nan_to_num(np.asarray(matrix, dtype=np.float32))
+    if metric == "cosine":
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        x = x / np.where(norms == 0, 1, norms)
+    return x
+
+
+def _block_distances(block, x, sq_norms, metric):
+    if metric == "cosine":
+        return 1 - block @ x.T
+    block_sq = (block * block).sum(axis=1)[:, None]
+    return np.sqrt(np.maximum(block_sq + sq_norms[None, :] - 2 * block @ x.T, 0))
+
+
+class SimilarityIndex:
+    """행마다 가장 가까운 k개 행을 미리 구해 둔 k-NN 인덱스.
+
+    거리 계산은 block 행씩 나눠서 하므로 (n × n) 행렬을 통째로 만들지 않는다.
+    조회는 미리 계산된 행을 읽기만 한다.
+    """
+
+    def __init__(self, matrix, metric="cosine", k=20, block=2048):
+        x = normalize(matrix, metric)
+        n = len(x)
+        self.metric = metric
+        self.k = min(k, max(n - 1, 0))
+        self.neighbors = np.zeros((n, self.k), dtype=np.int32)
+        self.distances = np.zeros((n, self.k), dtype=np.float32)
+        if self.k == 0:
+            return
+
+        sq_norms = (x * x).sum(axis=1)
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            dist = _block_distances(x[start:stop], x, sq_norms, metric)
+            dist[np.arange(stop - start), np.arange(start, stop)] = np.inf  # 자기 자신 제외
+            part = np.argpartition(dist, self.k - 1, axis=1)[:, : self.k]
+            part_dist = np.take_along_axis(dist, part, axis=1)
+            order = np.argsort(part_dist, axis=1, kind="stable")
+            self.neighbors[start:stop] = np.take_along_axis(part, order, axis=1)
+            self.distances[start:stop] = np.take_along_axis(part_dist, order, axis=1)
+
+    def query(self, i, k=None):
+        """i 번째 행과 가장 가까운 k개 (행 번호, 거리)."""
+        k = self.k if k is None else min(k, self.k)
+        return self.neighbors[i, :k], self.distances[i, :k]
+
+
+def kmeans(matrix, k, metric="cosine", n_iter=100, seed=0):
+    """k-means++ 초기화 + Lloyd 반복. (군집 번호, 중심) 을 돌려준다.
+
+    비어 버린 군집은 자기 중심에서 가장 먼 점(2개 이상인 군집에서)으로 다시 심는다.
+    서로 다른 점이 k 개보다 적으면 일부 군집은 끝까지 비어 있을 수 있다.
+    """
+    x = normalize(matrix, metric).astype(np.float64)
+    n = len(x)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+
+    centers = [x[rng.integers(n)]]
+    d2 = ((x - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        p = d2 / d2.sum() if d2.sum() > 0 else None
+        centers.append(x[rng.choice(n, p=p)])
+        d2 = np.minimum(d2, ((x - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+
+    labels = np.full(n, -1)
+    for _ in range(n_iter):
+        dist = (x * x).sum(axis=1)[:, None] + (centers * centers).sum(axis=1)[None, :] - 2 * x @ centers.T
+        new_labels = dist.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        own = dist[np.arange(n), labels]
+        sizes = np.bincount(labels, minlength=k)
+        for c in np.flatnonzero(sizes == 0):
+            candidates = np.where(sizes[labels] > 1, own, -1.0)
+            far = candidates.argmax()
+            if candidates[far] <= 1e-12:  # 남은 점이 모두 자기 중심과 같다 (서로 다른 점 < k)
+                break
+            sizes[labels[far]] -= 1
+            sizes[c] = 1
+            labels[far] = c
+            own[far] = -1.0
+        for c in range(k):
+            members = x[labels == c]
+            if len(members):
+                centers[c] = members.mean(axis=0)
+        if metric == "cosine":
+            centers /= np.maximum(np.linalg.norm(centers, axis=1, keepdims=True), 1e-12)
+    return labels, centers
+
+
+def cluster_profiles(matrix, labels, k, top=3):
+    """비어 있지 않은 군집마다 (군집 번호, 행 번호들, 평균 비율이 높은 열 top 개)."""
+    out = []
+    for c in range(k):
+        rows = np.flatnonzero(labels == c)
+        if len(rows):
+            out.append((c, rows, np.argsort(-matrix[rows].mean(axis=0))[:top]))
+    return out
+
+
+CLUSTER_RANGE = range(2, 11)  # 페이지의 "군집 수" 슬라이더 범위
+
+
+class MbtiModels:
+    """거리 기준별 k-NN 인덱스와 k-means 군집 결과.
+
+    처음 요청될 때 하나씩 계산해 두고 (세션끼리 공유하므로 lock), 스냅샷에는 전부 계산해서 넣는다.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._similarity = {}
+        self._clusters = {}
+        self._lock = threading.Lock()
+
+    def similarity(self, metric):
+        with self._lock:
+            if metric not in self._similarity:
+                self._similarity[metric] = SimilarityIndex(self.data.matrix, metric)
+            return self._similarity[metric]
+
+    def clusters(self, metric, k):
+        """행마다 군집 번호 (0 ~ k-1)."""
+        with self._lock:
+            if (metric, k) not in self._clusters:
+                self._clusters[metric, k] = kmeans(self.data.matrix, k, metric)[0]
+            return self._clusters[metric, k]
+
+    def to_snapshot(self):
+        arrays = {}
+        for metric in METRICS:
+            index = self.similarity(metric)
+            arrays[f"neighbors_{metric}"] = index.neighbors
+            arrays[f"distances_{metric}"] = index.distances
+            arrays[f"labels_{metric}"] = np.array(
+                [self.clusters(metric, k) for k in CLUSTER_RANGE], dtype=np.int8
+            )
+        return arrays, {"metrics": list(METRICS), "clusters": list(CLUSTER_RANGE)}
+
+    @classmethod
+    def from_snapshot(cls, artefact, data):
+        models = cls(data)
+        for metric in artefact.meta["metrics"]:
+            index = SimilarityIndex.__new__(SimilarityIndex)
+            index.metric = metric
+            index.neighbors = artefact[f"neighbors_{metric}"]
+            index.distances = artefact[f"distances_{metric}"]
+            index.k = index.neighbors.shape[1]
+            models._similarity[metric] = index
+            labels = artefact[f"labels_{metric}"]
+            for k, row in zip(artefact.meta["clusters"], labels):
+                models._clusters[metric, k] = row.astype(np.int64)
+        return models
+
+
+def load_mbti(path):
+    """CSV → MbtiData. 필수 컬럼이 없으면 ValueError."""
+    df = ingest.read_csv(path, ingest.MBTI)
+    if COUNTRY_COL not in df.columns:
+        raise ValueError(f"CSV에 '{COUNTRY_COL}' 컬럼이 없습니다.")
+
+    mbti_cols = [c for c in df.columns if c != COUNTRY_COL]
+    values = df[mbti_cols].apply(pd.to_numeric, errors="coerce").to_numpy(np.float64)
+
+    # 비율(0~1)형태라면 퍼센트 변환
+    if len(values) and 0.9 <= np.nansum(values[0]) <= 1.1:
+        values = values * 100
+
+    return MbtiData(df[COUNTRY_COL].astype(str), mbti_cols, values)
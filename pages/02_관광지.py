@@ -1,11 +1,12 @@
 # streamlit_app.py
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-import pandas as pd
-import math
+import streamlit.components.v1 as components
+import datasets
+import profiling
+import result_cache
 
 st.set_page_config(page_title="Seoul Top10 - Folium Map", layout="wide")
+profiling.start("02_관광지")
 
 st.title("서울 인기 관광지 Top10 (외국인 선호) — 지하철 & 일정표 포함")
 st.markdown(
@@ -16,74 +17,44 @@ st.markdown(
 )
 
 # ----------------------------
-# 데이터: 관광지 + 지하철 정보
+# 데이터: 관광지 + 지하철 정보 (seoul_places.PLACES)
 # ----------------------------
-places = [
-    {"name": "Gyeongbokgung Palace (경복궁)", "lat": 37.5796, "lon": 126.9770,
-     "desc": "조선의 대표 궁궐, 광화문과 수문장 교대식이 유명함.",
-     "subway": "3호선 경복궁역"},
-    {"name": "N Seoul Tower (남산타워)", "lat": 37.5512, "lon": 126.9882,
-     "desc": "서울 중심 전망대, 야경 명소로 유명함.",
-     "subway": "4호선 명동역"},
-    {"name": "Myeongdong (명동)", "lat": 37.5638, "lon": 126.9850,
-     "desc": "쇼핑과 길거리 음식의 중심지.",
-     "subway": "4호선 명동역"},
-    {"name": "Bukchon Hanok Village (북촌한옥마을)", "lat": 37.5826, "lon": 126.9830,
-     "desc": "전통 한옥 거리와 포토 스팟.",
-     "subway": "3호선 안국역"},
-    {"name": "Hongdae (홍대)", "lat": 37.5563, "lon": 126.9220,
-     "desc": "젊음의 거리, 예술·음악·카페 문화가 활발한 지역.",
-     "subway": "2호선 홍대입구역"},
-    {"name": "Itaewon (이태원)", "lat": 37.5346, "lon": 126.9946,
-     "desc": "다양한 외국 식당과 밤문화가 공존하는 거리.",
-     "subway": "6호선 이태원역"},
-    {"name": "Dongdaemun Design Plaza (동대문 DDP)", "lat": 37.5663, "lon": 127.0090,
-     "desc": "현대적 디자인 랜드마크, 패션·야시장 중심지.",
-     "subway": "2·4·5호선 동대문역사문화공원역"},
-    {"name": "Insadong (인사동)", "lat": 37.5740, "lon": 126.9852,
-     "desc": "전통 공예품과 찻집이 즐비한 거리.",
-     "subway": "3호선 안국역"},
-    {"name": "Lotte World Tower (롯데월드타워)", "lat": 37.5131, "lon": 127.1019,
-     "desc": "서울 최고층 타워, 쇼핑몰·전망대 포함.",
-     "subway": "2호선 잠실역"},
-    {"name": "Hangang Park (한강공원, 여의도)", "lat": 37.5269, "lon": 126.9241,
-     "desc": "한강변에서 자전거와 피크닉을 즐길 수 있음.",
-     "subway": "5호선 여의나루역"}
-]
-
-df = pd.DataFrame(places)
+df = datasets.get("seoul_places")
 
 # ----------------------------
 # 지도 표시
 # ----------------------------
-center_lat = df["lat"].mean()
-center_lon = df["lon"].mean()
-
-m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
-
-for _, row in df.iterrows():
-    popup_html = f"""
-    <b>{row['name']}</b><br>
-    🚇 {row['subway']}<br>
-    {row['desc']}
-    """
-    folium.Marker(
-        location=[row["lat"], row["lon"]],
-        popup=folium.Popup(popup_html, max_width=300),
-        tooltip=row["name"],
-        icon=folium.Icon(color="red", icon="info-sign")
-    ).add_to(m)
+# 지도 HTML 은 관광지 목록(버전)마다 한 번만 만든다.
+# 관광지가 많으면 브라우저에서 마커를 묶어 그리는 클러스터 레이어를 쓴다.
+# 가까운 지하철역(좌표 격자 인덱스) + 역별 하루 평균 이용객은 데이터셋 레지스트리에서
+# (지하철 데이터는 지하철 분석 페이지와 같은 객체를 쓴다)
+nearby = datasets.get("seoul_nearby")
+
+@profiling.timed("figure")
+@result_cache.memoize("map_html")
+def load_map_html(version, _nearby):
+    import seoul_places  # 지도를 새로 그릴 때만 (folium 포함)
+    return seoul_places.map_html(df, _nearby)
+
+map_html = load_map_html(datasets.version("seoul_nearby"), nearby)
 
 st.markdown("<div style='width:70%; margin:auto;'>", unsafe_allow_html=True)
-st_folium(m, width=900, height=500)
+with profiling.stage("render"):
+    components.html(profiling.payload("folium_map", map_html), width=900, height=500)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # ----------------------------
 # 하단: 관광지 간략 요약
 # ----------------------------
+# 요약·일정의 지하철 정보는 지도 팝업과 같은 seoul_places.stations 로 (가까운 역 조인 결과)
+def stations(i):
+    import seoul_places
+    return seoul_places.stations(df.iloc[i], nearby[i] if nearby else None)
+
 st.subheader("📍 관광지 요약 정보 (지하철 포함)")
 for i, row in enumerate(df.itertuples(), 1):
-    st.markdown(f"**{i}. {row.name}** — {row.desc}  \n🚇 {row.subway}")
+    subway = "  \n".join(f"🚇 {s}" for s in stations(i - 1))
+    st.markdown(f"**{i}. {row.name}** — {row.desc}  \n{subway}")
 
 # ----------------------------
 # 여행 일정 생성 기능
@@ -91,20 +62,37 @@ for i, row in enumerate(df.itertuples(), 1):
 st.markdown("---")
 st.subheader("🗓️ 나만의 서울 여행 일정 만들기")
 
-days = st.slider("여행 일수를 선택하세요 (1~3일)", 1, 3, 2)
-places_per_day = math.ceil(len(df) / days)
+import itinerary
+
+# 관광지 사이 거리(km) 행렬은 데이터셋 레지스트리에, 일수별 일정은 관광지 목록(버전)마다 한 번만 계산
+@profiling.timed("plan")
+@result_cache.memoize("plan")
+def load_plan(version, days, _dist):
+    return itinerary.plan_itinerary(df["lat"], df["lon"], days, _dist)
+
+# 일정 부분만 다시 실행되도록 fragment 로 분리 (슬라이더를 움직여도 지도는 그대로)
+@st.fragment
+def travel_schedule():
+    # 슬라이더만 바뀌면 이 부분만 다시 실행되므로 따로 기록
+    profiling.start("02_관광지:일정", nested=True)
+    max_days = min(14, len(df))
+    days = st.slider(f"여행 일수를 선택하세요 (1~{max_days}일)", 1, max_days, min(2, max_days))
+
+    dist = datasets.get("seoul_distances")
+    plan = load_plan(datasets.version("seoul_distances"), days, dist)
+
+    st.write(f"👉 총 {len(plan)}일 동안 {len(df)}곳을 방문하는 일정입니다:")
 
-st.write(f"👉 총 {days}일 동안 {len(df)}곳을 방문하는 일정입니다:")
+    for day, route in enumerate(plan, 1):
+        st.markdown(f"### Day {day} (이동 약 {itinerary.route_length(route, dist):.1f}km)")
+        for i, idx in enumerate(route):
+            row = df.iloc[idx]
+            step = f" ➡️ {dist[route[i - 1], idx]:.1f}km" if i > 0 else ""
+            st.markdown(f"- **{row['name']}** — {row['desc']} (🚇 {stations(idx)[0]}){step}")
 
-schedule = {}
-for day in range(1, days + 1):
-    start = (day - 1) * places_per_day
-    end = start + places_per_day
-    schedule[day] = df.iloc[start:end]
+    st.caption("가까운 관광지끼리 하루로 묶고, 하루 안에서는 이동 거리(직선거리)가 짧은 순서로 방문합니다.")
+    profiling.finish()
 
-for day, subset in schedule.items():
-    st.markdown(f"### Day {day}")
-    for i, row in enumerate(subset.itertuples(), 1):
-        st.markdown(f"- **{row.name}** — {row.desc} (🚇 {row.subway})")
+travel_schedule()
 
-st.caption("일정은 이동 동선보다는 관광지 분포 기준으로 균등 배분됩니다.")
+profiling.finish()
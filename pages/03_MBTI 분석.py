@@ -1,11 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
-from pathlib import Path
+import datasets
+import figures
+import profiling
 
 st.set_page_config(page_title="Country MBTI Dashboard", layout="wide")
+profiling.start("03_MBTI 분석")
 
 st.title("🌍 국가별 MBTI 시각화 대시보드")
 st.markdown(
@@ -13,40 +12,38 @@ st.markdown(
     이 앱은 전 세계 158개국의 MBTI 유형 비율 데이터를 시각화합니다.  
     아래 탭을 전환해 보세요:
     1️⃣ **국가별 MBTI 분포 보기**  
-    2️⃣ **MBTI 유형별 상위 국가 보기**
+    2️⃣ **MBTI 유형별 상위 국가 보기**  
+    3️⃣ **MBTI 성향이 비슷한 국가 찾기**
     """
 )
 
-# --- CSV 파일 로드 ---
-candidates = [
-    "countriesMBTI_16types.csv",
-    "countriesMBTI_16types (2).csv",
-]
-df = None
-for c in candidates:
-    p = Path(c)
-    if p.exists():
-        df = pd.read_csv(p)
-        break
-
-if df is None:
+# --- 데이터 로드 (데이터셋 레지스트리: 파일이 바뀔 때만 다시 읽음) ---
+try:
+    data = datasets.get("mbti")
+except ValueError as e:
+    st.error(f"❌ {e}")
+    profiling.stop()
+
+if data is None:
     st.error("❌ 데이터 파일을 찾을 수 없습니다. CSV 파일을 앱 폴더에 넣어주세요.")
-    st.stop()
+    profiling.stop()
+
+# 무거운 라이브러리는 제목·데이터를 먼저 보여 준 뒤, 그래프를 그리기 직전에 가져온다
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sequential
 
-if "Country" not in df.columns:
-    st.error("❌ CSV에 'Country' 컬럼이 없습니다.")
-    st.stop()
+import mbti_data
 
-mbti_cols = [c for c in df.columns if c != "Country"]
-for c in mbti_cols:
-    df[c] = pd.to_numeric(df[c], errors="coerce")
+# 유사도 인덱스 / 군집 결과도 데이터 파일 기준으로 한 번만 계산 (스냅샷이 있으면 미리 계산된 것)
+models = datasets.get("mbti_models")
 
-# 비율(0~1)형태라면 퍼센트 변환
-if 0.9 <= df.loc[0, mbti_cols].sum() <= 1.1:
-    df[mbti_cols] *= 100
+fingerprint = datasets.version("mbti")
+
+mbti_cols = list(data.types)
 
 # --- 탭 구성 ---
-tab1, tab2 = st.tabs(["📊 국가별 MBTI 분포", "🌎 MBTI 유형별 상위 국가"])
+tab1, tab2, tab3 = st.tabs(["📊 국가별 MBTI 분포", "🌎 MBTI 유형별 상위 국가", "🧭 비슷한 국가 찾기"])
 
 # --------------------------------------------------------------------
 # TAB 1: 국가 선택 → MBTI 분포 보기
@@ -54,51 +51,46 @@ tab1, tab2 = st.tabs(["📊 국가별 MBTI 분포", "🌎 MBTI 유형별 상위
 with tab1:
     st.subheader("📊 국가별 MBTI 비율 보기")
 
-    country_selected = st.selectbox("국가를 선택하세요", sorted(df["Country"].tolist()))
-    row = df[df["Country"] == country_selected].iloc[0]
-    vals = row[mbti_cols].astype(float).values
+    country_selected = st.selectbox("국가를 선택하세요", data.sorted_countries)
+    vals = data.row(country_selected).astype(float)
     labels = mbti_cols
     vals_display = np.round(vals, 2)
     max_idx = int(np.argmax(vals))
 
-    # 색상: 1등은 빨강, 나머지는 파란색(값이 높을수록 밝게)
-    blues = px.colors.sequential.Blues
-    n_shades = len(blues)
-    red_hex = "#e74c3c"
-    colors = []
-    other_vals = np.delete(vals, max_idx)
-
-    if other_vals.max() - other_vals.min() == 0:
-        default_blue = blues[-3]
-        for i in range(len(vals)):
-            colors.append(red_hex if i == max_idx else default_blue)
-    else:
-        vmin, vmax = other_vals.min(), other_vals.max()
-        for i, v in enumerate(vals):
-            if i == max_idx:
-                colors.append(red_hex)
-            else:
-                norm = (v - vmin) / (vmax - vmin)
-                shade_idx = int((1 - norm) * (n_shades - 1))  # ✅ 반전: 값이 높을수록 밝은 파랑
-                colors.append(blues[shade_idx])
-
-    fig = go.Figure(
-        go.Bar(
-            x=labels,
-            y=vals_display,
-            marker=dict(color=colors, line=dict(color="rgba(0,0,0,0.08)", width=1)),
-            hovertemplate="%{x}<br>비율: %{y:.2f}%<extra></extra>",
+    # 그래프는 (국가, 데이터 버전)마다 한 번만 만든다
+    def build_country_bar():
+        # 색상: 1등은 빨강, 나머지는 파란색(값이 높을수록 밝게)
+        other_vals = np.delete(vals, max_idx)
+        colors = mbti_data.ramp_colors(
+            vals,
+            sequential.Blues,
+            highlight=max_idx,
+            highlight_color="#e74c3c",
+            vrange=(other_vals.min(), other_vals.max()),
+            invert=True,  # ✅ 반전: 값이 높을수록 밝은 파랑
+        )
+        fig = go.Figure(
+            go.Bar(
+                x=labels,
+                y=vals_display,
+                marker=dict(color=colors, line=dict(color="rgba(0,0,0,0.08)", width=1)),
+                hovertemplate="%{x}<br>비율: %{y:.2f}%<extra></extra>",
+            )
         )
-    )
-    fig.update_layout(
-        title=f"{country_selected} — MBTI 분포 (%)",
-        xaxis_title="MBTI 유형",
-        yaxis_title="비율 (%)",
-        template="simple_white",
-        margin=dict(l=40, r=20, t=80, b=40),
-    )
+        fig.update_layout(
+            title=f"{country_selected} — MBTI 분포 (%)",
+            xaxis_title="MBTI 유형",
+            yaxis_title="비율 (%)",
+            template="simple_white",
+            margin=dict(l=40, r=20, t=80, b=40),
+        )
+        return fig
+
+    with profiling.stage("figure"):
+        fig = figures.cached("country_bar", (country_selected, fingerprint), build_country_bar)
 
-    st.plotly_chart(fig, use_container_width=True)
+    with profiling.stage("render"):
+        st.plotly_chart(profiling.payload("country_bar", fig), use_container_width=True)
 
     # Top 3 표시
     sorted_idx = np.argsort(-vals)
@@ -111,53 +103,125 @@ with tab1:
 # TAB 2: MBTI 유형 선택 → 상위 국가 그래프
 # --------------------------------------------------------------------
 with tab2:
-    st.subheader("🌎 MBTI 유형별 상위 10개국 보기")
+    st.subheader("🌎 MBTI 유형별 상위 국가 보기")
 
     mbti_selected = st.selectbox("MBTI 유형을 선택하세요", mbti_cols, index=0)
-
-    sorted_df = df[["Country", mbti_selected]].sort_values(by=mbti_selected, ascending=False)
-    top10 = sorted_df.head(10).copy()
-
-    # 한국이 포함되어 있는지 확인
-    korea_mask = sorted_df["Country"].str.lower().str.contains("korea")
-    korea_row = sorted_df[korea_mask]
-    if not korea_row.empty:
-        korea_row = korea_row.iloc[[0]]
-        if korea_row["Country"].values[0] not in top10["Country"].values:
-            top10 = pd.concat([top10, korea_row])
-
-    # 색상 지정
-    blues = px.colors.sequential.Blues[::-1]  # ✅ 값이 높을수록 진한 파랑
-    n_shades = len(blues)
-    vals = top10[mbti_selected].values
-    vmin, vmax = vals.min(), vals.max()
-
-    colors = []
-    for _, r in top10.iterrows():
-        country = r["Country"]
-        if "korea" in country.lower():
-            colors.append("#ff4d4d")  # 한국은 밝은 빨강
-        else:
-            norm = (r[mbti_selected] - vmin) / (vmax - vmin)
-            shade_idx = int(norm * (n_shades - 1))
-            colors.append(blues[shade_idx])
-
-    fig2 = go.Figure(
-        go.Bar(
-            x=top10["Country"],
-            y=top10[mbti_selected],
-            marker=dict(color=colors, line=dict(color="rgba(0,0,0,0.08)", width=1)),
-            hovertemplate="%{x}<br>%{y:.2f}%<extra></extra>",
+    top_n = st.slider("상위 국가 수 (Top N)", 1, len(data.countries), 10)
+
+    def build_top_countries():
+        # 미리 정렬해 둔 순서에서 앞 N개만 (한국이 빠져 있으면 뒤에 추가)
+        top_idx = data.top_countries(mbti_selected, top_n, include_korea=True)
+        top_names = [data.countries[i] for i in top_idx]
+        vals = data.column(mbti_selected)[top_idx]
+
+        # 색상 지정: 값이 높을수록 진한 파랑, 한국은 밝은 빨강
+        colors = mbti_data.ramp_colors(
+            vals,
+            sequential.Blues[::-1],
+            highlight=data.is_korea[top_idx],
+            highlight_color="#ff4d4d",
+        )
+        fig2 = go.Figure(
+            go.Bar(
+                x=top_names,
+                y=vals,
+                marker=dict(color=colors, line=dict(color="rgba(0,0,0,0.08)", width=1)),
+                hovertemplate="%{x}<br>%{y:.2f}%<extra></extra>",
+            )
         )
-    )
-    fig2.update_layout(
-        title=f"{mbti_selected} 유형이 높은 국가 TOP 10 (+한국)",
-        xaxis_title="국가",
-        yaxis_title=f"{mbti_selected} 비율 (%)",
-        template="simple_white",
-        margin=dict(l=40, r=20, t=80, b=40),
-    )
+        fig2.update_layout(
+            title=f"{mbti_selected} 유형이 높은 국가 TOP {top_n} (+한국)",
+            xaxis_title="국가",
+            yaxis_title=f"{mbti_selected} 비율 (%)",
+            template="simple_white",
+            margin=dict(l=40, r=20, t=80, b=40),
+        )
+        return fig2
+
+    with profiling.stage("figure"):
+        fig2 = figures.cached("top_countries", (mbti_selected, top_n, fingerprint), build_top_countries)
 
-    st.plotly_chart(fig2, use_container_width=True)
+    with profiling.stage("render"):
+        st.plotly_chart(profiling.payload("top_countries", fig2), use_container_width=True)
 
     st.caption("🔹 한국은 빨간색으로 표시됩니다.")
+
+# --------------------------------------------------------------------
+# TAB 3: 국가 선택 → MBTI 분포가 비슷한 국가 / 전체 국가 군집
+# --------------------------------------------------------------------
+with tab3:
+    st.subheader("🧭 MBTI 분포가 비슷한 국가 찾기")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        base_country = st.selectbox("기준 국가", data.sorted_countries, key="similar_country")
+    with col2:
+        metric = st.radio("거리 기준", list(mbti_data.METRICS), format_func=mbti_data.METRICS.get, horizontal=True)
+    with col3:
+        k = st.slider("비슷한 국가 수", 1, 20, 10)
+
+    def build_similar_countries():
+        with profiling.stage("similarity"):
+            index = models.similarity(metric)
+        nb_idx, nb_dist = index.query(data.country_index[base_country], k)
+        nb_names = [data.countries[i] for i in nb_idx]
+
+        fig3 = go.Figure(
+            go.Bar(
+                x=nb_names,
+                y=nb_dist,
+                marker=dict(
+                    color=mbti_data.ramp_colors(nb_dist, sequential.Blues[::-1]),
+                    line=dict(color="rgba(0,0,0,0.08)", width=1),
+                ),
+                hovertemplate="%{x}<br>거리: %{y:.4f}<extra></extra>",
+            )
+        )
+        fig3.update_layout(
+            title=f"{base_country}와(과) 가장 비슷한 국가 TOP {k} ({mbti_data.METRICS[metric]}, 낮을수록 비슷함)",
+            xaxis_title="국가",
+            yaxis_title="거리",
+            template="simple_white",
+            margin=dict(l=40, r=20, t=80, b=40),
+        )
+        return fig3
+
+    with profiling.stage("figure"):
+        fig3 = figures.cached("similar_countries", (base_country, metric, k, fingerprint), build_similar_countries)
+
+    with profiling.stage("render"):
+        st.plotly_chart(profiling.payload("similar_countries", fig3), use_container_width=True)
+
+    st.subheader("🗺️ MBTI 분포로 묶은 국가 군집 (k-means)")
+    n_clusters = st.slider("군집 수", 2, 10, 5)
+    with profiling.stage("clusters"):
+        labels = models.clusters(metric, n_clusters)
+    cluster_names = [f"군집 {c + 1}" for c in labels]
+
+    def build_cluster_map():
+        import plotly.express as px  # 지도(choropleth)는 이 탭에서만 쓴다
+
+        fig4 = px.choropleth(
+            locations=list(data.countries),
+            locationmode="country names",
+            color=cluster_names,
+            category_orders={"color": [f"군집 {c + 1}" for c in range(n_clusters)]},
+            labels={"color": "군집"},
+        )
+        fig4.update_layout(margin=dict(l=0, r=0, t=20, b=0))
+        return fig4
+
+    with profiling.stage("figure"):
+        fig4 = figures.cached("cluster_map", (metric, n_clusters, fingerprint), build_cluster_map)
+
+    with profiling.stage("render"):
+        st.plotly_chart(profiling.payload("cluster_map", fig4), use_container_width=True)
+
+    # 서로 다른 분포의 국가 수보다 군집 수가 많으면 빈 군집이 생기므로 건너뛴다
+    for c, rows, top in mbti_data.cluster_profiles(data.matrix, labels, n_clusters):
+        members = sorted(data.countries[i] for i in rows)
+        top_types = [data.types[j] for j in top]
+        with st.expander(f"군집 {c + 1} — {len(members)}개국 (주요 유형: {', '.join(top_types)})"):
+            st.write(", ".join(members))
+
+profiling.finish()
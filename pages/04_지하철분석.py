@@ -1,22 +1,29 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+import datasets
+import figures
+import profiling
+# 제목에 데이터 기간이 들어가서 첫 화면 전에 데이터셋을 열므로, 데이터 모듈도 여기서 가져온다
+import subway_anomaly
+import subway_data
 
 # 페이지 설정
 st.set_page_config(page_title="지하철 분석", layout="wide")
+profiling.start("04_지하철분석")
 
-st.title("🚇 2025년 10월 지하철 승·하차 분석")
+# 월별 subway*.csv → 컬럼형 캐시(.cache/subway), 순위표, 기간 분석용 행렬은
+# 데이터셋 레지스트리에서 (파일이 추가·변경되면 바뀐 파일만 다시 집계된다)
+store = datasets.get("subway")
+all_dates = store.dates()
 
-# CSV 불러오기
-@st.cache_data
-def load_data():
-    return pd.read_csv("subway.csv", encoding="cp949")
+if not all_dates:
+    st.error("❌ subway*.csv 데이터 파일을 찾을 수 없습니다.")
+    profiling.stop()
 
-df = load_data()
+rankings = datasets.get("subway_rankings")
+cube = datasets.get("subway_cube")
 
-# 날짜 필터 (2025년 10월만)
-df["사용일자"] = df["사용일자"].astype(str)
-df_oct = df[df["사용일자"].str.startswith("202510")]
+first, last = str(all_dates[0]), str(all_dates[-1])
+st.title(f"🚇 {first[:4]}.{first[4:6]} ~ {last[:4]}.{last[4:6]} 지하철 승·하차 분석")
 
 # 선택 UI
 col1, col2 = st.columns(2)
@@ -24,50 +31,162 @@ col1, col2 = st.columns(2)
 with col1:
     selected_date = st.selectbox(
         "📅 날짜 선택",
-        sorted(df_oct["사용일자"].unique())
+        all_dates,
+        format_func=str
     )
 
 with col2:
     selected_line = st.selectbox(
         "🚇 호선 선택",
-        sorted(df_oct["노선명"].unique())
+        store.lines_on(selected_date)
     )
 
-# 선택 반영한 데이터
-filtered = df_oct[
-    (df_oct["사용일자"] == selected_date) &
-    (df_oct["노선명"] == selected_line)
-]
-
-# 승차총승객수 + 하차총승객수 계산
-filtered["총이용객"] = filtered["승차총승객수"] + filtered["하차총승객수"]
-
-# 가장 높은 순서대로 정렬
-filtered = filtered.sort_values("총이용객", ascending=False)
-
-# 색상 설정: 1등 빨간색, 나머지는 파란색 그라데이션
-colors = ["red"] + [
-    f"rgba(0,0,255,{0.3 + 0.7 * (i / (len(filtered)-1))})"
-    for i in range(len(filtered)-1)
-]
-
-# Plotly Bar Chart
-fig = px.bar(
-    filtered,
-    x="역명",
-    y="총이용객",
-    title=f"{selected_date} · {selected_line} 승·하차 총계 TOP 역",
-)
+# 선택 반영한 데이터 (미리 정렬된 순위표에서 해당 구간만 꺼냄)
+with profiling.stage("filter"):
+    filtered, colors = rankings.lookup(selected_date, selected_line)
+
+# Plotly Bar Chart: (날짜, 호선)마다 한 번만 만들어 모든 세션이 같이 쓴다 (figures)
+# plotly.express 는 제목·선택 UI 를 먼저 보여 준 뒤, 캐시에 없을 때만 가져온다
+subway_version = datasets.version("subway")
+
+def build_station_bar():
+    import plotly.express as px
+
+    fig = px.bar(
+        filtered,
+        x="역명",
+        y="총이용객",
+        title=f"{selected_date} · {selected_line} 승·하차 총계 TOP 역",
+    )
+
+    fig.update_traces(marker_color=colors)
+
+    fig.update_layout(
+        xaxis_title="역명",
+        yaxis_title="총 이용객수",
+        font=dict(size=16),
+        title_x=0.5
+    )
+    return fig
+
+with profiling.stage("figure"):
+    fig = figures.cached("station_bar", (selected_date, selected_line, subway_version), build_station_bar)
+
+with profiling.stage("render"):
+    st.plotly_chart(profiling.payload("station_bar", fig), use_container_width=True)
+    st.dataframe(profiling.payload("station_table", filtered[["역명", "총이용객", "승차총승객수", "하차총승객수"]]))
 
-fig.update_traces(marker_color=colors)
+# ----------------------------
+# 기간·평일/주말·역별 추이 분석
+# ----------------------------
+st.markdown("---")
+st.subheader("📈 기간별 분석")
 
-fig.update_layout(
-    xaxis_title="역명",
-    yaxis_title="총 이용객수",
-    font=dict(size=16),
-    title_x=0.5
+col3, col4 = st.columns(2)
+
+with col3:
+    start_date, end_date = st.select_slider(
+        "📅 기간 선택",
+        options=all_dates,
+        value=(all_dates[0], all_dates[-1]),
+        format_func=str
+    )
+
+with col4:
+    day_type = st.radio(
+        "요일 구분",
+        list(subway_data.DAY_TYPES),
+        format_func=subway_data.DAY_TYPES.get,
+        horizontal=True
+    )
+
+range_lines = st.multiselect("🚇 호선 (비우면 전체)", cube.lines)
+
+with profiling.stage("filter"):
+    line_daily = cube.line_daily(start_date, end_date, range_lines, day_type)
+if line_daily.empty:
+    st.info("선택한 기간에 해당하는 날짜가 없습니다.")
+else:
+    line_daily.index = line_daily.index.astype(str)
+
+    def build_line_daily():
+        import plotly.express as px
+        return px.line(
+            line_daily,
+            title=f"{start_date} ~ {end_date} 호선별 총 이용객 ({subway_data.DAY_TYPES[day_type]})",
+            labels={"value": "총 이용객수", "variable": "노선명"}
+        )
+
+    with profiling.stage("figure"):
+        fig_lines = figures.cached(
+            "line_daily", (start_date, end_date, tuple(range_lines), day_type, subway_version), build_line_daily
+        )
+    with profiling.stage("render"):
+        st.plotly_chart(profiling.payload("line_daily", fig_lines), use_container_width=True)
+
+    with profiling.stage("filter"):
+        top_stations = cube.station_totals(start_date, end_date, range_lines, day_type).head(20)
+    with profiling.stage("render"):
+        st.dataframe(profiling.payload("top_stations", top_stations))
+
+st.subheader("🚉 역별 승·하차 추이")
+
+col5, col6 = st.columns(2)
+
+with col5:
+    station = st.selectbox("역 선택", cube.stations_on(range_lines))
+
+with col6:
+    window = st.slider("이동평균 기간 (일)", 1, 30, 30)
+
+def build_station_trend():
+    import plotly.express as px
+
+    with profiling.stage("filter"):
+        series = cube.station_series(station, range_lines, window)
+    return px.line(
+        series,
+        title=f"{station} 일별 승·하차 및 {window}일 이동평균",
+        labels={"value": "이용객수", "variable": ""}
+    )
+
+with profiling.stage("figure"):
+    fig_trend = figures.cached(
+        "station_trend", (station, tuple(range_lines), window, subway_version), build_station_trend
+    )
+with profiling.stage("render"):
+    st.plotly_chart(profiling.payload("station_trend", fig_trend), use_container_width=True)
+
+# ----------------------------
+# 이상 이용 역 (급증·급감)
+# ----------------------------
+st.markdown("---")
+st.subheader("🚨 이상 이용 역 (급증·급감)")
+
+st.caption(
+    f"역마다 같은 요일 구분(평일/주말)의 직전 {subway_anomaly.WINDOW}일 중앙값을 기준으로, "
+    "중앙값 절대 편차(MAD) 대비 얼마나 벗어났는지를 점수로 매깁니다. 위의 기간·호선 선택을 따릅니다."
 )
 
-st.plotly_chart(fig, use_container_width=True)
+# 탐지 결과는 데이터셋 레지스트리에서 (새로 추가된 날짜만 계산해서 이어 붙임)
+anomalies = datasets.get("subway_anomalies")
+
+col7, col8 = st.columns(2)
+with col7:
+    min_score = st.slider("최소 점수 (|점수|)", float(subway_anomaly.KEEP_Z), 30.0, 5.0, 0.5)
+with col8:
+    kind = st.radio(
+        "유형", ["all", *subway_anomaly.KINDS],
+        format_func={"all": "전체", **subway_anomaly.KINDS}.get,
+        horizontal=True
+    )
+
+with profiling.stage("filter"):
+    flagged = anomalies.ranked(min_score, start_date, end_date, range_lines, kind)
+if flagged.empty:
+    st.info("조건에 맞는 이상 이용 기록이 없습니다.")
+else:
+    with profiling.stage("render"):
+        st.dataframe(profiling.payload("anomalies", flagged), hide_index=True)
 
-st.dataframe(filtered[["역명", "총이용객", "승차총승객수", "하차총승객수"]])
+profiling.finish()
@@ -1,103 +1,121 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import io
+import os
+import datasets
+import figures
+import http_cache
+import profiling
+import result_cache
 
 st.set_page_config(page_title="나라별 우세 혈액형 분석 (개선판)", layout="wide")
+profiling.start("07_수행평가")
 
 st.title("🩸 나라별 우세 혈액형 — 개선된 대시보드")
 st.markdown("샘플 데이터로 바로 시각화가 나타납니다. CSV 업로드 또는 GitHub RAW URL로 실제 데이터로 교체하세요.")
 
-# ----------------- 샘플 데이터 -----------------
-SAMPLE_CSV = """country,blood_type
-South Korea,A
-South Korea,B
-South Korea,O
-Japan,A
-Japan,B
-Japan,O
-USA,B
-USA,O
-USA,A
-India,B
-India,O
-India,A
-Brazil,O
-Brazil,B
-Brazil,A
-Germany,A
-Germany,O
-Germany,B
-France,O
-France,B
-France,A
-"""
-
-@st.cache_data
-def load_sample():
-    return pd.read_csv(io.StringIO(SAMPLE_CSV))
+# ----------------- 샘플 데이터 (blood_data.SAMPLE_CSV, 데이터셋 레지스트리) -----------------
+def load_sample(nrows=None):
+    sample = datasets.get("blood_sample")
+    return sample if nrows is None else sample.head(nrows)
 
 # ----------------- 입력 (사이드바) -----------------
 st.sidebar.header("데이터 입력")
 data_mode = st.sidebar.radio("데이터 소스", ["샘플 데이터 사용", "파일 업로드", "GitHub RAW URL"])
 
-@st.cache_data
-def read_csv_from_url(url: str):
-    return pd.read_csv(url)
-
-df = None
-if data_mode == "샘플 데이터 사용":
-    df = load_sample()
-elif data_mode == "파일 업로드":
-    uploaded = st.sidebar.file_uploader("CSV 파일 업로드", type=["csv"])
-    if uploaded is not None:
-        try:
-            df = pd.read_csv(uploaded)
-        except Exception as e:
-            st.sidebar.error(f"파일 읽기 실패: {e}")
-elif data_mode == "GitHub RAW URL":
-    url = st.sidebar.text_input("RAW CSV URL 입력")
-    if url:
-        try:
-            df = read_csv_from_url(url)
-        except Exception as e:
-            st.sidebar.error(f"URL에서 CSV 불러오기 실패: {e}")
-
-if df is None:
+# URL 은 디스크 캐시 + 조건부 GET(ETag/Last-Modified) 로 받음. 확인은 5분에 한 번
+@result_cache.memoize("url_fetch")
+def fetch_url(url: str):
+    return http_cache.fetch(url)
+
+# 파일(내용 digest)별 집계: 같은 내용이면 다시 읽거나 집계하지 않는다
+@result_cache.memoize("blood_counts")
+def count_source(digest, _count):
+    bar = st.sidebar.progress(0.0, text="집계 중...")
+    counts = _count(lambda x: bar.progress(x, text=f"집계 중... {x:.0%}"))
+    bar.empty()
+    return counts
+
+def upload_digest(uploaded):
+    # 업로드마다 digest 는 한 번만 계산해서 세션에 보관
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded.file_id not in digests:
+        digests[uploaded.file_id] = blood_data.content_digest(uploaded.getvalue())
+    return digests[uploaded.file_id]
+
+def count_upload(uploaded, progress):
+    uploaded.seek(0)
+    return blood_data.count_csv(uploaded, uploaded.size, progress=progress)
+
+def preview_upload(uploaded):
+    uploaded.seek(0)
+    return ingest.read_csv(uploaded, nrows=10)
+
+def count_file(path, progress):
+    with open(path, "rb") as f:
+        return blood_data.count_csv(f, os.path.getsize(path), progress=progress)
+
+# pandas(집계·미리보기)는 사이드바 입력 UI 를 먼저 그린 뒤 가져온다
+import blood_data
+import ingest
+
+sources = []  # (digest, 집계 함수, 미리보기 함수)
+try:
+    if data_mode == "샘플 데이터 사용":
+        sources.append((
+            datasets.version("blood_sample")[0],
+            lambda progress: datasets.get("blood_sample_counts"),
+            lambda: load_sample(nrows=10),
+        ))
+    elif data_mode == "파일 업로드":
+        uploads = st.sidebar.file_uploader(
+            "CSV 파일 업로드 (여러 개 선택 시 합산)", type=["csv"], accept_multiple_files=True
+        )
+        for uploaded in uploads or []:
+            sources.append((
+                upload_digest(uploaded),
+                lambda progress, f=uploaded: count_upload(f, progress),
+                lambda f=uploaded: preview_upload(f),
+            ))
+    elif data_mode == "GitHub RAW URL":
+        url = st.sidebar.text_input("RAW CSV URL 입력")
+        if url:
+            path, meta = fetch_url(url)
+            sources.append((
+                meta["sha256"],
+                lambda progress: count_file(path, progress),
+                lambda: ingest.read_csv(path, nrows=10),
+            ))
+except Exception as e:
+    st.sidebar.error(f"데이터 불러오기 실패: {e}")
+
+if not sources:
     st.warning("왼쪽에서 데이터 소스를 선택하세요. (샘플 사용 권장)")
-    st.stop()
+    profiling.stop()
+
+# ----------------- 전처리 + 집계 -----------------
+blood_counts = blood_data.BloodCounts()
+for digest, count, _ in sources:
+    try:
+        with profiling.stage("data"):
+            blood_counts = blood_counts.merge(count_source(digest, count))
+    except blood_data.MissingColumnsError as e:
+        st.error(str(e))
+        profiling.stop()
+    except Exception as e:
+        st.sidebar.error(f"데이터 읽기 실패: {e}")
+        profiling.stop()
 
-# ----------------- 전처리 -----------------
-df = df.rename(columns={c: c.strip().lower() for c in df.columns})
-required_cols = {"country", "blood_type"}
-if not required_cols.issubset(set(df.columns)):
-    st.error("CSV에 최소한 'country'와 'blood_type' 컬럼이 있어야 합니다.")
-    st.stop()
+st.subheader("원본 데이터(미리보기)")
+with profiling.stage("render"):
+    st.dataframe(profiling.payload("preview", blood_data.normalise(sources[0][2]())))
 
-df["country"] = df["country"].astype(str).str.strip()
-df["blood_type"] = df["blood_type"].astype(str).str.strip().str.upper()
+# 비율 행렬·우세 혈액형 순서는 데이터셋마다 한 번만 계산
+@profiling.timed("summary")
+@result_cache.memoize("blood_summary")
+def compute_summary(digests, _blood_counts):
+    return blood_data.BloodSummary(_blood_counts)
 
-st.subheader("원본 데이터(미리보기)")
-st.dataframe(df.head(10))
-
-# ----------------- 집계 -----------------
-@st.cache_data
-def compute_counts(df):
-    counts = df.groupby(["country", "blood_type"], as_index=False).size().rename(columns={"size":"count"})
-    total = counts.groupby("country", as_index=False)["count"].sum().rename(columns={"count":"total_count"})
-    counts = counts.merge(total, on="country")
-    counts["pct"] = counts["count"] / counts["total_count"] * 100
-
-    idx = counts.groupby("country")["count"].idxmax()
-    dominant = counts.loc[idx].reset_index(drop=True)
-    dominant = dominant.rename(columns={
-        "blood_type":"dominant_blood_type",
-        "count":"dominant_count",
-        "pct":"dominant_pct"
-    }).sort_values("dominant_count", ascending=False).reset_index(drop=True)
-    return counts, dominant
-
-counts_df, dominant_df = compute_counts(df)
+digests = tuple(d for d, _, _ in sources)
+summary = compute_summary(digests, blood_counts)
 
 # ----------------- 그래프 옵션 -----------------
 st.sidebar.header("그래프 옵션")
@@ -108,76 +126,90 @@ stacked_view = st.sidebar.checkbox("누적(스택) 보기", value=True)
 # ----------------- 상위 국가 막대그래프 -----------------
 st.subheader("📊 상위 국가 — 우세 혈액형 (수평 막대)")
 
-if metric == "dominant_count":
-    top_df = dominant_df.nlargest(top_n, "dominant_count")
-else:
-    top_df = dominant_df.nlargest(top_n, "dominant_pct")
-
-top_df = top_df.sort_values(by=metric, ascending=True)
-
-fig_bar = px.bar(
-    top_df,
-    x=metric,
-    y="country",
-    orientation="h",
-    color="dominant_blood_type",
-    labels={
-        "dominant_count": "우세 혈액형 수",
-        "dominant_pct": "우세 비율(%)",
-        "country": "국가"
-    },
-    hover_data=["dominant_count", "dominant_pct", "total_count"]
-)
-fig_bar.update_layout(yaxis=dict(tickfont=dict(size=11)))
-st.plotly_chart(fig_bar, use_container_width=True)
+# 그래프는 (데이터 digest, 옵션)마다 한 번만 만들어 모든 세션이 같이 쓴다 (figures)
+def build_top_bar():
+    import plotly.express as px
+
+    with profiling.stage("filter"):
+        top_df = summary.top(metric, top_n)
+
+    fig_bar = px.bar(
+        top_df,
+        x=metric,
+        y="country",
+        orientation="h",
+        color="dominant_blood_type",
+        labels={
+            "dominant_count": "우세 혈액형 수",
+            "dominant_pct": "우세 비율(%)",
+            "country": "국가"
+        },
+        hover_data=["dominant_count", "dominant_pct", "total_count"]
+    )
+    fig_bar.update_layout(yaxis=dict(tickfont=dict(size=11)))
+    return fig_bar
+
+with profiling.stage("figure"):
+    fig_bar = figures.cached("top_bar", (digests, metric, top_n), build_top_bar)
+with profiling.stage("render"):
+    st.plotly_chart(profiling.payload("top_bar", fig_bar), use_container_width=True)
 
 # ----------------- 누적 스택 -----------------
 if stacked_view:
     st.subheader(f"🔢 상위 {top_n}개 국가의 혈액형 비율 (누적 스택, %)")
 
-    pivot = counts_df.pivot_table(
-        index="country",
-        columns="blood_type",
-        values="pct",
-        fill_value=0
-    ).reset_index()
-
-    use_countries = dominant_df.nlargest(top_n, "dominant_count")["country"].tolist()
-    pivot = pivot[pivot["country"].isin(use_countries)]
-
-    fig_stack = px.bar(
-        pivot,
-        x="country",
-        y=[c for c in pivot.columns if c not in ["country"]],
-        title="혈액형 비율 (누적)",
-        labels={"value": "비율(%)"}
-    )
-    fig_stack.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig_stack, use_container_width=True)
+    def build_stack_bar():
+        import plotly.express as px
+
+        with profiling.stage("filter"):
+            pivot = summary.stack(top_n)
+
+        fig_stack = px.bar(
+            pivot,
+            x="country",
+            y=[c for c in pivot.columns if c not in ["country"]],
+            title="혈액형 비율 (누적)",
+            labels={"value": "비율(%)"}
+        )
+        fig_stack.update_layout(xaxis_tickangle=-45)
+        return fig_stack
+
+    with profiling.stage("figure"):
+        fig_stack = figures.cached("stack_bar", (digests, top_n), build_stack_bar)
+    with profiling.stage("render"):
+        st.plotly_chart(profiling.payload("stack_bar", fig_stack), use_container_width=True)
 
 # ----------------- 특정 국가 상세 -----------------
 st.subheader("🔎 특정 국가의 혈액형 분포")
 
-selected_country = st.selectbox("국가 선택", sorted(df["country"].unique()))
-detail = counts_df[counts_df["country"] == selected_country]
+selected_country = st.selectbox("국가 선택", summary.countries)
+detail = summary.detail(selected_country)
 
-detail_table = detail[["blood_type", "count", "pct"]].sort_values("count", ascending=False)
+detail_table = detail.copy()
 detail_table["pct"] = detail_table["pct"].map(lambda x: f"{x:.1f}%")
 
 st.table(detail_table)
 
-fig_pie = px.pie(detail, names="blood_type", values="count", title=f"{selected_country} — 혈액형 비율")
-st.plotly_chart(fig_pie, use_container_width=True)
+def build_detail_pie():
+    import plotly.express as px
+    return px.pie(detail, names="blood_type", values="count", title=f"{selected_country} — 혈액형 비율")
+
+with profiling.stage("figure"):
+    fig_pie = figures.cached("detail_pie", (digests, selected_country), build_detail_pie)
+with profiling.stage("render"):
+    st.plotly_chart(profiling.payload("detail_pie", fig_pie), use_container_width=True)
 
 # ----------------- 전체 우세 테이블 -----------------
 st.subheader("📋 모든 국가의 우세 혈액형")
 
-dominant_display = dominant_df.copy()
-dominant_display["dominant_pct"] = dominant_display["dominant_pct"].map(lambda x: f"{x:.1f}%")
-
-st.dataframe(
-    dominant_display[["country", "dominant_blood_type", "dominant_count", "dominant_pct", "total_count"]]
-)
-
-
+# % 표시는 브라우저에서 (보이는 행만) 포맷
+with profiling.stage("render"):
+    st.dataframe(
+        profiling.payload(
+            "dominant_table",
+            summary.dominant()[["country", "dominant_blood_type", "dominant_count", "dominant_pct", "total_count"]],
+        ),
+        column_config={"dominant_pct": st.column_config.NumberColumn(format="%.1f%%")}
+    )
 
+profiling.finish()
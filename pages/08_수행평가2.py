@@ -1,24 +1,30 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from image_cache import ImageCache
+import datasets
+import http_cache
+import figures
+import profiling
+import result_cache
 
 st.set_page_config(page_title="한국 관광지 정보", layout="wide")
+profiling.start("08_수행평가2")
 
 st.title("🏞️ 한국 관광지 정보 대시보드")
 st.write("한국관광 100선을 기반으로 만든 관광지 검색 및 시각화 앱입니다.")
 
-# 관광지 기본 데이터 (원하면 실제 목록으로 모두 교체해 줄게)
-tour_list = [
-    {"region": "서울", "name": "경복궁", "type": "역사"},
-    {"region": "서울", "name": "남산타워", "type": "도시"},
-    {"region": "부산", "name": "해운대해수욕장", "type": "해변"},
-    {"region": "경주", "name": "불국사", "type": "역사"},
-    {"region": "제주", "name": "성산일출봉", "type": "자연"},
-    {"region": "전주", "name": "한옥마을", "type": "전통"},
-    {"region": "강원", "name": "속초 설악산", "type": "산"},
-]
+# 관광지 목록(기본 목록 + tour_places.csv)과 검색 인덱스는 데이터셋 레지스트리에서
+index = datasets.get("tour_index")
+df = index.df
+
+
+@st.cache_resource
+def load_image_cache():
+    # 디스크 캐시와 prefetch 스레드 풀은 모든 세션이 같이 쓴다
+    return ImageCache()
+
 
-df = pd.DataFrame(tour_list)
+image_cache = load_image_cache()
 
 # -------------------------------------
 # 관광지 이미지 경로 설정 (GitHub Raw 경로 이용)
@@ -30,51 +36,126 @@ base_url = st.sidebar.text_input(
 )
 
 st.sidebar.write("예시: `https://raw.githubusercontent.com/suye/test/main/images/`")
-
-# 관광지 선택 박스
+# 이미지는 서버가 대신 받아 오므로 http/https 주소만 받는다 (file:// 등은 거부)
+try:
+    http_cache.check_url(base_url)
+except ValueError:
+    st.sidebar.error("http:// 또는 https:// 로 시작하는 주소를 입력하세요.")
+    base_url = None
+IMAGE_SIZES = {"작게": 320, "보통": 640, "크게": 1280}
+image_width = IMAGE_SIZES[st.sidebar.radio("이미지 크기", list(IMAGE_SIZES), index=2, horizontal=True)]
+
+# 관광지 검색 (이름·지역·분류, 초성 검색 가능 예: ㄱㅂㄱ)
+# 결과(행 번호)는 (검색어, 필터, 목록 버전)마다 한 번만 찾아 세션끼리 같이 쓴다
+@profiling.timed("search")
+@result_cache.memoize("search")
+def search(query, filters, version):
+    return index.search(query, dict(filters))
+
+tour_version = datasets.version("tour_index")
 st.subheader("🔎 관광지 검색")
-selected = st.selectbox("관광지를 선택하세요", df["name"])
-
-row = df[df["name"] == selected].iloc[0]
+query = st.text_input("검색어", placeholder="예) 경복궁, 해수욕, ㅅㅇㅅ")
+
+# facet 선택지에는 현재 검색어 기준 개수를 같이 보여 준다
+query_ids = search(query, (), tour_version)
+filters = {}
+facet_cols = st.columns(2)
+for col, (field, label) in zip(facet_cols, [("region", "지역"), ("type", "분류")]):
+    counts = dict(index.facet_counts(field, query_ids).itertuples(index=False))
+    filters[field] = col.multiselect(
+        label,
+        list(counts),
+        format_func=lambda v, counts=counts: f"{v} ({counts[v]})",
+    )
+
+filters_key = tuple((field, tuple(values)) for field, values in filters.items())
+ids = search(query, filters_key, tour_version)
+st.caption(f"{len(ids)}곳 / 전체 {len(index)}곳")
+if not len(ids):
+    st.warning("검색 결과가 없습니다.")
+    profiling.stop()
+
+selected_id = st.selectbox("관광지를 선택하세요", ids, format_func=lambda i: df.at[i, "name"])
+row = df.loc[selected_id]
 
 st.write(f"### 📍 {row['name']}")
 st.write(f"- 지역: **{row['region']}**")
 st.write(f"- 분류: **{row['type']}**")
 
-# 이미지 표시
-image_url = base_url + row["name"] + ".png"
-st.image(image_url, caption=row["name"], use_container_width=True)
+# 이미지 표시 (캐시에 저장된 썸네일 bytes 를 넘기므로 브라우저가 원본을 다시 받지 않는다)
+# 받을 수 없는 이미지는 회색 placeholder 로 대신한다
+if base_url is not None:
+    image_url = base_url + row["name"] + ".png"
+    with profiling.stage("image"):
+        image = image_cache.thumbnail(image_url, image_width)
+else:
+    image_url = None
+    image = image_cache.placeholder(image_width)
+with profiling.stage("render"):
+    st.image(profiling.payload("image", image), caption=row["name"], use_container_width=True)
+if image_url is not None and image == image_cache.placeholder(image_width):
+    st.info(f"이미지를 불러올 수 없습니다: {image_url}")
+
+# 검색 결과의 나머지 관광지 이미지는 백그라운드에서 미리 받아 둔다
+PREFETCH_LIMIT = 20
+if base_url is not None:
+    image_cache.prefetch(
+        [base_url + df.at[i, "name"] + ".png" for i in ids[:PREFETCH_LIMIT] if i != selected_id],
+        image_width,
+    )
 
 # -------------------------------------
 # 시각화: 지역별 관광지 수 막대그래프
 # -------------------------------------
 st.subheader("📊 지역별 관광지 개수")
 
-region_count = df["region"].value_counts().reset_index()
-region_count.columns = ["region", "count"]
+# 그래프는 (검색어, 필터, 목록 버전)마다 한 번만 만들어 모든 세션이 같이 쓴다 (figures)
+search_key = (query, filters_key, tour_version)
 
-fig = px.bar(
-    region_count,
-    x="region",
-    y="count",
-    title="지역별 관광지 수",
-    text="count"
-)
-fig.update_traces(textposition="outside")
-st.plotly_chart(fig, use_container_width=True)
+# 개수는 검색 인덱스의 facet 에서 (현재 검색 결과 기준)
+# plotly.express 는 검색·상세 화면을 먼저 보여 준 뒤, 캐시에 없을 때만 가져온다
+def build_region_bar():
+    import plotly.express as px
+
+    with profiling.stage("search"):
+        region_count = index.facet_counts("region", ids)
+
+    fig = px.bar(
+        region_count,
+        x="region",
+        y="count",
+        title="지역별 관광지 수",
+        text="count"
+    )
+    fig.update_traces(textposition="outside")
+    return fig
+
+with profiling.stage("figure"):
+    fig = figures.cached("region_bar", search_key, build_region_bar)
+with profiling.stage("render"):
+    st.plotly_chart(profiling.payload("region_bar", fig), use_container_width=True)
 
 # -------------------------------------
 # 시각화: 관광지 분류 비율
 # -------------------------------------
 st.subheader("🧭 관광지 분류 비율")
 
-type_count = df["type"].value_counts().reset_index()
-type_count.columns = ["type", "count"]
+def build_type_pie():
+    import plotly.express as px
 
-fig2 = px.pie(
-    type_count,
-    names="type",
-    values="count",
-    title="관광지 종류 비율"
-)
-st.plotly_chart(fig2, use_container_width=True)
+    with profiling.stage("search"):
+        type_count = index.facet_counts("type", ids)
+
+    return px.pie(
+        type_count,
+        names="type",
+        values="count",
+        title="관광지 종류 비율"
+    )
+
+with profiling.stage("figure"):
+    fig2 = figures.cached("type_pie", search_key, build_type_pie)
+with profiling.stage("render"):
+    st.plotly_chart(profiling.payload("type_pie", fig2), use_container_width=True)
+
+profiling.finish()
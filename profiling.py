@@ -0,0 +1,246 @@
+import atexit
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# ----------------------------
+# rerun 단계별 시간·payload 크기 기록
+# ----------------------------
+# 페이지 맨 위에서 start("페이지") 로 rerun 하나를 시작하고,
+#   with profiling.stage("figure"): ...      # 단계 시간
+#   profiling.payload("bar", fig)            # 브라우저로 보낼 크기
+# 처럼 기록한 뒤 페이지 맨 끝에서 finish() 한다 (중간에 멈출 때는 st.stop() 대신 profiling.stop()).
+# 끝난 rerun 만 프로세스 전체가 같이 쓰는 링 버퍼(최근 RING_SIZE 개)에 들어가고,
+# 진단 화면(main.py?diagnostics)에서 p50/p95/p99 로 보거나 JSON 으로 내보낸다.
+# payload 크기는 plotly 그래프를 JSON 으로 한 번 더 직렬화해야 해서, rerun 중
+# PROFILE_PAYLOAD_SAMPLE 비율(기본 5%)과 ?diagnostics 를 붙여 연 rerun 에서만 잰다.
+# PROFILE=0 이면 아무것도 기록하지 않는다. PROFILE_EXPORT=경로 면 프로세스 종료 때 JSON 저장.
+
+ENABLED = os.environ.get("PROFILE", "1") != "0"
+PAYLOAD_SAMPLE = float(os.environ.get("PROFILE_PAYLOAD_SAMPLE", "0.05"))
+RING_SIZE = int(os.environ.get("PROFILE_RING_SIZE", "5000"))
+TOTAL = "total"
+
+_runs = deque(maxlen=RING_SIZE)
+_lock = threading.Lock()
+_ids = itertools.count(1)
+_local = threading.local()
+
+
+class Run:
+    """rerun 한 번의 단계별 시간(ms)과 payload 크기(bytes)."""
+
+    def __init__(self, page, payloads=False):
+        self.id = next(_ids)
+        self.page = page
+        self.started_at = time.time()
+        self.stages = {}
+        self.payloads = {}
+        self.measure_payloads = payloads
+        self.total_ms = None
+        self._t0 = time.perf_counter()
+        self._active = set()
+
+    @contextmanager
+    def stage(self, name):
+        # 같은 이름 단계가 안쪽에서 또 열리면 (예: 데이터셋 의존성 로드) 바깥 것만 센다
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+    def payload(self, name, obj):
+        if self.measure_payloads:
+            self.payloads[name] = self.payloads.get(name, 0) + payload_size(obj)
+        return obj
+
+    def finish(self):
+        """rerun 시작부터 지금까지를 total_ms 로 잡는다."""
+        self.total_ms = (time.perf_counter() - self._t0) * 1000
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "page": self.page,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms, 3),
+            "stages": {k: round(v, 3) for k, v in self.stages.items()},
+            "payloads": dict(self.payloads),
+        }
+
+
+class _NullRun:
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def payload(self, name, obj):
+        return obj
+
+    def finish(self):
+        pass
+
+
+_NULL = _NullRun()
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _payloads_wanted():
+    if random.random() < PAYLOAD_SAMPLE:
+        return True
+    try:
+        import diagnostics
+        return diagnostics.requested()
+    except Exception:  # streamlit 실행 밖 (스크립트·테스트)
+        return False
+
+
+def start(page, nested=False):
+    """rerun 기록 시작. 이후 이 스레드의 stage()/payload() 는 이 기록에 쌓인다.
+
+    nested=True 는 페이지 안의 fragment 처럼 바깥 기록이 끝나기 전에 따로 여는 기록.
+    아니면 이 스레드에 남아 있던 (끝나지 않은) 기록은 버린다.
+    """
+    stack = _stack()
+    if not nested:
+        stack.clear()
+    run = Run(page, _payloads_wanted()) if ENABLED else _NULL
+    stack.append(run)
+    return run
+
+
+def finish():
+    """현재 rerun 기록을 끝내고 링 버퍼에 넣는다. 바깥 기록(nested 일 때)이 다시 현재가 된다."""
+    stack = _stack()
+    if not stack:
+        return
+    run = stack.pop()
+    if run is _NULL:
+        return
+    run.finish()
+    # 끝난 기록은 더 바뀌지 않으므로 dict 로 굳혀서 넣는다 (다른 세션 스레드와 경합 없음)
+    record = run.to_dict()
+    with _lock:
+        _runs.append(record)
+
+
+def stop():
+    """기록을 끝내고 st.stop(). 페이지 중간에서 멈출 때 st.stop() 대신 쓴다."""
+    import streamlit as st
+
+    finish()
+    st.stop()
+
+
+def current():
+    stack = _stack()
+    return stack[-1] if stack else _NULL
+
+
+def stage(name):
+    """현재 rerun 의 단계 시간 기록 (context manager)."""
+    return current().stage(name)
+
+
+def timed(name=None):
+    """함수 실행 시간을 단계로 기록하는 데코레이터."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def payload(name, obj):
+    """obj 를 그대로 돌려주면서 직렬화 크기를 기록한다. 예) st.plotly_chart(payload("bar", fig))"""
+    return current().payload(name, obj)
+
+
+def payload_size(obj):
+    """브라우저로 보내는 크기(bytes) 추정. plotly Figure 는 JSON, DataFrame 은 메모리 크기."""
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if hasattr(obj, "to_plotly_json"):
+        import plotly.io as pio
+        return len(pio.to_json(obj, validate=False).encode("utf-8"))
+    if hasattr(obj, "memory_usage"):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    return len(json.dumps(obj, default=str).encode("utf-8"))
+
+
+def runs(page=None):
+    """끝난 rerun 기록 (dict) 목록."""
+    with _lock:
+        snapshot = list(_runs)
+    return [r for r in snapshot if page is None or r["page"] == page]
+
+
+def reset():
+    with _lock:
+        _runs.clear()
+
+
+def _percentiles(values):
+    import numpy as np
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"n": len(values), "p50": p50, "p95": p95, "p99": p99, "max": max(values)}
+
+
+def summary():
+    """(페이지, 단계)별 시간 p50/p95/p99 (ms). 단계 total 은 rerun 전체."""
+    import pandas as pd
+
+    groups = {}
+    for r in runs():
+        groups.setdefault((r["page"], TOTAL), []).append(r["total_ms"])
+        for name, ms in r["stages"].items():
+            groups.setdefault((r["page"], name), []).append(ms)
+    rows = [{"page": p, "stage": s, **_percentiles(v)} for (p, s), v in groups.items()]
+    return pd.DataFrame(rows, columns=["page", "stage", "n", "p50", "p95", "p99", "max"])
+
+
+def payload_summary():
+    """(페이지, payload)별 크기 p50/p95/p99 (bytes)."""
+    import pandas as pd
+
+    groups = {}
+    for r in runs():
+        for name, size in r["payloads"].items():
+            groups.setdefault((r["page"], name), []).append(size)
+    rows = [{"page": p, "payload": s, **_percentiles(v)} for (p, s), v in groups.items()]
+    return pd.DataFrame(rows, columns=["page", "payload", "n", "p50", "p95", "p99", "max"])
+
+
+def export_json(path=None):
+    """모든 rerun 기록을 JSON 문자열로 (path 를 주면 파일에도 쓴다)."""
+    data = json.dumps({"exported_at": time.time(), "runs": runs()}, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+    return data
+
+
+if ENABLED and os.environ.get("PROFILE_EXPORT"):
+    atexit.register(export_json, os.environ["PROFILE_EXPORT"])
@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# ----------------------------
+# 세션 공용 결과 캐시 (이름공간별 메모리 예산)
+# ----------------------------
+# 페이지에서 선택값(날짜·노선·국가·업로드 …)마다 계산한 결과를 프로세스 전체가 같이 쓴다.
+# 이름공간마다 BUDGETS 의 바이트 예산과 TTL 이 있어서
+#   - 예산을 넘으면 가장 오래 안 쓴 항목부터 버리고 (LRU)
+#   - TTL 이 지난 항목은 다음 조회 때 다시 계산한다
+# 조회·적중·실패·축출 수는 진단 화면(main.py?diagnostics)에서 본다.
+# 돌려주는 값은 모든 세션이 공유하므로 읽기 전용으로 다뤄야 한다 (st.cache_resource 와 같음).
+# 예산은 CACHE_<이름공간>_MB 환경 변수로 바꿀 수 있다. 예) CACHE_FIGURES_MB=256
+#
+#   @result_cache.memoize("plan")
+#   def load_plan(version, days): ...        # _ 로 시작하는 인자는 key 에서 뺀다
+#
+#   fig = result_cache.namespace("figures").get(key, build)
+
+# 이름공간: (예산 MB, TTL 초 또는 None)
+BUDGETS = {
+    "figures": (128, None),    # 모든 페이지의 plotly 그래프 (figures.cached)
+    "map_html": (16, None),    # 02 관광지 지도 HTML
+    "plan": (4, None),         # 02 여행 일정 (거리 행렬은 datasets 의 seoul_distances)
+    "search": (8, 600),        # 08 관광지 검색 결과
+    "url_fetch": (1, 300),     # 07 URL 다운로드 (5분마다 조건부 GET 으로 다시 확인)
+    "blood_counts": (32, 3600),  # 07 업로드·URL 파일별 집계
+    "blood_summary": (32, 3600),  # 07 비율 행렬·순서
+}
+DEFAULT_BUDGET = (16, None)
+
+
+def _budget(name):
+    mb, ttl = BUDGETS.get(name, DEFAULT_BUDGET)
+    mb = float(os.environ.get(f"CACHE_{name.upper()}_MB", mb))
+    return int(mb * 2**20), ttl
+
+
+def sizeof(value):
+    """캐시 항목의 메모리 추정치 (bytes)."""
+    import datasets
+    return datasets.memory_footprint(value)[0]
+
+
+class Namespace:
+    """key → (값, 크기, 만료 시각) LRU. 여러 스레드에서 같이 써도 된다."""
+
+    def __init__(self, name, max_bytes, ttl=None, size=sizeof):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = size
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expired = self.rejected = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key):
+        """(찾았는지, 값). _lock 안에서 부른다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, nbytes, expires = entry
+        if expires is not None and time.monotonic() >= expires:
+            del self._entries[key]
+            self.bytes -= nbytes
+            self.expired += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get(self, key, compute):
+        """key 의 값. 없거나 만료됐으면 compute() 로 만들어 넣는다 (같은 key 는 한 번만 계산)."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+        try:
+            with self._key_lock(key):
+                # 기다리는 동안 다른 세션이 먼저 만들었을 수 있다
+                with self._lock:
+                    found, value = self._lookup(key)
+                    if found:
+                        self.hits += 1
+                        return value
+                    self.misses += 1
+                value = compute()
+                self.put(key, value)
+                return value
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+    def put(self, key, value):
+        nbytes = self.size(value)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if nbytes > self.max_bytes:
+                # 예산보다 큰 값은 넣지 않는다 (다른 항목을 다 밀어내지 않도록)
+                self.rejected += 1
+                return
+            self._entries[key] = (value, nbytes, expires)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                _, (_, old_bytes, _) = self._entries.popitem(last=False)
+                self.bytes -= old_bytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "namespace": self.name,
+                "항목 수": len(self._entries),
+                "사용(MB)": round(self.bytes / 2**20, 2),
+                "예산(MB)": round(self.max_bytes / 2**20, 2),
+                "TTL(s)": self.ttl,
+                "적중": self.hits,
+                "실패": self.misses,
+                "적중률": round(self.hits / lookups, 3) if lookups else None,
+                "축출": self.evictions,
+                "만료": self.expired,
+                "예산 초과": self.rejected,
+            }
+
+
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+
+
+def namespace(name, size=sizeof):
+    """이름공간 (처음이면 BUDGETS 의 예산으로 만든다)."""
+    with _namespaces_lock:
+        if name not in _namespaces:
+            max_bytes, ttl = _budget(name)
+            _namespaces[name] = Namespace(name, max_bytes, ttl, size)
+        return _namespaces[name]
+
+
+def memoize(name, size=sizeof):
+    """함수 결과를 name 이름공간에 캐시하는 데코레이터.
+
+    key 는 (함수 이름, 인자). st.cache_* 처럼 _ 로 시작하는 인자는 key 에서 빼므로
+    key 에 들어가는 인자는 hash 가능해야 한다.
+    """
+    def decorator(func):
+        import inspect
+
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__,) + tuple(
+                (k, v) for k, v in bound.arguments.items() if not k.startswith("_")
+            )
+            return namespace(name, size).get(key, lambda: func(*args, **kwargs))
+
+        wrapper.clear = lambda: namespace(name, size).clear()
+        return wrapper
+    return decorator
+
+
+def stats():
+    """이름공간별 사용량·적중률 표."""
+    import pandas as pd
+
+    with _namespaces_lock:
+        spaces = list(_namespaces.values())
+    return pd.DataFrame([ns.stats() for ns in spaces])
+
+
+def clear(name=None):
+    with _namespaces_lock:
+        spaces = [_namespaces[name]] if name else list(_namespaces.values())
+    for ns in spaces:
+        ns.clear()
@@ -0,0 +1,114 @@
+import hashlib
+import json
+
+import pandas as pd
+
+# ----------------------------
+# 데이터: 관광지 + 지하철 정보
+# ----------------------------
+PLACES = [
+    {"name": "Gyeongbokgung Palace (경복궁)", "lat": 37.5796, "lon": 126.9770,
+     "desc": "조선의 대표 궁궐, 광화문과 수문장 교대식이 유명함.",
+     "subway": "3호선 경복궁역"},
+    {"name": "N Seoul Tower (남산타워)", "lat": 37.5512, "lon": 126.9882,
+     "desc": "서울 중심 전망대, 야경 명소로 유명함.",
+     "subway": "4호선 명동역"},
+    {"name": "Myeongdong (명동)", "lat": 37.5638, "lon": 126.9850,
+     "desc": "쇼핑과 길거리 음식의 중심지.",
+     "subway": "4호선 명동역"},
+    {"name": "Bukchon Hanok Village (북촌한옥마을)", "lat": 37.5826, "lon": 126.9830,
+     "desc": "전통 한옥 거리와 포토 스팟.",
+     "subway": "3호선 안국역"},
+    {"name": "Hongdae (홍대)", "lat": 37.5563, "lon": 126.9220,
+     "desc": "젊음의 거리, 예술·음악·카페 문화가 활발한 지역.",
+     "subway": "2호선 홍대입구역"},
+    {"name": "Itaewon (이태원)", "lat": 37.5346, "lon": 126.9946,
+     "desc": "다양한 외국 식당과 밤문화가 공존하는 거리.",
+     "subway": "6호선 이태원역"},
+    {"name": "Dongdaemun Design Plaza (동대문 DDP)", "lat": 37.5663, "lon": 127.0090,
+     "desc": "현대적 디자인 랜드마크, 패션·야시장 중심지.",
+     "subway": "2·4·5호선 동대문역사문화공원역"},
+    {"name": "Insadong (인사동)", "lat": 37.5740, "lon": 126.9852,
+     "desc": "전통 공예품과 찻집이 즐비한 거리.",
+     "subway": "3호선 안국역"},
+    {"name": "Lotte World Tower (롯데월드타워)", "lat": 37.5131, "lon": 127.1019,
+     "desc": "서울 최고층 타워, 쇼핑몰·전망대 포함.",
+     "subway": "2호선 잠실역"},
+    {"name": "Hangang Park (한강공원, 여의도)", "lat": 37.5269, "lon": 126.9241,
+     "desc": "한강변에서 자전거와 피크닉을 즐길 수 있음.",
+     "subway": "5호선 여의나루역"}
+]
+
+# 이 개수를 넘으면 마커를 브라우저에서 묶어서(FastMarkerCluster) 그린다
+CLUSTER_THRESHOLD = 200
+
+# 클러스터 모드에서 행([lat, lon, popup, tooltip])마다 마커를 만드는 JS
+MARKER_CALLBACK = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: "info-sign", markerColor: "red", prefix: "glyphicon"});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 300});
+    marker.bindTooltip(row[3]);
+    return marker;
+};
+"""
+
+
+def places_version(places=PLACES):
+    """관광지 목록 내용의 해시. 목록이 바뀌면 지도 캐시 키도 바뀐다."""
+    raw = json.dumps(places, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def places_frame(places=PLACES):
+    return pd.DataFrame(places)
+
+
+def stations(row, near=None):
+    """가까운 역 설명 목록 (가까운 순). 지도 팝업·요약·일정이 모두 이것을 쓴다.
+
+    near(seoul_nearby 의 한 칸)가 없거나 비어 있으면 직접 적어 둔 subway 필드.
+    """
+    return list(near) if near else [row["subway"]]
+
+
+def popup_html(row, near=None):
+    subway = "<br>".join(f"🚇 {s}" for s in stations(row, near))
+    return f"""
+    <b>{row['name']}</b><br>
+    {subway}<br>
+    {row['desc']}
+    """
+
+
+def build_map(df, near=None, cluster_threshold=CLUSTER_THRESHOLD):
+    # folium 은 import 가 무거워서 지도를 실제로 그릴 때(캐시가 없을 때)만 가져온다
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    center_lat = df["lat"].mean()
+    center_lon = df["lon"].mean()
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
+
+    records = df.to_dict("records")
+    near = near or [None] * len(records)
+    if len(records) > cluster_threshold:
+        FastMarkerCluster(
+            [[r["lat"], r["lon"], popup_html(r, n), r["name"]] for r, n in zip(records, near)],
+            callback=MARKER_CALLBACK,
+        ).add_to(m)
+        return m
+
+    for row, n in zip(records, near):
+        folium.Marker(
+            location=[row["lat"], row["lon"]],
+            popup=folium.Popup(popup_html(row, n), max_width=300),
+            tooltip=row["name"],
+            icon=folium.Icon(color="red", icon="info-sign")
+        ).add_to(m)
+    return m
+
+
+def map_html(df, near=None, cluster_threshold=CLUSTER_THRESHOLD):
+    """지도를 한 번 그려서 완성된 HTML 문서로."""
+    return build_map(df, near, cluster_threshold).get_root().render()
@@ -0,0 +1,205 @@
+"""데이터셋 스냅샷: 원본 파일을 한 번 읽어 페이지가 쓰는 파생 데이터를 미리 만들어 둔다.
+
+    python snapshot.py [--workers 4] [--force] [--keep 3]
+
+datasets 레지스트리에서 save 가 있는 데이터셋을 묶음(FAMILIES)마다 별도 프로세스에서 만들고
+SNAPSHOT_DIR/<스냅샷 id>/<데이터셋>/ 에 .npy(+ meta.json) 로 쓴 뒤 CURRENT 를 새 id 로 바꾼다.
+페이지(레지스트리)는 데이터셋을 처음 읽을 때 CURRENT 스냅샷에 같은 버전이 있으면 그것을 mmap 으로 열고,
+없거나 원본이 바뀌었으면 예전처럼 직접 계산한다.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", ".cache/snapshot")
+FORMAT_VERSION = 1
+KEEP = 3
+
+# 같은 프로세스에서 차례로 만들 데이터셋 묶음 (앞의 것을 뒤의 것이 의존). 묶음끼리는 병렬
+FAMILIES = [
+    ["subway", "subway_rankings", "subway_cube", "seoul_places", "station_index", "seoul_nearby",
+     "subway_anomalies"],
+    ["mbti", "mbti_models"],
+    ["tour_index"],
+    ["blood_sample", "blood_sample_counts"],
+]
+
+
+def key(version):
+    """데이터셋 버전(튜플 등)을 비교 가능한 문자열로."""
+    return json.dumps(version, default=str, sort_keys=True, ensure_ascii=False)
+
+
+# ----------------------------
+# 읽기·쓰기
+# ----------------------------
+
+class Artefact:
+    """스냅샷 안의 데이터셋 폴더 하나. 배열은 mmap 으로 연다."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+    def __getitem__(self, name):
+        return np.asarray(np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r"))
+
+
+def write(path, arrays, meta=None):
+    """arrays(이름 → ndarray) 와 meta(JSON) 를 path 폴더에 쓴다."""
+    os.makedirs(path, exist_ok=True)
+    for name, arr in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.asarray(arr))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta or {}, f, ensure_ascii=False)
+
+
+def current():
+    """지금 쓰는 스냅샷 폴더 (없으면 None)."""
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, "CURRENT"), encoding="utf-8") as f:
+            path = os.path.join(SNAPSHOT_DIR, f.read().strip())
+    except OSError:
+        return None
+    return path if os.path.isdir(path) else None
+
+
+@lru_cache(maxsize=8)
+def _manifest(path):
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find(name, version):
+    """CURRENT 스냅샷에 version 과 같은 버전으로 만들어진 name 이 있으면 그 Artefact."""
+    path = current()
+    if path is None:
+        return None
+    try:
+        entry = _manifest(path)["datasets"].get(name)
+        if entry is None or entry["version"] != key(version):
+            return None
+        return Artefact(os.path.join(path, name))
+    except OSError:
+        return None
+
+
+# ----------------------------
+# 만들기 (CLI)
+# ----------------------------
+
+def _dir_bytes(path):
+    return sum(
+        os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files
+    )
+
+
+def build_family(names, out_dir):
+    """(작업 프로세스) 데이터셋들을 차례로 계산해 out_dir/<이름>/ 에 쓴다."""
+    import datasets
+
+    values, result = {}, {}
+    for name in names:
+        ds = datasets.dataset(name)
+        t0 = time.perf_counter()
+        value = ds.load(*(values[d] for d in ds.depends))
+        values[name] = value
+        if ds.save is None or value is None:
+            continue
+        path = os.path.join(out_dir, name)
+        ds.save(value, path)
+        result[name] = {
+            "version": key(datasets.version(name)),
+            "build_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "bytes": _dir_bytes(path),
+        }
+    return result
+
+
+def snapshot_id(versions):
+    import hashlib
+    return hashlib.sha1(key([FORMAT_VERSION, versions]).encode("utf-8")).hexdigest()[:12]
+
+
+def publish(snap_id):
+    tmp = os.path.join(SNAPSHOT_DIR, f"CURRENT.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(snap_id)
+    os.replace(tmp, os.path.join(SNAPSHOT_DIR, "CURRENT"))
+
+
+def prune(keep=KEEP):
+    """최근 keep 개(CURRENT 포함)만 남기고 예전 스냅샷을 지운다."""
+    active = current()
+    snaps = [
+        os.path.join(SNAPSHOT_DIR, d) for d in os.listdir(SNAPSHOT_DIR)
+        if os.path.isfile(os.path.join(SNAPSHOT_DIR, d, "manifest.json"))
+    ]
+    snaps.sort(key=os.path.getmtime, reverse=True)
+    for path in snaps[keep:]:
+        if path != active:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def build(workers=None, force=False, keep=KEEP):
+    import datasets
+
+    names = [n for family in FAMILIES for n in family]
+    snap_id = snapshot_id({n: key(datasets.version(n)) for n in names})
+    final = os.path.join(SNAPSHOT_DIR, snap_id)
+    if os.path.isdir(final) and not force:
+        publish(snap_id)
+        print(f"원본이 바뀌지 않았습니다. 기존 스냅샷 사용: {final}")
+        return final
+
+    tmp = os.path.join(SNAPSHOT_DIR, f"{snap_id}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    t0 = time.perf_counter()
+    entries = {}
+    with ProcessPoolExecutor(max_workers=workers or min(len(FAMILIES), os.cpu_count() or 1)) as pool:
+        for result in pool.map(build_family, FAMILIES, [tmp] * len(FAMILIES)):
+            entries.update(result)
+    manifest = {
+        "id": snap_id,
+        "format": FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "build_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "datasets": entries,
+    }
+    with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    if os.path.isdir(final):
+        shutil.rmtree(final)
+    os.replace(tmp, final)
+    publish(snap_id)
+    prune(keep)
+
+    print(f"{'dataset':22}{'시간(ms)':>10}{'크기(KB)':>10}")
+    for name, entry in entries.items():
+        print(f"{name:22}{entry['build_ms']:10.0f}{entry['bytes'] / 1024:10.0f}")
+    print(f"\n스냅샷 {snap_id}: {final} ({manifest['build_ms'] / 1000:.1f}s)")
+    return final
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (기본: 묶음 수와 CPU 수 중 작은 값)")
+    parser.add_argument("--force", action="store_true", help="원본이 그대로여도 다시 만든다")
+    parser.add_argument("--keep", type=int, default=KEEP, help="남겨 둘 스냅샷 수")
+    args = parser.parse_args(argv)
+    build(args.workers, args.force, args.keep)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+import ingest
+from itinerary import EARTH_RADIUS_KM
+
+# ----------------------------
+# 지하철역 공간 인덱스
+# ----------------------------
+# 역 좌표를 cell_km 크기 격자에 넣어 두고, 관광지 주변 칸부터 바깥으로
+# 넓혀 가며 k 개의 가장 가까운 역을 찾는다. 역이 수백 개여도 조회는 주변 몇 칸만 본다.
+
+STATIONS_CSV = "station_coords.csv"
+KM_PER_DEG = 111.32
+
+
+def load_stations(path=STATIONS_CSV):
+    """역명, lat, lon 컬럼의 역 좌표표."""
+    df = ingest.read_csv(path, ingest.STATIONS)
+    return df.dropna(subset=["lat", "lon"]).drop_duplicates("역명").reset_index(drop=True)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class StationIndex:
+    """역 좌표 격자 인덱스."""
+
+    def __init__(self, names, lat, lon, cell_km=0.5):
+        self.names = np.asarray(names, dtype=object)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.cell_km = cell_km
+        self._lat0 = float(self.lat.mean()) if len(self.lat) else 37.5
+        self._xy = self._project(self.lat, self.lon)
+
+        cells = np.floor(self._xy / cell_km).astype(np.int64)
+        self._cells = {}
+        for i, (cx, cy) in enumerate(cells):
+            self._cells.setdefault((int(cx), int(cy)), []).append(i)
+        self._cells = {key: np.array(v) for key, v in self._cells.items()}
+        self._lo = cells.min(axis=0) if len(cells) else np.zeros(2, dtype=np.int64)
+        self._hi = cells.max(axis=0) if len(cells) else np.zeros(2, dtype=np.int64)
+
+    def _project(self, lat, lon):
+        scale = np.cos(np.radians(self._lat0))
+        return np.column_stack([
+            np.asarray(lat, dtype=float) * KM_PER_DEG,
+            np.asarray(lon, dtype=float) * KM_PER_DEG * scale,
+        ])
+
+    def _ring(self, cx, cy, r):
+        if r == 0:
+            cand = self._cells.get((cx, cy))
+            return [cand] if cand is not None else []
+        out = []
+        for dx in range(-r, r + 1):
+            for dy in (-r, r) if abs(dx) != r else range(-r, r + 1):
+                cand = self._cells.get((cx + dx, cy + dy))
+                if cand is not None:
+                    out.append(cand)
+        return out
+
+    def query(self, lat, lon, k=3):
+        """(역 번호 배열, 거리 km 배열). 가까운 순."""
+        k = min(k, len(self.names))
+        if k == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        p = self._project([lat], [lon])[0]
+        cx, cy = (int(v) for v in np.floor(p / self.cell_km))
+
+        # 격자 끝까지 넓히면 모든 역을 본 것
+        max_ring = int(max(abs(cx - self._lo[0]), abs(cx - self._hi[0]),
+                           abs(cy - self._lo[1]), abs(cy - self._hi[1])))
+        found = []
+        for r in range(max_ring + 1):
+            found.extend(self._ring(cx, cy, r))
+            if not found:
+                continue
+            cand = np.concatenate(found)
+            d = np.sqrt(((self._xy[cand] - p) ** 2).sum(axis=1))
+            # r 칸 바깥의 역은 최소 r * cell_km 만큼 떨어져 있다
+            if len(cand) >= k and np.partition(d, k - 1)[k - 1] <= r * self.cell_km:
+                break
+        # 후보 안에서의 최종 순위는 실제 거리(haversine)로
+        dist = haversine_km(lat, lon, self.lat[cand], self.lon[cand])
+        order = np.argsort(dist, kind="stable")[:k]
+        return cand[order], dist[order]
+
+    def query_many(self, lats, lons, k=3):
+        return [self.query(a, b, k) for a, b in zip(lats, lons)]
+
+
+def station_ridership(store):
+    """역별 하루 평균 이용객(승차+하차, 모든 노선 합)과 혼잡 순위(상위 %)."""
+    totals = store.station_totals()
+    days = max(len(store.dates()), 1)
+    daily = (totals["승차총승객수"] + totals["하차총승객수"]) / days
+    out = pd.DataFrame({"역명": totals["역명"], "일평균": daily})
+    out["상위%"] = (out["일평균"].rank(ascending=False, method="min") / len(out) * 100).round(1)
+    return out.set_index("역명")
+
+
+def join_nearest(places, index, ridership=None, lines=None, k=3):
+    """관광지마다 가까운 역 k 개와 노선·거리·혼잡도를 붙인다.
+
+    반환: 관광지 순서대로 [{"역명", "노선", "거리_m", "일평균", "상위%"}, ...] 목록.
+    """
+    ridership = ridership if ridership is not None else pd.DataFrame(columns=["일평균", "상위%"])
+    lines = lines or {}
+    result = []
+    for idx, dist in index.query_many(places["lat"], places["lon"], k):
+        near = []
+        for i, d in zip(idx, dist):
+            name = index.names[i]
+            busy = ridership.loc[name] if name in ridership.index else None
+            near.append({
+                "역명": name,
+                "노선": lines.get(name, []),
+                "거리_m": int(round(d * 1000)),
+                "일평균": None if busy is None else float(busy["일평균"]),
+                "상위%": None if busy is None else float(busy["상위%"]),
+            })
+        result.append(near)
+    return result
+
+
+def describe(station):
+    """팝업·목록용 한 줄 설명. 예) 명동 (4호선) · 120m · 일평균 5.1만명 (상위 8.0%)"""
+    text = station["역명"]
+    if station["노선"]:
+        text += f" ({'·'.join(station['노선'])})"
+    text += f" · {station['거리_m']}m"
+    if station["일평균"] is not None:
+        text += f" · 일평균 {station['일평균'] / 10000:.1f}만명 (상위 {station['상위%']:.1f}%)"
+    return text
@@ -0,0 +1,265 @@
+import json
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from subway_data import DATE_COL, LINE_COL, OFF_COL, ON_COL, STATION_COL
+
+# ----------------------------
+# 역별 이상 이용(급증·급감) 탐지
+# ----------------------------
+# (노선, 역)마다 승차·하차 수를 자기 자신의 기준과 비교한다.
+#   기준 = 같은 요일 구분(평일/주말)의 직전 WINDOW 일 중앙값
+#   점수 = (그날 값 - 기준) / (1.4826 × MAD)   (MAD: 중앙값 절대 편차, 너무 작으면 하한)
+# 계산은 (날짜 × 역) 행렬에서 sliding window 로 한 번에 한다.
+# 처리한 마지막 날짜, 요일 구분별 직전 WINDOW 일 값, 결과 행을 STATE_DIR 에 저장해 두고,
+# subway*.csv 에 날짜가 추가되면 새 날짜의 행만 (mmap 캐시에서) 읽어 이어서 계산한다.
+# 이미 처리한 날짜의 합계가 달라졌으면 (파일 교체·수정) 처음부터 다시 계산한다.
+
+STATE_DIR = os.environ.get("ANOMALY_DIR", ".cache/anomaly")
+STATE_VERSION = 1
+WINDOW = 14          # 기준으로 쓰는 같은 요일 구분의 직전 일수
+MIN_HISTORY = 5      # 기준 값이 이보다 적으면 점수를 매기지 않는다
+MAD_SCALE = 1.4826   # 정규분포에서 MAD → 표준편차
+MIN_SPREAD = 0.05    # 분산 하한: 기준의 5%
+MIN_COUNT = 10       # 분산 하한: 10명 (이용객이 적은 역의 작은 흔들림은 무시)
+KEEP_Z = 3.0         # |점수| 가 이 이상인 (날짜, 역, 승·하차)만 결과로 남긴다
+BLOCK_DAYS = 128     # 한 번에 계산하는 날짜 수 (메모리 상한)
+
+VALUES = (ON_COL, OFF_COL)
+DAY_TYPE_NAMES = ("평일", "주말")
+RESULT_COLUMNS = ["date", "pair", "value", "actual", "baseline", "z"]
+KIND_COL = "유형"
+KINDS = {"spike": "급증", "drop": "급감"}
+
+
+def day_types(dates):
+    """날짜(int YYYYMMDD) → 0: 평일, 1: 주말."""
+    weekday = pd.to_datetime(np.asarray(dates).astype(str), format="%Y%m%d").weekday
+    return np.asarray(weekday >= 5, dtype=np.int8)
+
+
+def robust_scores(history, values, window=WINDOW):
+    """history(직전 window 행, NaN = 없음) 다음에 이어지는 values 행마다 (기준, 점수).
+
+    history 는 (window, 역), values 는 (날짜, 역). values 의 i 번째 행은
+    바로 앞 window 행 (history 끝부분 + values 의 앞 행들) 과 비교한다.
+    """
+    x = np.concatenate([history, values], axis=0)
+    win = sliding_window_view(x, window, axis=0)[: len(values)]  # (날짜, 역, window)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # 기준 값이 하나도 없는 역
+        baseline = np.nanmedian(win, axis=-1)
+        mad = np.nanmedian(np.abs(win - baseline[..., None]), axis=-1)
+    spread = np.maximum(MAD_SCALE * mad, np.maximum(MIN_SPREAD * np.abs(baseline), MIN_COUNT))
+    z = (values - baseline) / spread
+    z[(~np.isnan(win)).sum(axis=-1) < MIN_HISTORY] = np.nan
+    return baseline, z
+
+
+class AnomalyState:
+    """지금까지 처리한 날짜까지의 탐지 상태와 결과."""
+
+    def __init__(self):
+        self.pairs = []          # [(노선명, 역명), ...]
+        self.last_date = None
+        self.checked = {}        # 처리한 날짜 → 승·하차 합계 (원본이 바뀌었는지 확인용)
+        self.tails = np.full((len(DAY_TYPE_NAMES), len(VALUES), WINDOW, 0), np.nan, dtype=np.float32)
+        self.results = {c: np.zeros(0, dtype=d) for c, d in zip(
+            RESULT_COLUMNS, (np.int32, np.int32, np.int8, np.int64, np.float32, np.float32))}
+        self._pair_index = {}
+
+    # ---- 저장 ----
+
+    def save(self, state_dir=STATE_DIR):
+        state_dir = Path(state_dir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": STATE_VERSION,
+            "params": _params(),
+            "pairs": self.pairs,
+            "last_date": self.last_date,
+            "checked": [[d, t] for d, t in self.checked.items()],
+        }
+        # 파일 하나에 써서 바꿔치기 (다른 프로세스가 읽는 도중이어도 안전)
+        tmp = state_dir / f"state.tmp-{os.getpid()}.npz"
+        np.savez(tmp, meta=np.array(json.dumps(meta, ensure_ascii=False)), tails=self.tails, **self.results)
+        os.replace(tmp, state_dir / "state.npz")
+
+    @classmethod
+    def load(cls, state_dir=STATE_DIR):
+        """저장된 상태. 없거나 형식·설정이 다르면 None."""
+        try:
+            with np.load(Path(state_dir) / "state.npz") as f:
+                meta = json.loads(str(f["meta"]))
+                if meta["version"] != STATE_VERSION or meta["params"] != _params():
+                    return None
+                state = cls()
+                state.tails = f["tails"]
+                state.results = {c: f[c] for c in RESULT_COLUMNS}
+        except (OSError, KeyError, ValueError):
+            return None
+        state.pairs = [tuple(p) for p in meta["pairs"]]
+        state._pair_index = {p: i for i, p in enumerate(state.pairs)}
+        state.last_date = meta["last_date"]
+        state.checked = {int(d): int(t) for d, t in meta["checked"]}
+        return state
+
+    # ---- 계산 ----
+
+    def matches(self, totals):
+        """totals(날짜 → 합계) 중 처리한 날짜 부분이 그대로인지."""
+        if self.last_date is None:
+            return True
+        done = {d: t for d, t in totals.items() if d <= self.last_date}
+        return done == self.checked
+
+    def _pair_codes(self, pairs):
+        codes = np.empty(len(pairs), dtype=np.int32)
+        for i, pair in enumerate(pairs):
+            if pair not in self._pair_index:
+                self._pair_index[pair] = len(self.pairs)
+                self.pairs.append(pair)
+            codes[i] = self._pair_index[pair]
+        return codes
+
+    def append(self, dates, pair_codes, values):
+        """새 날짜들(오름차순) 처리.
+
+        dates: (날짜,), pair_codes: 날짜별 역 코드 배열 목록,
+        values: 날짜별 (역 수, 2) 승·하차 배열 목록.
+        """
+        n_pairs = len(self.pairs)
+        # 새로 나온 역은 그 전 기록이 없다 (NaN)
+        grow = n_pairs - self.tails.shape[-1]
+        if grow:
+            pad = np.full(self.tails.shape[:-1] + (grow,), np.nan, dtype=np.float32)
+            self.tails = np.concatenate([self.tails, pad], axis=-1)
+
+        # 한 번 나온 역이 어떤 날 빠져 있으면 0 (운행 중단 등) 으로 본다
+        known = self.tails.shape[-1] - grow
+        first_seen = np.full(n_pairs, -1)
+        mat = np.zeros((len(dates), n_pairs, len(VALUES)), dtype=np.float32)
+        for i, (codes, vals) in enumerate(zip(pair_codes, values)):
+            unseen = codes[(codes >= known) & (first_seen[codes] < 0)]
+            first_seen[unseen] = i
+            mat[i, codes] = vals
+        mat[np.arange(len(dates))[:, None] < first_seen[None, :]] = np.nan
+
+        types = day_types(dates)
+        found = []
+        for t in range(len(DAY_TYPE_NAMES)):
+            rows = np.flatnonzero(types == t)
+            if not len(rows):
+                continue
+            for v in range(len(VALUES)):
+                new = mat[rows, :, v]
+                baseline, z = robust_scores(self.tails[t, v], new)
+                self.tails[t, v] = np.concatenate([self.tails[t, v], new])[-WINDOW:]
+                hit_row, hit_pair = np.nonzero(np.abs(np.nan_to_num(z)) >= KEEP_Z)
+                found.append({
+                    "date": np.asarray(dates, dtype=np.int32)[rows[hit_row]],
+                    "pair": hit_pair.astype(np.int32),
+                    "value": np.full(len(hit_row), v, dtype=np.int8),
+                    "actual": new[hit_row, hit_pair].astype(np.int64),
+                    "baseline": baseline[hit_row, hit_pair].astype(np.float32),
+                    "z": z[hit_row, hit_pair].astype(np.float32),
+                })
+        for part in found:
+            for c in RESULT_COLUMNS:
+                self.results[c] = np.concatenate([self.results[c], part[c]])
+        self.last_date = int(dates[-1])
+
+
+def _params():
+    return [WINDOW, MIN_HISTORY, MIN_SPREAD, MIN_COUNT, KEEP_Z]
+
+
+def _daily_totals(store):
+    totals = store.daily_totals()
+    return {int(d): int(t) for d, t in zip(totals[DATE_COL], totals[ON_COL] + totals[OFF_COL])}
+
+
+def _read_day(store, date, state):
+    """하루치 (역 코드, (역 수, 2) 승·하차). 그날의 행 구간만 읽는다."""
+    lines, stations, values = [], [], []
+    for line in store.lines_on(date):
+        for pi, start, stop in store.row_ranges(date, line):
+            part = store.partitions[pi]
+            cols = part.columns
+            stations.append(part.station_names[np.asarray(cols["station"][start:stop])])
+            lines.append(np.full(stop - start, line, dtype=object))
+            values.append(np.column_stack([cols["on"][start:stop], cols["off"][start:stop]]))
+    if not stations:
+        return np.zeros(0, dtype=np.int32), np.zeros((0, len(VALUES)), dtype=np.float32)
+    codes = state._pair_codes(list(zip(np.concatenate(lines), np.concatenate(stations))))
+    # 같은 (노선, 역)이 여러 파일에 나뉘어 있으면 합친다
+    uniq, inverse = np.unique(codes, return_inverse=True)
+    sums = np.zeros((len(uniq), len(VALUES)), dtype=np.float32)
+    np.add.at(sums, inverse, np.concatenate(values))
+    return uniq, sums
+
+
+def update(store, state_dir=STATE_DIR):
+    """저장된 상태에 store 의 새 날짜만 더해 Anomalies 로 돌려준다."""
+    state = AnomalyState.load(state_dir)
+    totals = _daily_totals(store)
+    if state is None or not state.matches(totals):
+        state = AnomalyState()
+    new_dates = [d for d in store.dates() if state.last_date is None or d > state.last_date]
+    for i in range(0, len(new_dates), BLOCK_DAYS):
+        block = new_dates[i:i + BLOCK_DAYS]
+        days = [_read_day(store, d, state) for d in block]
+        state.append(block, [c for c, _ in days], [v for _, v in days])
+        state.checked.update({d: totals[d] for d in block})
+    if new_dates:
+        state.save(state_dir)
+    return Anomalies(state)
+
+
+class Anomalies:
+    """이상 이용 결과 표. |점수| 내림차순으로 미리 정렬해 두고 조건에 맞는 앞부분만 잘라 쓴다."""
+
+    def __init__(self, state):
+        r = state.results
+        order = np.argsort(-np.abs(r["z"]), kind="stable")
+        pairs = np.array(state.pairs, dtype=object).reshape(-1, 2)
+        pair = r["pair"][order]
+        z = r["z"][order]
+        actual = r["actual"][order]
+        baseline = r["baseline"][order]
+        self.table = pd.DataFrame({
+            DATE_COL: r["date"][order],
+            LINE_COL: pairs[pair, 0],
+            STATION_COL: pairs[pair, 1],
+            "구분": np.array(["승차", "하차"], dtype=object)[r["value"][order]],
+            KIND_COL: np.where(z > 0, KINDS["spike"], KINDS["drop"]),
+            "이용객": actual,
+            "기준": np.round(baseline).astype(np.int64),
+            "변화율(%)": np.round((actual - baseline) / np.maximum(baseline, 1) * 100, 1),
+            "점수": np.round(z.astype(np.float64), 1),
+        })
+        self.abs_z = np.abs(z)
+        self.last_date = state.last_date
+        self.lines = sorted(set(self.table[LINE_COL]))
+
+    def __len__(self):
+        return len(self.table)
+
+    def ranked(self, min_z=5.0, start=None, end=None, lines=None, kind=None, limit=100):
+        """조건에 맞는 상위 limit 개 (|점수| 내림차순)."""
+        t = self.table
+        mask = self.abs_z >= min_z
+        if start is not None:
+            mask &= t[DATE_COL].to_numpy() >= int(start)
+        if end is not None:
+            mask &= t[DATE_COL].to_numpy() <= int(end)
+        if lines:
+            mask &= t[LINE_COL].isin(lines).to_numpy()
+        if kind in KINDS:
+            mask &= (t[KIND_COL] == KINDS[kind]).to_numpy()
+        return t[mask].head(limit).reset_index(drop=True)
@@ -0,0 +1,565 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+# ----------------------------
+# 지하철 승·하차 데이터 컬럼형 캐시
+# ----------------------------
+# 월별 subway*.csv(cp949 또는 utf-8, ingest.SUBWAY 스키마)를 조금씩(chunk) 읽어 (사용일자, 노선명, 역명) 단위로
+# 합산한 뒤, 파일마다 .npy 컬럼 파일(파티션)로 저장해 둔다.
+# 이후에는 mmap 으로 열어서 (사용일자, 노선명) 구간만 잘라 읽는다.
+# 한 번에 메모리에 올라가는 것은 "파일 하나의 집계 결과"뿐이라
+# 몇 년치 파일을 넣어도 사용량이 늘지 않는다.
+
+CSV_PATH = "subway.csv"
+DATA_DIR = os.environ.get("SUBWAY_DATA_DIR", ".")
+DATA_GLOB = "subway*.csv"
+CACHE_DIR = ".cache/subway"
+CACHE_VERSION = 2
+CHUNK_ROWS = 200_000
+
+DATE_COL = "사용일자"
+LINE_COL = "노선명"
+STATION_COL = "역명"
+ON_COL = "승차총승객수"
+OFF_COL = "하차총승객수"
+KEY_COLS = [DATE_COL, LINE_COL, STATION_COL]
+
+COLUMNS = ["date", "line", "station", "on", "off"]
+INDEX_COLUMNS = ["key_date", "key_line", "start", "stop", "key_on", "key_off"]
+STATION_COLUMNS = ["station_on", "station_off"]
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_fingerprint(csv_path):
+    st = os.stat(csv_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def source_files(path=DATA_DIR):
+    """파일 경로면 그 파일 하나, 폴더면 그 안의 subway*.csv 전부 (이름순)."""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, DATA_GLOB)))
+    return [path]
+
+
+def partition_dir(csv_path, cache_dir=CACHE_DIR):
+    key = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:10]
+    return Path(cache_dir) / f"{Path(csv_path).stem}-{key}"
+
+
+def iter_chunk_rollups(csv_path, chunk_rows=CHUNK_ROWS):
+    """CSV 를 chunk 단위로 읽고(인코딩은 파일을 보고 판단), chunk 마다
+    (사용일자, 노선명, 역명) 합계만 남겨서 돌려준다."""
+    for chunk in ingest.iter_csv(csv_path, ingest.SUBWAY, chunk_rows):
+        chunk = chunk.dropna(subset=KEY_COLS)
+        yield chunk.groupby(KEY_COLS, sort=False, observed=True)[[ON_COL, OFF_COL]].sum()
+
+
+def rollup_file(csv_path, chunk_rows=CHUNK_ROWS):
+    """파일 하나의 chunk 집계를 차례로 누적해 (사용일자, 노선명, 역명) 단위로 만든다."""
+    levels = list(range(len(KEY_COLS)))
+    rolled = None
+    for part in iter_chunk_rollups(csv_path, chunk_rows):
+        if rolled is None:
+            rolled = part
+        else:
+            rolled = pd.concat([rolled, part]).groupby(level=levels, sort=False).sum()
+    if rolled is None:
+        return pd.DataFrame(columns=KEY_COLS + [ON_COL, OFF_COL])
+    return rolled.reset_index()
+
+
+def build_cache(csv_path=CSV_PATH, cache_dir=None, chunk_rows=CHUNK_ROWS):
+    """CSV 하나를 정렬된 컬럼 배열 + (날짜, 노선) 구간 인덱스 + 역별 합계로 저장한다."""
+    cache_dir = Path(cache_dir or partition_dir(csv_path))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    df = rollup_file(csv_path, chunk_rows)
+    df[DATE_COL] = df[DATE_COL].astype(np.int32)
+    df[LINE_COL] = df[LINE_COL].astype("category")
+    df[STATION_COL] = df[STATION_COL].astype("category")
+    df = df.sort_values([DATE_COL, LINE_COL], kind="stable").reset_index(drop=True)
+
+    lines = df[LINE_COL].cat.categories.astype(str).tolist()
+    stations = df[STATION_COL].cat.categories.astype(str).tolist()
+
+    columns = {
+        "date": df[DATE_COL].to_numpy(np.int32),
+        "line": df[LINE_COL].cat.codes.to_numpy(np.int16),
+        "station": df[STATION_COL].cat.codes.to_numpy(np.int32),
+        "on": df[ON_COL].to_numpy(np.int64),
+        "off": df[OFF_COL].to_numpy(np.int64),
+    }
+
+    # (날짜, 노선) 이 바뀌는 지점 = 구간 경계
+    date, line = columns["date"], columns["line"]
+    if len(date):
+        change = np.flatnonzero((date[1:] != date[:-1]) | (line[1:] != line[:-1])) + 1
+        starts = np.concatenate([[0], change]).astype(np.int64)
+        key_on = np.add.reduceat(columns["on"], starts)
+        key_off = np.add.reduceat(columns["off"], starts)
+    else:
+        starts = np.zeros(0, dtype=np.int64)
+        key_on = key_off = np.zeros(0, dtype=np.int64)
+    stops = np.append(starts[1:], len(date)).astype(np.int64)
+    index = {
+        "key_date": date[starts],
+        "key_line": line[starts],
+        "start": starts,
+        "stop": stops,
+        "key_on": key_on,
+        "key_off": key_off,
+    }
+    station_totals = {
+        "station_on": np.bincount(columns["station"], columns["on"], len(stations)).astype(np.int64),
+        "station_off": np.bincount(columns["station"], columns["off"], len(stations)).astype(np.int64),
+    }
+
+    for name, arr in {**columns, **index, **station_totals}.items():
+        np.save(cache_dir / f"{name}.npy", arr)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "source": os.path.abspath(csv_path),
+        "sha256": file_digest(csv_path),
+        **_source_fingerprint(csv_path),
+        "rows": int(len(df)),
+        "lines": lines,
+        "stations": stations,
+    }
+    # meta.json 은 마지막에 써서, 중간에 실패하면 캐시가 무효로 남게 한다
+    tmp = cache_dir / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, cache_dir / "meta.json")
+    return meta
+
+
+def _read_meta(cache_dir):
+    try:
+        return json.loads((Path(cache_dir) / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def ensure_cache(csv_path=CSV_PATH, cache_dir=None):
+    """캐시가 CSV 와 일치하는지 확인하고, 달라졌으면 다시 만든다."""
+    cache_dir = cache_dir or partition_dir(csv_path)
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return build_cache(csv_path, cache_dir)
+
+    fp = _source_fingerprint(csv_path)
+    if fp["mtime_ns"] == meta["mtime_ns"] and fp["size"] == meta["size"]:
+        return meta
+
+    # mtime 만 바뀌고 내용은 같으면(복사, touch 등) 해시만 갱신
+    if fp["size"] == meta["size"] and file_digest(csv_path) == meta["sha256"]:
+        meta.update(fp)
+        (Path(cache_dir) / "meta.json").write_text(
+            json.dumps(meta, ensure_ascii=False), encoding="utf-8"
+        )
+        return meta
+    return build_cache(csv_path, cache_dir)
+
+
+class SubwayPartition:
+    """파일 하나에 해당하는 mmap 컬럼 캐시."""
+
+    def __init__(self, cache_dir, meta=None):
+        self.cache_dir = Path(cache_dir)
+        self.meta = meta or _read_meta(cache_dir)
+        self.lines = self.meta["lines"]
+        self.stations = self.meta["stations"]
+        self.sha256 = self.meta["sha256"]
+
+        self.columns = {name: self._load(name) for name in COLUMNS}
+        self.index = {name: np.asarray(self._load(name)) for name in INDEX_COLUMNS}
+        self.station_totals = {name: np.asarray(self._load(name)) for name in STATION_COLUMNS}
+        self.station_names = np.asarray(self.stations, dtype=object)
+
+    def _load(self, name):
+        return np.load(self.cache_dir / f"{name}.npy", mmap_mode="r")
+
+
+class SubwayStore:
+    """여러 파티션을 하나로 묶은 조회 객체. (날짜, 노선) 선택은 해당 행 구간만 읽는다."""
+
+    def __init__(self, partitions):
+        self.partitions = list(partitions)
+        self.sha256 = hashlib.sha256(
+            "".join(p.sha256 for p in self.partitions).encode("ascii")
+        ).hexdigest()
+
+        # (날짜, 노선명) -> [(파티션 번호, start, stop), ...]
+        self._ranges = {}
+        for pi, part in enumerate(self.partitions):
+            idx = part.index
+            for d, l, a, b in zip(idx["key_date"], idx["key_line"], idx["start"], idx["stop"]):
+                self._ranges.setdefault((int(d), part.lines[l]), []).append((pi, int(a), int(b)))
+        self._dates = sorted({d for d, _ in self._ranges})
+        self._lines = sorted({l for _, l in self._ranges})
+
+    def dates(self):
+        return list(self._dates)
+
+    def lines_on(self, date=None):
+        if date is None:
+            return list(self._lines)
+        return sorted(l for d, l in self._ranges if d == date)
+
+    def row_ranges(self, date, line):
+        return self._ranges.get((int(date), line), [])
+
+    def slice(self, date, line):
+        frames = []
+        for pi, start, stop in self.row_ranges(date, line):
+            part = self.partitions[pi]
+            cols = part.columns
+            frames.append(pd.DataFrame({
+                DATE_COL: np.asarray(cols["date"][start:stop]),
+                LINE_COL: line,
+                STATION_COL: part.station_names[np.asarray(cols["station"][start:stop])],
+                ON_COL: np.asarray(cols["on"][start:stop]),
+                OFF_COL: np.asarray(cols["off"][start:stop]),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=KEY_COLS + [ON_COL, OFF_COL])
+        if len(frames) == 1:
+            return frames[0]
+        # 같은 날짜·노선이 여러 파일에 나뉘어 있으면 역별로 합친다
+        return pd.concat(frames).groupby(KEY_COLS, as_index=False, sort=False)[[ON_COL, OFF_COL]].sum()
+
+    def station_lines(self):
+        """역명 -> 그 역을 지나는 노선명 목록."""
+        out = {}
+        for p in self.partitions:
+            pairs = np.unique(np.column_stack([
+                np.asarray(p.columns["station"]), np.asarray(p.columns["line"])
+            ]), axis=0)
+            for st_code, line_code in pairs:
+                out.setdefault(p.stations[st_code], set()).add(p.lines[line_code])
+        return {name: sorted(lines) for name, lines in out.items()}
+
+    def frame(self):
+        """전체 데이터를 하나의 DataFrame 으로 (노선명·역명은 category)."""
+        frames = [
+            pd.DataFrame({
+                DATE_COL: np.asarray(p.columns["date"]),
+                LINE_COL: pd.Categorical.from_codes(np.asarray(p.columns["line"]), categories=p.lines),
+                STATION_COL: pd.Categorical.from_codes(np.asarray(p.columns["station"]), categories=p.stations),
+                ON_COL: np.asarray(p.columns["on"]),
+                OFF_COL: np.asarray(p.columns["off"]),
+            })
+            for p in self.partitions
+        ]
+        if not frames:
+            # 파일이 없어도 순위표·행렬이 같은 dtype 으로 만들어지도록
+            return pd.DataFrame({
+                DATE_COL: np.zeros(0, dtype=np.int32),
+                LINE_COL: pd.Categorical([]),
+                STATION_COL: pd.Categorical([]),
+                ON_COL: np.zeros(0, dtype=np.int64),
+                OFF_COL: np.zeros(0, dtype=np.int64),
+            })
+        if len(frames) == 1:
+            return frames[0]
+        # 파티션마다 category 가 달라서 문자열로 합친 뒤 다시 category 로
+        df = pd.concat([f.astype({LINE_COL: str, STATION_COL: str}) for f in frames])
+        df = df.groupby(KEY_COLS, as_index=False, sort=False)[[ON_COL, OFF_COL]].sum()
+        return df.astype({LINE_COL: "category", STATION_COL: "category"})
+
+    def daily_line_totals(self):
+        """일자·노선별 승·하차 합계 (파티션마다 미리 계산해 둔 값을 합침)."""
+        frames = [
+            pd.DataFrame({
+                DATE_COL: p.index["key_date"],
+                LINE_COL: np.asarray(p.lines, dtype=object)[p.index["key_line"]],
+                ON_COL: p.index["key_on"],
+                OFF_COL: p.index["key_off"],
+            })
+            for p in self.partitions
+        ]
+        if not frames:
+            return pd.DataFrame(columns=[DATE_COL, LINE_COL, ON_COL, OFF_COL])
+        return pd.concat(frames).groupby([DATE_COL, LINE_COL], as_index=False)[[ON_COL, OFF_COL]].sum()
+
+    def daily_totals(self):
+        return self.daily_line_totals().groupby(DATE_COL, as_index=False)[[ON_COL, OFF_COL]].sum()
+
+    def station_totals(self):
+        """전체 기간 역별 승·하차 합계."""
+        frames = [
+            pd.DataFrame({
+                STATION_COL: p.station_names,
+                ON_COL: p.station_totals["station_on"],
+                OFF_COL: p.station_totals["station_off"],
+            })
+            for p in self.partitions
+        ]
+        if not frames:
+            return pd.DataFrame(columns=[STATION_COL, ON_COL, OFF_COL])
+        return pd.concat(frames).groupby(STATION_COL, as_index=False)[[ON_COL, OFF_COL]].sum()
+
+
+TOTAL_COL = "총이용객"
+
+
+def bar_colors(n):
+    """1등은 빨간색, 나머지는 순위가 내려갈수록 진해지는 파란색."""
+    if n <= 0:
+        return []
+    return ["red"] + [
+        f"rgba(0,0,255,{0.3 + 0.7 * (i / (n - 1))})"
+        for i in range(n - 1)
+    ]
+
+
+class StationRankings:
+    """(날짜, 노선)별 역 순위표.
+
+    총이용객 내림차순 정렬을 데이터 버전마다 한 번만 계산해 두고 (배열 → 스냅샷에 저장 가능),
+    선택이 바뀌면 해당 구간만 꺼내 쓴다.
+    """
+
+    ARRAYS = ["key_date", "key_line", "start", "stop", "station", "total", "on", "off"]
+
+    def __init__(self, store):
+        df = store.frame()
+        df[TOTAL_COL] = df[ON_COL] + df[OFF_COL]
+        df = df.sort_values(
+            [DATE_COL, LINE_COL, TOTAL_COL], ascending=[True, True, False], kind="stable"
+        ).reset_index(drop=True)
+
+        date = df[DATE_COL].to_numpy()
+        line = df[LINE_COL].cat.codes.to_numpy()
+        if len(df):
+            change = np.flatnonzero((date[1:] != date[:-1]) | (line[1:] != line[:-1])) + 1
+            starts = np.concatenate([[0], change])
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+        stops = np.append(starts[1:], len(df))
+
+        arrays = {
+            "key_date": date[starts].astype(np.int32),
+            "key_line": line[starts].astype(np.int16),
+            "start": starts.astype(np.int64),
+            "stop": stops.astype(np.int64),
+            "station": df[STATION_COL].cat.codes.to_numpy(np.int32),
+            "total": df[TOTAL_COL].to_numpy(np.int64),
+            "on": df[ON_COL].to_numpy(np.int64),
+            "off": df[OFF_COL].to_numpy(np.int64),
+        }
+        meta = {
+            "version": store.sha256,
+            "lines": df[LINE_COL].cat.categories.astype(str).tolist(),
+            "stations": df[STATION_COL].cat.categories.astype(str).tolist(),
+        }
+        self._setup(arrays, meta)
+
+    def _setup(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.version = meta["version"]
+        lines = meta["lines"]
+        self._ranges = {
+            (int(d), lines[l]): (int(a), int(b))
+            for d, l, a, b in zip(arrays["key_date"], arrays["key_line"], arrays["start"], arrays["stop"])
+        }
+        self._stations = np.asarray(meta["stations"], dtype=object)
+
+    def to_snapshot(self):
+        return self.arrays, self.meta
+
+    @classmethod
+    def from_snapshot(cls, artefact):
+        rankings = cls.__new__(cls)
+        rankings._setup({name: artefact[name] for name in cls.ARRAYS}, artefact.meta)
+        return rankings
+
+    def lookup(self, date, line):
+        """(순위표, 막대 색상 목록). 없으면 빈 표."""
+        start, stop = self._ranges.get((int(date), line), (0, 0))
+        a = self.arrays
+        table = pd.DataFrame(
+            {
+                STATION_COL: self._stations[a["station"][start:stop]],
+                TOTAL_COL: a["total"][start:stop],
+                ON_COL: a["on"][start:stop],
+                OFF_COL: a["off"][start:stop],
+            },
+            index=pd.RangeIndex(start, stop),
+        )
+        return table, bar_colors(stop - start)
+
+
+DAY_TYPES = {"all": "전체", "weekday": "평일", "weekend": "주말"}
+
+
+class RidershipCube:
+    """(날짜 × 노선·역) 승·하차 행렬.
+
+    역은 여러 노선에 걸쳐 있으므로 (노선, 역) 쌍을 열로 두고,
+    날짜 범위·평일/주말·노선 조건은 행/열 마스크로 한 번에 합산한다.
+    """
+
+    ARRAYS = ["dates", "on", "off", "pair_line", "pair_station"]
+
+    def __init__(self, store):
+        df = store.frame()
+        pairs = df[[LINE_COL, STATION_COL]].astype(str).drop_duplicates()
+        pairs = pairs.sort_values([LINE_COL, STATION_COL]).reset_index(drop=True)
+
+        dates = np.array(sorted(df[DATE_COL].unique()), dtype=np.int32)
+        lines = sorted(pairs[LINE_COL].unique())
+        stations = sorted(pairs[STATION_COL].unique())
+
+        row = np.searchsorted(dates, df[DATE_COL].to_numpy())
+        pair_index = pd.MultiIndex.from_frame(pairs)
+        col = pair_index.get_indexer(
+            pd.MultiIndex.from_arrays([df[LINE_COL].astype(str), df[STATION_COL].astype(str)])
+        )
+        shape = (len(dates), len(pairs))
+        on = np.zeros(shape, dtype=np.int64)
+        off = np.zeros(shape, dtype=np.int64)
+        np.add.at(on, (row, col), df[ON_COL].to_numpy())
+        np.add.at(off, (row, col), df[OFF_COL].to_numpy())
+
+        arrays = {
+            "dates": dates,
+            "on": on,
+            "off": off,
+            "pair_line": pd.Categorical(pairs[LINE_COL], categories=lines).codes.astype(np.int16),
+            "pair_station": pd.Categorical(pairs[STATION_COL], categories=stations).codes.astype(np.int32),
+        }
+        self._setup(arrays, {"version": store.sha256, "lines": lines, "stations": stations})
+
+    def _setup(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.version = meta["version"]
+        self.dates = arrays["dates"]
+        self.on = arrays["on"]
+        self.off = arrays["off"]
+        self.lines = list(meta["lines"])
+        self.stations = list(meta["stations"])
+        self.pair_line = arrays["pair_line"]
+        self.pair_line_name = np.asarray(self.lines, dtype=object)[self.pair_line]
+        self.pair_station = np.asarray(self.stations, dtype=object)[arrays["pair_station"]]
+
+        # 노선 합계용 (쌍 × 노선) 0/1 행렬
+        pairs = self.pair_line
+        self._line_onehot = np.zeros((len(pairs), len(self.lines)), dtype=np.int64)
+        self._line_onehot[np.arange(len(pairs)), self.pair_line] = 1
+
+        weekday = pd.to_datetime(self.dates.astype(str), format="%Y%m%d").weekday
+        self.is_weekend = np.asarray(weekday >= 5)
+
+    def to_snapshot(self):
+        return self.arrays, self.meta
+
+    @classmethod
+    def from_snapshot(cls, artefact):
+        cube = cls.__new__(cls)
+        cube._setup({name: artefact[name] for name in cls.ARRAYS}, artefact.meta)
+        return cube
+
+    def _row_mask(self, start, end, day_type="all"):
+        mask = (self.dates >= int(start)) & (self.dates <= int(end))
+        if day_type == "weekday":
+            mask &= ~self.is_weekend
+        elif day_type == "weekend":
+            mask &= self.is_weekend
+        return mask
+
+    def _col_mask(self, lines=None):
+        if not lines:
+            return np.ones(len(self.pair_line), dtype=bool)
+        codes = [self.lines.index(l) for l in lines if l in self.lines]
+        return np.isin(self.pair_line, codes)
+
+    def station_totals(self, start, end, lines=None, day_type="all"):
+        """기간 내 (노선, 역)별 승·하차 합계와 하루 평균. 총이용객 내림차순."""
+        rows = self._row_mask(start, end, day_type)
+        cols = self._col_mask(lines)
+        on = self.on[rows][:, cols].sum(axis=0)
+        off = self.off[rows][:, cols].sum(axis=0)
+        days = max(int(rows.sum()), 1)
+        out = pd.DataFrame({
+            LINE_COL: self.pair_line_name[cols],
+            STATION_COL: self.pair_station[cols],
+            ON_COL: on,
+            OFF_COL: off,
+            TOTAL_COL: on + off,
+            "일평균": (on + off) / days,
+        })
+        return out.sort_values(TOTAL_COL, ascending=False, kind="stable").reset_index(drop=True)
+
+    def line_daily(self, start, end, lines=None, day_type="all"):
+        """기간 내 날짜 × 노선 총이용객 (열: 노선명)."""
+        rows = self._row_mask(start, end, day_type)
+        total = (self.on[rows] + self.off[rows]) @ self._line_onehot
+        out = pd.DataFrame(total, index=self.dates[rows], columns=self.lines)
+        out.index.name = DATE_COL
+        return out[lines] if lines else out
+
+    def station_series(self, station, lines=None, window=30):
+        """역 하나의 일별 승·하차와 window 일 이동평균 (여러 노선이면 합산)."""
+        cols = (self.pair_station == station) & self._col_mask(lines)
+        on = self.on[:, cols].sum(axis=1)
+        off = self.off[:, cols].sum(axis=1)
+        out = pd.DataFrame(
+            {ON_COL: on, OFF_COL: off},
+            index=pd.to_datetime(self.dates.astype(str), format="%Y%m%d"),
+        )
+        out.index.name = DATE_COL
+        rolling = out.rolling(window, min_periods=1).mean()
+        out[f"{ON_COL} ({window}일 평균)"] = rolling[ON_COL]
+        out[f"{OFF_COL} ({window}일 평균)"] = rolling[OFF_COL]
+        return out
+
+    def stations_on(self, lines=None):
+        return sorted(set(self.pair_station[self._col_mask(lines)]))
+
+
+def sources_fingerprint(path=DATA_DIR):
+    """파일 목록 + mtime. 파일이 추가·변경되면 값이 달라진다 (st.cache 키용)."""
+    return tuple((f, os.stat(f).st_mtime_ns) for f in source_files(path))
+
+
+def load_store(path=DATA_DIR, cache_dir=CACHE_DIR):
+    partitions = []
+    for csv_path in source_files(path):
+        part_dir = partition_dir(csv_path, cache_dir)
+        meta = ensure_cache(csv_path, part_dir)
+        partitions.append(SubwayPartition(part_dir, meta))
+    return SubwayStore(partitions)
+
+
+def copy_store(store, path):
+    """파티션 캐시 폴더들을 path 아래로 복사 (스냅샷용). 폴더 이름 목록을 순서대로 돌려준다."""
+    names = []
+    for part in store.partitions:
+        shutil.copytree(part.cache_dir, Path(path) / part.cache_dir.name, dirs_exist_ok=True)
+        names.append(part.cache_dir.name)
+    return names
+
+
+def open_store(path, names):
+    """copy_store 로 복사해 둔 파티션들을 (원본 확인 없이) 연다."""
+    return SubwayStore([SubwayPartition(Path(path) / name) for name in names])
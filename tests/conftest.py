@@ -0,0 +1,72 @@
+import hashlib
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class StubServer:
+    """로컬 HTTP 서버. files(경로 → bytes) 를 돌려주고, 받은 요청을 requests 에 남긴다.
+
+    redirects(경로 → Location) 에 있는 경로는 302 로 보낸다.
+
+    본문 해시를 ETag 로 보내고, If-None-Match 가 맞으면 304 를 돌려준다.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.redirects = {}
+        self.requests = []
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers)))
+                if self.path in stub.redirects:
+                    self.send_response(302)
+                    self.send_header("Location", stub.redirects[self.path])
+                    self.end_headers()
+                    return
+                body = stub.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def hits(self, path):
+        return sum(1 for p, _ in self.requests if p == path)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def http_stub():
+    stub = StubServer()
+    yield stub
+    stub.close()
@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import blood_data
+
+
+def _csv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    countries = np.array(["Japan", " South Korea ", "USA", "Brazil"])
+    types = np.array(["a", "B ", "O", "ab"])
+    df = pd.DataFrame({
+        "Country": countries[rng.integers(0, 4, n)],
+        "Blood_Type": types[rng.integers(0, 4, n)],
+        "extra": rng.integers(0, 100, n),
+    })
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def test_chunked_counts_match_one_shot():
+    data = _csv(5_000)
+    whole = blood_data.BloodCounts.from_frame(blood_data.normalise(pd.read_csv(io.BytesIO(data))))
+
+    seen = []
+    chunked = blood_data.count_csv(io.BytesIO(data), len(data), chunk_rows=333, progress=seen.append)
+
+    assert chunked.countries == whole.countries == ["Brazil", "Japan", "South Korea", "USA"]
+    assert chunked.types == whole.types == ["A", "AB", "B", "O"]
+    np.testing.assert_array_equal(chunked.counts, whole.counts)
+    assert chunked.counts.sum() == 5_000
+    assert len(seen) == -(-5_000 // 333)
+    assert seen == sorted(seen) and seen[-1] == 1.0
+
+
+def test_merge_adds_counts_over_union():
+    a = blood_data.BloodCounts(["Japan"], ["A", "B"], [[1, 2]])
+    b = blood_data.BloodCounts(["Japan", "USA"], ["B", "O"], [[3, 0], [4, 5]])
+    merged = a.merge(b)
+    assert merged.countries == ["Japan", "USA"]
+    assert merged.types == ["A", "B", "O"]
+    np.testing.assert_array_equal(merged.counts, [[1, 5, 0], [0, 4, 5]])
+
+
+def test_missing_columns_error_is_shared_with_ingest():
+    import ingest
+
+    assert blood_data.MissingColumnsError is ingest.MissingColumnsError
+    with pytest.raises(blood_data.MissingColumnsError):
+        ingest.read_csv(io.BytesIO(b"name,lat\nA,1\n"), ingest.STATIONS)
+    with pytest.raises(blood_data.MissingColumnsError):
+        blood_data.normalise(pd.DataFrame({"country": ["Japan"]}))
+
+
+def test_cp949_after_long_ascii_prefix(tmp_path):
+    # 앞쪽 64KB 넘게 ASCII 만 있고 뒤에 한글이 나오는 cp949 파일
+    head = "country,blood_type\n" + "Japan,A\n" * 20_000
+    data = (head + "대한민국,B\n" * 3 + "Japan,O\n").encode("cp949")
+    assert data[:2 * blood_data.ingest.SAMPLE_BYTES].isascii()
+    path = tmp_path / "blood.csv"
+    path.write_bytes(data)
+
+    assert blood_data.ingest.sniff_encoding(str(path)) == "cp949"
+    f = io.BytesIO(data)
+    counts = blood_data.count_csv(f, len(data), chunk_rows=4_000)
+    assert f.tell() == len(data)
+    assert counts.countries == ["Japan", "대한민국"]
+    np.testing.assert_array_equal(counts.counts, [[20_000, 0, 1], [0, 3, 0]])
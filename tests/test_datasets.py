@@ -0,0 +1,65 @@
+import pytest
+
+import datasets
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """테스트용 데이터셋만 등록된 레지스트리."""
+    monkeypatch.setattr(datasets, "_registry", {})
+    monkeypatch.setattr(datasets, "_stats", {})
+    yield datasets._registry
+    datasets.clear()
+
+
+def test_dependency_version_change_invalidates_dependent(registry):
+    source = {"version": 1, "rows": [1, 2, 3]}
+    loads = []
+
+    @datasets.register("base", lambda: source["version"])
+    def _base():
+        loads.append("base")
+        return list(source["rows"])
+
+    @datasets.register("total", None, depends=["base"])
+    def _total(rows):
+        loads.append("total")
+        return sum(rows)
+
+    @datasets.register("other", lambda: "fixed")
+    def _other():
+        loads.append("other")
+        return "other"
+
+    assert datasets.get("total") == 6
+    assert datasets.get("other") == "other"
+    assert loads == ["base", "total", "other"]
+    assert datasets.version("total") == (None, (1,))
+
+    # 버전이 그대로면 다시 읽지 않는다
+    assert datasets.get("total") == 6
+    assert loads == ["base", "total", "other"]
+
+    # 의존 데이터셋 버전이 바뀌면 그것을 쓰는 데이터셋도 다시 만든다
+    source.update(version=2, rows=[10, 20])
+    assert datasets.version("total") == (None, (2,))
+    assert datasets.get("total") == 30
+    assert loads == ["base", "total", "other", "base", "total"]
+    assert datasets.get("other") == "other"
+    assert loads[-1] == "total"
+    assert datasets._stats["total"]["version"] == (None, (2,))
+
+
+def test_clear_reloads(registry):
+    loads = []
+
+    @datasets.register("value", lambda: 1)
+    def _value():
+        loads.append(1)
+        return object()
+
+    first = datasets.get("value")
+    assert datasets.get("value") is first
+    datasets.clear("value")
+    assert datasets.get("value") is not first
+    assert len(loads) == 2
@@ -0,0 +1,44 @@
+import base64
+
+import numpy as np
+import plotly.graph_objects as go
+
+import figures
+
+
+def _typed(arr):
+    return {"dtype": arr.dtype.str[1:], "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+
+def test_numpy_arrays_are_downcast():
+    # plotly 5 의 to_dict() 처럼 trace 에 numpy 배열이 그대로 들어 있는 경우
+    spec = {"data": [{
+        "type": "bar",
+        "x": np.array(["a", "b", "c"], dtype=object),
+        "y": np.array([1.0, 250.0, -3.0]),
+        "customdata": np.array([100_000, 2, 3], dtype=np.int64),
+        "width": np.array([0.5, 0.25, 0.125]),
+    }], "layout": {}}
+
+    trace = figures.slim(spec)["data"][0]
+
+    assert trace["x"].dtype == object
+    assert trace["y"].dtype == np.int16
+    assert trace["customdata"].dtype == np.int32
+    assert trace["width"].dtype == np.float32
+    np.testing.assert_array_equal(trace["y"], [1, 250, -3])
+    go.Figure(figures.slim(spec))
+
+
+def test_typed_arrays_are_downcast():
+    spec = {"data": [{
+        "type": "scatter",
+        "x": _typed(np.array([0.1, 0.2])),
+        "y": _typed(np.array([1, 2, 3], dtype=np.int32)),
+    }], "layout": {}}
+
+    trace = figures.slim(spec)["data"][0]
+
+    assert trace["x"]["dtype"] == "f4"
+    assert trace["y"]["dtype"] == "i1"
+    np.testing.assert_array_equal(np.frombuffer(base64.b64decode(trace["y"]["bdata"]), "i1"), [1, 2, 3])
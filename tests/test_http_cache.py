@@ -0,0 +1,44 @@
+import pytest
+
+import http_cache
+
+
+def test_second_fetch_is_conditional_and_reuses_body(http_stub, tmp_path):
+    http_stub.files["/blood.csv"] = b"country,blood_type\nJapan,A\n"
+    url = http_stub.url + "/blood.csv"
+
+    path, meta = http_cache.fetch(url, cache_dir=tmp_path)
+    assert meta["status"] == "miss"
+    assert meta["etag"] and meta["last_modified"]
+    first_headers = http_stub.requests[-1][1]
+    assert "If-None-Match" not in first_headers
+
+    path2, meta2 = http_cache.fetch(url, cache_dir=tmp_path)
+    headers = http_stub.requests[-1][1]
+    assert headers["If-None-Match"] == meta["etag"]
+    assert headers["If-Modified-Since"] == meta["last_modified"]
+    assert meta2["status"] == "hit"
+    assert path2 == path
+    assert meta2["sha256"] == meta["sha256"]
+    with open(path2, "rb") as f:
+        assert f.read() == http_stub.files["/blood.csv"]
+
+
+def test_changed_body_is_downloaded_again(http_stub, tmp_path):
+    url = http_stub.url + "/blood.csv"
+    http_stub.files["/blood.csv"] = b"country,blood_type\nJapan,A\n"
+    _, meta = http_cache.fetch(url, cache_dir=tmp_path)
+
+    http_stub.files["/blood.csv"] = b"country,blood_type\nJapan,B\n"
+    path, meta2 = http_cache.fetch(url, cache_dir=tmp_path)
+    assert meta2["status"] == "miss"
+    assert meta2["sha256"] != meta["sha256"]
+    with open(path, "rb") as f:
+        assert f.read().endswith(b"Japan,B\n")
+
+
+@pytest.mark.parametrize("url", ["file:///etc/passwd", "ftp://127.0.0.1/x.csv", "blood.csv"])
+def test_rejects_non_http_urls(url, tmp_path):
+    with pytest.raises(ValueError):
+        http_cache.fetch(url, cache_dir=tmp_path)
+    assert not any(tmp_path.iterdir())
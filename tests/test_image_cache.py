@@ -0,0 +1,93 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from image_cache import ImageCache
+
+
+def _png(seed, size=(200, 150)):
+    # 잡음 이미지라 압축이 잘 안 돼서 파일 크기가 일정하다
+    pixels = np.random.default_rng(seed).integers(0, 256, (*size[::-1], 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, "PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ImageCache(cache_dir=tmp_path / "images", widths=(64, 128), workers=2)
+    yield c
+    c._pool.shutdown(wait=True)
+
+
+def test_fetches_each_image_once(http_stub, cache):
+    http_stub.files["/a.png"] = _png(0)
+    url = http_stub.url + "/a.png"
+
+    first = cache.thumbnail(url, 64)
+    assert cache.thumbnail(url, 64) == first
+    cache.thumbnail(url, 128)  # 다른 폭도 같은 원본에서 만든다
+    assert http_stub.hits("/a.png") == 1
+    with Image.open(io.BytesIO(first)) as img:
+        assert img.width <= 64
+
+
+def test_prefetch_fills_cache(http_stub, cache):
+    for i in range(3):
+        http_stub.files[f"/{i}.png"] = _png(i)
+    urls = [f"{http_stub.url}/{i}.png" for i in range(3)]
+
+    assert all(f.result() for f in cache.prefetch(urls, 64))
+    for url in urls:
+        cache.thumbnail(url, 64)
+    assert len(http_stub.requests) == 3
+
+
+def test_lru_eviction_stays_under_max_bytes(http_stub, tmp_path):
+    http_stub.files.update({f"/{i}.png": _png(i) for i in range(6)})
+    one = len(http_stub.files["/0.png"])
+    cache = ImageCache(cache_dir=tmp_path / "images", max_bytes=3 * one, widths=(64,))
+    try:
+        for i in range(6):
+            cache.original(f"{http_stub.url}/{i}.png")
+            assert cache.size <= cache.max_bytes
+        on_disk = sum(p.stat().st_size for p in (tmp_path / "images").iterdir())
+        assert on_disk == cache.size
+        # 가장 최근 것은 남고 가장 오래된 것은 지워진다
+        assert cache.original(f"{http_stub.url}/5.png") is not None
+        assert http_stub.hits("/5.png") == 1
+        cache.original(f"{http_stub.url}/0.png")
+        assert http_stub.hits("/0.png") == 2
+    finally:
+        cache._pool.shutdown(wait=True)
+
+
+def test_missing_image_returns_placeholder(http_stub, cache):
+    url = http_stub.url + "/없음.png"
+    assert cache.thumbnail(url, 64) == cache.placeholder(64)
+    assert cache.thumbnail(url, 64, fallback=False) is None
+
+
+def test_non_image_returns_placeholder(http_stub, cache):
+    http_stub.files["/page.png"] = b"<html>not found</html>"
+    assert cache.thumbnail(http_stub.url + "/page.png", 64) == cache.placeholder(64)
+
+
+@pytest.mark.parametrize("url", [
+    "file:///etc/passwd",
+    "ftp://127.0.0.1/a.png",
+    "/etc/passwd",
+    "http:///a.png",
+])
+def test_rejects_non_http_urls(cache, url):
+    assert cache.original(url) is None
+    assert cache.thumbnail(url, 64) == cache.placeholder(64)
+    assert not any(cache.dir.iterdir())
+
+
+def test_rejects_redirect_to_other_scheme(http_stub, cache):
+    http_stub.redirects["/r.png"] = "file:///etc/passwd"
+    assert cache.thumbnail(http_stub.url + "/r.png", 64) == cache.placeholder(64)
+    assert not any(cache.dir.iterdir())
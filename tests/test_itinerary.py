@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import itinerary
+
+
+def _places(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 37.45 + rng.random(n) * 0.25, 126.8 + rng.random(n) * 0.35
+
+
+@pytest.mark.parametrize("n, days", [(10, 2), (37, 5), (600, 14)])
+def test_plan_visits_every_place_once_with_balanced_days(n, days):
+    lat, lon = _places(n)
+    plan = itinerary.plan_itinerary(lat, lon, days)
+
+    assert len(plan) == days
+    assert sorted(i for day in plan for i in day) == list(range(n))
+    assert max(len(day) for day in plan) <= -(-n // days)
+
+
+def test_two_opt_never_lengthens_route():
+    lat, lon = _places(40, seed=3)
+    dist = itinerary.haversine_matrix(lat, lon)
+    route = np.random.default_rng(1).permutation(40)
+
+    improved = itinerary.two_opt(route, dist)
+    assert sorted(improved.tolist()) == list(range(40))
+    assert itinerary.route_length(improved, dist) < itinerary.route_length(route, dist)
+
+
+def test_two_opt_can_move_first_stop():
+    # 일직선 위 0, 1, 2, 3 (km) 를 1 → 0 → 2 → 3 으로 가면 앞부분을 뒤집어야 짧아진다
+    pos = np.array([0.0, 1.0, 2.0, 3.0])
+    dist = np.abs(pos[:, None] - pos[None, :])
+    assert itinerary.two_opt([1, 0, 2, 3], dist).tolist() == [0, 1, 2, 3]
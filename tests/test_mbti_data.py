@@ -0,0 +1,37 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import mbti_data
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+def test_kmeans_more_clusters_than_distinct_points(metric):
+    rng = np.random.default_rng(0)
+    distinct = rng.random((4, 16))
+    matrix = np.repeat(distinct, 5, axis=0)  # 20개 행, 서로 다른 분포는 4개
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        labels, centers = mbti_data.kmeans(matrix, 8, metric)
+
+    assert labels.shape == (20,) and labels.min() >= 0 and labels.max() < 8
+    assert np.isfinite(centers).all()
+    # 같은 행은 같은 군집, 서로 다른 행은 다른 군집
+    assert len(np.unique(labels)) == 4
+    assert all(len(set(labels[i * 5:(i + 1) * 5])) == 1 for i in range(4))
+
+
+def test_cluster_profiles_skip_empty_clusters():
+    distinct = np.eye(16)[:3] + 0.1
+    matrix = np.repeat(distinct, 2, axis=0)
+    labels, _ = mbti_data.kmeans(matrix, 5, "cosine")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # 빈 군집 평균의 RuntimeWarning 이 없어야 한다
+        profiles = mbti_data.cluster_profiles(matrix, labels, 5)
+
+    assert len(profiles) == 3
+    assert sorted(len(rows) for _, rows, _ in profiles) == [2, 2, 2]
+    assert {int(top[0]) for _, _, top in profiles} == {0, 1, 2}
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+import profiling
+
+
+@pytest.fixture(autouse=True)
+def clean(monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", True)
+    monkeypatch.setattr(profiling, "PAYLOAD_SAMPLE", 0.0)
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+def test_total_covers_work_after_last_stage():
+    profiling.start("page")
+    with profiling.stage("data"):
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert profiling.runs() == []  # 끝나기 전에는 보이지 않는다
+    profiling.finish()
+
+    (run,) = profiling.runs()
+    assert run["stages"]["data"] < 30
+    assert run["total_ms"] >= 60
+
+
+def test_nested_run_restores_outer():
+    outer = profiling.start("page")
+    inner = profiling.start("page:fragment", nested=True)
+    assert profiling.current() is inner
+    profiling.finish()
+    assert profiling.current() is outer
+    profiling.finish()
+    assert [r["page"] for r in profiling.runs()] == ["page:fragment", "page"]
+
+
+def test_unfinished_run_is_dropped_by_next_start():
+    profiling.start("stopped")
+    profiling.start("page")
+    profiling.finish()
+    assert [r["page"] for r in profiling.runs()] == ["page"]
+
+
+def test_payloads_only_on_sampled_runs(monkeypatch):
+    profiling.start("page")
+    profiling.payload("text", "abc")
+    profiling.finish()
+
+    monkeypatch.setattr(profiling, "PAYLOAD_SAMPLE", 1.0)
+    profiling.start("page")
+    profiling.payload("text", "abc")
+    profiling.finish()
+
+    assert [r["payloads"] for r in profiling.runs()] == [{}, {"text": 3}]
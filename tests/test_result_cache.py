@@ -0,0 +1,82 @@
+import types
+
+import pytest
+
+import result_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _namespace(max_bytes=10, ttl=None):
+    return result_cache.Namespace("test", max_bytes, ttl, size=len)
+
+
+def test_over_budget_evicts_least_recently_used():
+    ns = _namespace(max_bytes=10)
+    computed = []
+
+    def compute(value):
+        return lambda: computed.append(value) or value
+
+    ns.get("a", compute("aaaa"))
+    ns.get("b", compute("bbbb"))
+    assert ns.get("a", compute("xxxx")) == "aaaa"  # a 를 최근에 쓴 것으로
+    ns.get("c", compute("cccc"))                   # 12 bytes > 10 → 가장 오래 안 쓴 b 를 버린다
+
+    assert computed == ["aaaa", "bbbb", "cccc"]
+    assert list(ns._entries) == ["a", "c"]
+    assert ns.bytes == 8
+    assert ns.evictions == 1
+    assert ns.get("b", compute("bbbb")) == "bbbb"
+    assert computed[-1] == "bbbb"
+    assert list(ns._entries) == ["c", "b"]
+
+    # 예산보다 큰 값은 돌려주지만 넣지 않고, 다른 항목도 밀어내지 않는다
+    assert ns.get("big", compute("z" * 11)) == "z" * 11
+    assert list(ns._entries) == ["c", "b"]
+    assert ns.stats()["예산 초과"] == 1
+
+
+def test_expired_entry_is_recomputed(clock):
+    ns = _namespace(max_bytes=100, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(clock[0])
+        return f"v{len(calls)}"
+
+    assert ns.get("k", compute) == "v1"
+    clock[0] += 59
+    assert ns.get("k", compute) == "v1"
+    clock[0] += 1
+    assert ns.get("k", compute) == "v2"
+    assert calls == [1000.0, 1060.0]
+
+    stats = ns.stats()
+    assert (stats["적중"], stats["실패"], stats["만료"]) == (1, 2, 1)
+    assert ns.bytes == 2
+
+
+def test_memoize_skips_underscore_args(monkeypatch):
+    monkeypatch.setattr(result_cache, "_namespaces", {})
+    calls = []
+
+    @result_cache.memoize("test_memoize")
+    def plan(version, days, _dist=None):
+        calls.append((version, days))
+        return [version, days]
+
+    assert plan(1, 3, _dist=object()) == [1, 3]
+    assert plan(1, 3, _dist=object()) == [1, 3]
+    assert plan(1, days=4) == [1, 4]
+    assert calls == [(1, 3), (1, 4)]
+
+
+def test_budget_env_override(monkeypatch):
+    monkeypatch.setenv("CACHE_SEARCH_MB", "0.5")
+    assert result_cache._budget("search") == (2**19, result_cache.BUDGETS["search"][1])
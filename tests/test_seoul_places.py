@@ -0,0 +1,16 @@
+import seoul_places
+
+
+def test_stations_prefer_nearest_join_over_typed_field():
+    row = {"name": "명동", "subway": "4호선 명동역", "desc": ""}
+    near = ["을지로입구 (2호선) · 323m", "명동 (4호선) · 335m"]
+
+    assert seoul_places.stations(row, near) == near
+    assert seoul_places.stations(row, None) == ["4호선 명동역"]
+    assert seoul_places.stations(row, []) == ["4호선 명동역"]
+
+
+def test_popup_uses_same_station_list():
+    row = {"name": "명동", "subway": "4호선 명동역", "desc": "쇼핑"}
+    html = seoul_places.popup_html(row, ["을지로입구 (2호선) · 323m"])
+    assert "을지로입구" in html and "4호선 명동역" not in html
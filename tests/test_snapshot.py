@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import blood_data
+import datasets
+import snapshot
+
+NAMES = ["blood_sample", "blood_sample_counts", "tour_index"]
+
+
+@pytest.fixture
+def published(tmp_path, monkeypatch):
+    """NAMES 만 들어 있는 스냅샷을 tmp_path 에 만들어 CURRENT 로 둔다."""
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", str(tmp_path))
+    path = tmp_path / "test"
+    entries = snapshot.build_family(NAMES, str(path))
+    (path / "manifest.json").write_text(json.dumps({"datasets": entries}), encoding="utf-8")
+    snapshot.publish("test")
+    snapshot._manifest.cache_clear()
+    datasets.clear()
+    yield entries
+    datasets.clear()
+    snapshot._manifest.cache_clear()
+
+
+def _fresh(name):
+    ds = datasets.dataset(name)
+    return ds.load(*(_fresh(d) for d in ds.depends))
+
+
+def test_restored_equals_fresh_build(published):
+    assert set(published) == {"blood_sample_counts", "tour_index"}
+
+    counts = datasets.get("blood_sample_counts")
+    assert datasets._stats["blood_sample_counts"]["source"] == "snapshot"
+    fresh = _fresh("blood_sample_counts")
+    assert counts.countries == fresh.countries and counts.types == fresh.types
+    np.testing.assert_array_equal(counts.counts, fresh.counts)
+
+    index = datasets.get("tour_index")
+    assert datasets._stats["tour_index"]["source"] == "snapshot"
+    fresh = _fresh("tour_index")
+    pd.testing.assert_frame_equal(index.df, fresh.df, check_dtype=False)
+    for query, filters in [("", None), ("ㄱㅂㄱ", None), ("경ㅂ", None), ("해", {"region": ["부산"]})]:
+        np.testing.assert_array_equal(index.search(query, filters), fresh.search(query, filters))
+    pd.testing.assert_frame_equal(index.facet_counts("type"), fresh.facet_counts("type"))
+
+
+def test_snapshot_ignored_when_source_version_differs(published, monkeypatch):
+    # 원본(샘플 CSV)이 바뀌면 의존하는 집계의 버전도 달라져 스냅샷을 쓰지 않는다
+    monkeypatch.setattr(blood_data, "SAMPLE_CSV", "country,blood_type\nJapan,A\nJapan,B\nUSA,O\n")
+    assert snapshot.find("blood_sample_counts", datasets.version("blood_sample_counts")) is None
+
+    counts = datasets.get("blood_sample_counts")
+    assert datasets._stats["blood_sample_counts"]["source"] == "계산"
+    assert counts.countries == ["Japan", "USA"]
+    np.testing.assert_array_equal(counts.counts, [[1, 1, 0], [0, 0, 1]])
+
+
+def test_find_without_current_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", str(tmp_path))
+    assert snapshot.current() is None
+    assert snapshot.find("tour_index", datasets.version("tour_index")) is None
+    snapshot.publish("missing")
+    assert snapshot.current() is None
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import subway_anomaly
+from subway_anomaly import AnomalyState, MIN_HISTORY, RESULT_COLUMNS, WINDOW
+
+PAIRS = [("1호선", "서울역"), ("2호선", "강남"), ("2호선", "잠실")]
+
+
+def _days(n=70, seed=0):
+    """(날짜, 날짜별 역 코드, 날짜별 (역, 2) 승·하차). 잠실은 40일째부터 나오고 몇 날은 급증·급감 (2일째는 기록이 쌓이기 전)."""
+    rng = np.random.default_rng(seed)
+    dates = [int(d.strftime("%Y%m%d")) for d in pd.date_range("2024-01-01", periods=n)]
+    codes, values = [], []
+    for i, d in enumerate(dates):
+        n_pairs = len(PAIRS) if i >= 40 else 2
+        vals = rng.normal(1000, 20, size=(n_pairs, 2)).astype(np.float32)
+        if i in (2, 20, 50):
+            vals[0, 0] *= 4
+        if i == 33:
+            vals[1, 1] = 0
+        codes.append(np.arange(n_pairs, dtype=np.int32))
+        values.append(vals)
+    return dates, codes, values
+
+
+def _append(state, dates, codes, values):
+    # update() 처럼 그 구간에 나온 역만 등록한다 (코드 = PAIRS 순서)
+    state._pair_codes([PAIRS[c] for c in np.unique(np.concatenate(codes))])
+    state.append(dates, codes, values)
+    return state
+
+
+def _build(dates, codes, values):
+    return _append(AnomalyState(), dates, codes, values)
+
+
+def _rows(state):
+    r = state.results
+    rows = zip(*(r[c].tolist() for c in RESULT_COLUMNS))
+    return sorted(rows, key=lambda row: row[:3])
+
+
+@pytest.mark.parametrize("split", [1, MIN_HISTORY, WINDOW, WINDOW + 3, 45])
+def test_save_load_append_matches_one_shot(tmp_path, split):
+    dates, codes, values = _days()
+    whole = _build(dates, codes, values)
+
+    first = _build(dates[:split], codes[:split], values[:split])
+    first.save(tmp_path)
+    resumed = AnomalyState.load(tmp_path)
+    assert resumed.last_date == dates[split - 1]
+    _append(resumed, dates[split:], codes[split:], values[split:])
+
+    assert resumed.last_date == whole.last_date
+    assert resumed.pairs == whole.pairs
+    np.testing.assert_array_equal(resumed.tails, whole.tails)
+    expected = _rows(whole)
+    got = _rows(resumed)
+    assert [row[:4] for row in got] == [row[:4] for row in expected]
+    np.testing.assert_allclose([row[4:] for row in got], [row[4:] for row in expected], rtol=1e-6)
+
+
+def test_first_window_days():
+    dates, codes, values = _days()
+    types = subway_anomaly.day_types(dates)
+    state = _build(dates, codes, values)
+    r = state.results
+
+    # 같은 요일 구분의 기록이 MIN_HISTORY 일 이상 쌓이기 전에는 점수를 매기지 않는다
+    seen = np.cumsum(types == types[:, None], axis=1).diagonal() - 1
+    assert (seen[np.searchsorted(dates, r["date"])] >= MIN_HISTORY).all()
+    # 그 뒤로는 WINDOW 일이 다 차기 전이어도 찾는다 (20일째 서울역 승차 급증, 33일째 강남 하차 급감)
+    assert seen[20] < WINDOW
+    hits = set(zip(r["date"].tolist(), r["pair"].tolist(), r["value"].tolist()))
+    assert {(dates[20], 0, 0), (dates[33], 1, 1), (dates[50], 0, 0)} <= hits
+    assert (dates[2], 0, 0) not in hits
+    # 늦게 나온 잠실은 그 전 기록이 없어서 처음 MIN_HISTORY 일 동안 결과가 없다
+    jamsil = r["date"][r["pair"] == 2]
+    assert (jamsil >= dates[40 + MIN_HISTORY]).all()
+
+
+def test_load_rejects_other_params(tmp_path, monkeypatch):
+    dates, codes, values = _days(20)
+    _build(dates, codes, values).save(tmp_path)
+    assert AnomalyState.load(tmp_path) is not None
+    monkeypatch.setattr(subway_anomaly, "KEEP_Z", 4.0)
+    assert AnomalyState.load(tmp_path) is None
+    assert AnomalyState.load(tmp_path / "missing") is None
@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import subway_data
+
+
+def test_empty_store_builds_rankings_and_cube():
+    store = subway_data.SubwayStore([])
+    df = store.frame()
+    assert df.empty
+    assert str(df[subway_data.LINE_COL].dtype) == "category"
+
+    table, colors = subway_data.StationRankings(store).lookup(20240101, "1호선")
+    assert table.empty and colors == []
+    cube = subway_data.RidershipCube(store)
+    assert cube.station_totals(20240101, 20241231).empty
+    assert cube.line_daily(20240101, 20241231).empty
+
+
+COLS = [subway_data.DATE_COL, subway_data.LINE_COL, subway_data.STATION_COL,
+        subway_data.ON_COL, subway_data.OFF_COL]
+
+
+def _rows(seed, dates=range(20240101, 20240111), lines=("1호선", "2호선"),
+          stations=("서울역", "시청", "강남", "잠실")):
+    rng = np.random.default_rng(seed)
+    rows = [(d, l, s) for d in dates for l in lines for s in stations if rng.random() < 0.8]
+    df = pd.DataFrame(rows, columns=COLS[:3])
+    df[subway_data.ON_COL] = rng.integers(0, 50_000, len(df))
+    df[subway_data.OFF_COL] = rng.integers(0, 50_000, len(df))
+    return df
+
+
+def _write(path, df):
+    path.write_bytes(df.to_csv(index=False).encode("cp949"))
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    built = []
+    build_cache = subway_data.build_cache
+
+    def recording(csv_path, *args, **kwargs):
+        built.append(os.path.basename(csv_path))
+        return build_cache(csv_path, *args, **kwargs)
+
+    monkeypatch.setattr(subway_data, "build_cache", recording)
+    return built
+
+
+def test_only_changed_partition_is_rebuilt(tmp_path, builds):
+    data, cache = tmp_path / "data", tmp_path / "cache"
+    data.mkdir()
+    _write(data / "subway_a.csv", _rows(0))
+    _write(data / "subway_b.csv", _rows(1, dates=range(20240111, 20240116)))
+
+    store = subway_data.load_store(data, cache)
+    assert sorted(builds) == ["subway_a.csv", "subway_b.csv"]
+    assert len(store.dates()) == 15
+
+    builds.clear()
+    subway_data.load_store(data, cache)
+    assert builds == []
+
+    # touch: mtime 만 바뀌면 다시 만들지 않고 meta 만 갱신
+    st = os.stat(data / "subway_a.csv")
+    os.utime(data / "subway_a.csv", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    subway_data.load_store(data, cache)
+    assert builds == []
+    meta = subway_data._read_meta(subway_data.partition_dir(str(data / "subway_a.csv"), cache))
+    assert meta["mtime_ns"] == st.st_mtime_ns + 10**9
+
+    # 내용이 바뀐 파일만 다시 만든다
+    _write(data / "subway_b.csv", _rows(2, dates=range(20240111, 20240121)))
+    store = subway_data.load_store(data, cache)
+    assert builds == ["subway_b.csv"]
+    assert len(store.dates()) == 20
+
+
+def _expected_rankings(df, date, line):
+    sel = df[(df[subway_data.DATE_COL] == date) & (df[subway_data.LINE_COL] == line)]
+    out = sel.groupby(subway_data.STATION_COL, as_index=False)[[subway_data.ON_COL, subway_data.OFF_COL]].sum()
+    out[subway_data.TOTAL_COL] = out[subway_data.ON_COL] + out[subway_data.OFF_COL]
+    return out
+
+
+def test_rankings_and_cube_match_groupby(tmp_path):
+    # 두 파일에 같은 (날짜, 노선, 역)이 겹쳐 있으면 합쳐야 한다
+    a = _rows(0)
+    b = _rows(1, dates=range(20240108, 20240115), stations=("강남", "잠실", "건대입구"))
+    data = tmp_path / "data"
+    data.mkdir()
+    _write(data / "subway_a.csv", a)
+    _write(data / "subway_b.csv", b)
+    df = pd.concat([a, b], ignore_index=True)
+    store = subway_data.load_store(data, tmp_path / "cache")
+
+    rankings = subway_data.StationRankings(store)
+    for date in (20240101, 20240109, 20240114):
+        for line in ("1호선", "2호선"):
+            table, colors = rankings.lookup(date, line)
+            expected = _expected_rankings(df, date, line)
+            assert len(colors) == len(table) == len(expected)
+            assert table[subway_data.TOTAL_COL].is_monotonic_decreasing
+            key = [subway_data.STATION_COL]
+            pd.testing.assert_frame_equal(
+                table.sort_values(key).reset_index(drop=True)[expected.columns],
+                expected.sort_values(key).reset_index(drop=True),
+                check_dtype=False,
+            )
+    assert rankings.lookup(20231231, "1호선")[0].empty
+
+    cube = subway_data.RidershipCube(store)
+    weekend = pd.to_datetime(df[subway_data.DATE_COL].astype(str)).dt.weekday >= 5
+    for start, end, lines, day_type in [
+        (20240101, 20240114, None, "all"),
+        (20240103, 20240110, ["2호선"], "weekday"),
+        (20240101, 20240114, ["1호선"], "weekend"),
+    ]:
+        sel = df[df[subway_data.DATE_COL].between(start, end)]
+        if lines:
+            sel = sel[sel[subway_data.LINE_COL].isin(lines)]
+        if day_type != "all":
+            sel = sel[weekend[sel.index] == (day_type == "weekend")]
+
+        keys = [subway_data.LINE_COL, subway_data.STATION_COL]
+        expected = sel.groupby(keys, as_index=False)[[subway_data.ON_COL, subway_data.OFF_COL]].sum()
+        got = cube.station_totals(start, end, lines, day_type)
+        got = got[got[subway_data.TOTAL_COL] > 0].sort_values(keys).reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            got[expected.columns], expected.sort_values(keys).reset_index(drop=True), check_dtype=False
+        )
+
+        daily = cube.line_daily(start, end, lines, day_type)
+        expected = sel.assign(total=sel[subway_data.ON_COL] + sel[subway_data.OFF_COL]).pivot_table(
+            index=subway_data.DATE_COL, columns=subway_data.LINE_COL, values="total", aggfunc="sum", fill_value=0
+        )
+        pd.testing.assert_frame_equal(
+            daily.loc[expected.index, expected.columns], expected,
+            check_dtype=False, check_index_type=False, check_column_type=False, check_names=False,
+        )
+        assert set(daily.index) == set(sel[subway_data.DATE_COL])
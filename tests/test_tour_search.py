@@ -0,0 +1,86 @@
+import pytest
+
+import tour_search
+
+EXTRA = [
+    {"region": "서울", "name": "경희궁", "type": "역사"},
+    {"region": "서울", "name": "광장시장", "type": "도시"},
+    {"region": "경기", "name": "수원 화성", "type": "역사"},
+    {"region": "부산", "name": "광안리해수욕장", "type": "해변"},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    df = tour_search.load_catalogue(tour_search.TOUR_LIST + EXTRA, path=None)
+    return tour_search.TourIndex(df)
+
+
+def _names(index, query, filters=None):
+    return list(index.df["name"].to_numpy()[index.search(query, filters)])
+
+
+def test_partial_syllable_matches(index):
+    # 받침을 치기 전의 "겨" 도 경복궁·경희궁에 걸린다 (지역이 경주·경기인 것은 이름이 맞는 것 뒤에)
+    assert _names(index, "겨") == ["경복궁", "경희궁", "불국사", "수원 화성"]
+    assert _names(index, "해수") == ["해운대해수욕장", "광안리해수욕장"]
+    assert _names(index, "광ㅇ") == ["광안리해수욕장"]
+
+
+def test_choseong_query(index):
+    assert _names(index, "ㄱㅂㄱ") == ["경복궁"]
+    assert _names(index, "ㄱㅎ") == ["경희궁"]
+    # 이름 중간이나 지역·분류에서도 찾고, 이름이 초성으로 시작하는 것이 앞에 온다
+    assert _names(index, "ㅎㅅ")[:1] == ["해운대해수욕장"]
+    assert set(_names(index, "ㅎㅅ")) == {"해운대해수욕장", "광안리해수욕장", "수원 화성"}
+
+
+def test_mixed_query(index):
+    assert _names(index, "경ㅂ") == ["경복궁"]
+    assert _names(index, "경ㅎ") == ["경희궁"]
+    assert _names(index, "서울 ㄱ") == ["경복궁", "경희궁", "광장시장"]
+
+
+def test_empty_and_no_hit_queries(index):
+    assert list(index.search("")) == list(range(len(index)))
+    assert list(index.search("   ")) == list(range(len(index)))
+    assert len(index.search("없는관광지")) == 0
+    assert len(index.search("ㅋㅋㅋ")) == 0
+    assert len(index.search("경복궁", {"region": ["부산"]})) == 0
+    empty = index.facet_counts("region", index.search("없는관광지"))
+    assert empty.empty and list(empty.columns) == ["region", "count"]
+
+
+@pytest.mark.parametrize("query, filters", [
+    ("", None),
+    ("ㄱ", None),
+    ("궁", {"region": ["서울"]}),
+    ("해", {"type": ["해변", "자연"]}),
+])
+def test_facets_match_results(index, query, filters):
+    ids = index.search(query, filters)
+    rows = index.df.iloc[ids]
+    for field in tour_search.FACETS:
+        counts = index.facet_counts(field, ids)
+        expected = rows[field].value_counts()
+        assert dict(zip(counts[field], counts["count"])) == expected.to_dict()
+        assert counts["count"].is_monotonic_decreasing
+        if filters and field in filters:
+            assert set(counts[field]) <= set(filters[field])
+    assert index.facet_counts("region")["count"].sum() == len(index)
+
+
+def _contains(text, term):
+    if tour_search.is_choseong_query(term):
+        return tour_search.choseong(term) in tour_search.choseong(text)
+    return tour_search.jamo(term) in tour_search.jamo(text)
+
+
+def test_matches_brute_force(index):
+    rows = index.df[list(tour_search.FIELDS)].astype(str).to_numpy()
+    for query in ["궁", "ㄱ", "역사", "ㅅ", "수원화", "광장 ㅅ"]:
+        expected = {
+            i for i, texts in enumerate(rows)
+            if all(any(_contains(t, term) for t in texts) for term in query.split())
+        }
+        assert set(index.search(query)) == expected, query
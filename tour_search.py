@@ -0,0 +1,222 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+# ----------------------------
+# 관광지 검색 인덱스
+# ----------------------------
+# 이름·지역·분류를 자모로 풀어 쓴 문자열의 모든 접미사를 정렬해 두고,
+# 검색어(자모로 푼 것)로 시작하는 범위를 이분 탐색으로 찾는다. → 부분 문자열 검색
+# "ㄱㅂㄱ" 처럼 초성만 입력하면 초성 문자열 쪽 인덱스에서 찾는다.
+# 지역/분류별 개수(facet)는 코드 배열에 bincount 로 센다.
+
+# 관광지 기본 목록 (한국관광 100선 일부). 나머지는 tour_places.csv 로 추가
+TOUR_LIST = [
+    {"region": "서울", "name": "경복궁", "type": "역사"},
+    {"region": "서울", "name": "남산타워", "type": "도시"},
+    {"region": "부산", "name": "해운대해수욕장", "type": "해변"},
+    {"region": "경주", "name": "불국사", "type": "역사"},
+    {"region": "제주", "name": "성산일출봉", "type": "자연"},
+    {"region": "전주", "name": "한옥마을", "type": "전통"},
+    {"region": "강원", "name": "속초 설악산", "type": "산"},
+]
+CATALOGUE_CSV = "tour_places.csv"
+FIELDS = ("name", "region", "type")
+FACETS = ("region", "type")
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ",
+             "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ",
+             "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 입력 중인 겹모음·겹받침(ㅘ, ㄺ …)도 풀어서 비교한다
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def _syllables(text):
+    """공백을 뺀 소문자 글자 목록."""
+    return [ch for ch in str(text).lower() if not ch.isspace()]
+
+
+def jamo(text):
+    """한글 음절을 호환 자모로 풀어 쓴다. 예) 경복궁 → ㄱㅕㅇㅂㅗㄱㄱㅜㅇ"""
+    out = []
+    for ch in _syllables(text):
+        code = ord(ch) - HANGUL_BASE
+        if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+            out.append(CHOSEONG[code // 588] + JUNGSEONG[code // 28 % 21] + JONGSEONG[code % 28])
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def choseong(text):
+    """한글 음절은 초성만 남긴다. 예) 경복궁 → ㄱㅂㄱ"""
+    out = []
+    for ch in _syllables(text):
+        code = ord(ch) - HANGUL_BASE
+        out.append(CHOSEONG[code // 588] if 0 <= code <= HANGUL_LAST - HANGUL_BASE else ch)
+    return "".join(out)
+
+
+def is_choseong_query(query):
+    chars = _syllables(query)
+    return bool(chars) and all(ch in CHOSEONG for ch in chars)
+
+
+def _suffix_keys(text):
+    """음절 경계마다 시작하는 (자모 접미사, 초성 접미사)."""
+    chars = _syllables(text)
+    jamo_chars = [jamo(ch) for ch in chars]
+    cho_chars = [choseong(ch) for ch in chars]
+    return (
+        ["".join(jamo_chars[i:]) for i in range(len(chars))],
+        ["".join(cho_chars[i:]) for i in range(len(chars))],
+    )
+
+
+class _PrefixIndex:
+    """정렬된 (키, 문서 번호) 배열. 접두사로 시작하는 키의 문서 번호를 이분 탐색으로 찾는다."""
+
+    def __init__(self, keys, docs, n_docs):
+        keys = np.asarray(keys, dtype=str)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.docs = np.asarray(docs, dtype=np.int32)[order]
+        self.n_docs = n_docs
+
+    @classmethod
+    def from_sorted(cls, keys, docs, n_docs):
+        """이미 정렬된 배열 (스냅샷에서 연 것) 로 만든다."""
+        index = cls.__new__(cls)
+        index.keys, index.docs, index.n_docs = keys, docs, n_docs
+        return index
+
+    def lookup(self, prefix):
+        """prefix 로 시작하는 키가 있는 문서의 bool 마스크."""
+        lo = np.searchsorted(self.keys, prefix, side="left")
+        hi = np.searchsorted(self.keys, prefix + "\U0010ffff", side="left")
+        mask = np.zeros(self.n_docs, dtype=bool)
+        mask[self.docs[lo:hi]] = True
+        return mask
+
+
+class TourIndex:
+    """관광지 목록의 검색 인덱스와 지역/분류 facet."""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        n = len(self.df)
+        jamo_keys, cho_keys, jamo_docs, cho_docs = [], [], [], []
+        memo = {}  # 지역·분류처럼 반복되는 값은 한 번만 풀어 쓴다
+        for doc, values in enumerate(zip(*(self.df[f].astype(str) for f in FIELDS))):
+            for value in values:
+                if value not in memo:
+                    memo[value] = _suffix_keys(value)
+                j, c = memo[value]
+                jamo_keys.extend(j)
+                cho_keys.extend(c)
+                jamo_docs.extend([doc] * len(j))
+                cho_docs.extend([doc] * len(c))
+        self._jamo = _PrefixIndex(jamo_keys, jamo_docs, n)
+        self._cho = _PrefixIndex(cho_keys, cho_docs, n)
+
+        # 이름이 검색어로 시작하면 앞에 보여 주기 위해
+        self._name_jamo = np.array([jamo(n) for n in self.df["name"]], dtype=str)
+        self._name_cho = np.array([choseong(n) for n in self.df["name"]], dtype=str)
+
+        self.codes, self.labels = {}, {}
+        for f in FACETS:
+            codes, labels = pd.factorize(self.df[f], sort=True)
+            self.codes[f] = codes
+            self.labels[f] = list(labels)
+        self.all_ids = np.arange(len(self.df))
+
+    def to_snapshot(self):
+        arrays = {
+            "name": self.df["name"].to_numpy(dtype=str),
+            "jamo_keys": self._jamo.keys,
+            "jamo_docs": self._jamo.docs,
+            "cho_keys": self._cho.keys,
+            "cho_docs": self._cho.docs,
+            "name_jamo": self._name_jamo,
+            "name_cho": self._name_cho,
+        }
+        arrays.update({f"codes_{f}": self.codes[f] for f in FACETS})
+        return arrays, {"labels": self.labels}
+
+    @classmethod
+    def from_snapshot(cls, artefact):
+        index = cls.__new__(cls)
+        labels = artefact.meta["labels"]
+        codes = {f: artefact[f"codes_{f}"] for f in FACETS}
+        columns = {"name": artefact["name"].astype(object)}
+        columns.update({f: np.asarray(labels[f], dtype=object)[codes[f]] for f in FACETS})
+        index.df = pd.DataFrame(columns)[list(FIELDS)]
+        n = len(index.df)
+        index._jamo = _PrefixIndex.from_sorted(artefact["jamo_keys"], artefact["jamo_docs"], n)
+        index._cho = _PrefixIndex.from_sorted(artefact["cho_keys"], artefact["cho_docs"], n)
+        index._name_jamo = artefact["name_jamo"]
+        index._name_cho = artefact["name_cho"]
+        index.codes, index.labels = codes, labels
+        index.all_ids = np.arange(n)
+        return index
+
+    def __len__(self):
+        return len(self.df)
+
+    def search(self, query="", filters=None):
+        """검색어(공백으로 나눈 단어를 모두 포함)와 facet 필터에 맞는 행 번호 배열."""
+        terms = str(query).split()
+        mask = np.ones(len(self.df), dtype=bool)
+        for term in terms:
+            if is_choseong_query(term):
+                mask &= self._cho.lookup(choseong(term))
+            else:
+                mask &= self._jamo.lookup(jamo(term))
+        ids = self.all_ids[mask]
+        for f, values in (filters or {}).items():
+            if values:
+                wanted = [self.labels[f].index(v) for v in values if v in self.labels[f]]
+                ids = ids[np.isin(self.codes[f][ids], wanted)]
+        if terms and len(ids):
+            first = terms[0]
+            names = self._name_cho if is_choseong_query(first) else self._name_jamo
+            key = choseong(first) if is_choseong_query(first) else jamo(first)
+            starts = np.char.startswith(names[ids], key)
+            ids = ids[np.argsort(~starts, kind="stable")]
+        return ids
+
+    def facet_counts(self, field, ids=None):
+        """ids(기본: 전체) 안에서 field 값별 개수. 개수 내림차순 DataFrame(field, count)."""
+        codes = self.codes[field] if ids is None else self.codes[field][ids]
+        counts = np.bincount(codes, minlength=len(self.labels[field]))
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return pd.DataFrame({field: [self.labels[field][i] for i in order], "count": counts[order]})
+
+
+def load_catalogue(base, path=CATALOGUE_CSV):
+    """기본 목록(base) 에 region,name,type 컬럼의 CSV(있으면)를 합친다. 이름이 같으면 앞의 것."""
+    df = pd.DataFrame(base, columns=list(FIELDS))
+    if path and os.path.exists(path):
+        extra = ingest.read_csv(path, ingest.TOUR)
+        df = pd.concat([df, extra], ignore_index=True)
+    df = df.dropna(subset=["name"])
+    df[list(FACETS)] = df[list(FACETS)].fillna("기타")
+    return df.drop_duplicates("name").reset_index(drop=True)
+
+
+def catalogue_version(path=CATALOGUE_CSV):
+    if path and os.path.exists(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    return None